@@ -5,9 +5,15 @@ load_dotenv()
 
 app = Flask(__name__)
 
+from weather_art.config import PREWARM_ENABLED  # noqa: E402
+from weather_art.geocoding import get_geocode_cache  # noqa: E402
+from weather_art.prewarm import prewarmer  # noqa: E402
 from weather_art.routes import bp  # noqa: E402
 
 app.register_blueprint(bp)
+get_geocode_cache()
+if PREWARM_ENABLED:
+    prewarmer.start()
 
 if __name__ == "__main__":
     app.run()
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""Time extract_json_from_response on growing model responses.
+
+Each size is measured for clean JSON (the fast path) and for JSON with prose,
+single quotes, trailing commas and truncation (the normalizing pass), and for
+responses that cannot be recovered: prose full of braces, and a scene whose
+top-level object is broken. Time per KB should stay flat as responses grow.
+
+    python -m benchmarks.bench_json_extract
+"""
+import json
+
+from benchmarks.timing import best_of
+from weather_art.json_extract import extract_json_from_response
+
+SIZES = (10, 100, 1000, 5000)  # elements per scene
+REPEATS = 5
+
+
+def make_responses(count: int) -> dict[str, str]:
+    elements = [
+        {"type": "text", "content": f"label {i}, [sic]", "x": i % 800, "y": i % 600, "size": 12}
+        for i in range(count)
+    ]
+    clean = json.dumps({"scene": {"elements": elements}})
+    messy = "Here is the scene you asked for:\n```json\n" + clean.replace('"', "'").replace("}]", "},]")
+    return {"clean": clean, "messy": messy[:-10]}
+
+
+def make_failing_responses(count: int) -> dict[str, str]:
+    elements = [{"type": "glow", "x": i % 800, "y": i % 600, "radius": 5} for i in range(count)]
+    braces = "Use {'x'} or {curly} braces. " * (count * 2)
+    broken = ('{"scene": {"background": {"type": "solid" "color": "#000"}, "elements": '
+              + json.dumps(elements) + "}}")
+    return {"braces": braces, "broken": broken}
+
+
+def _extract_or_fail(text: str) -> None:
+    try:
+        extract_json_from_response(text)
+    except json.JSONDecodeError:
+        return
+    raise AssertionError("expected the response to be unrecoverable")
+
+
+def main() -> None:
+    print(f"{'elements':>8} {'variant':>7} {'size KB':>9} {'ms':>9} {'us/KB':>8}")
+    for count in SIZES:
+        cases = [(variant, text, extract_json_from_response) for variant, text in make_responses(count).items()]
+        cases += [(variant, text, _extract_or_fail) for variant, text in make_failing_responses(count).items()]
+        for variant, text, extract in cases:
+            seconds = best_of(lambda: extract(text), REPEATS)
+            kb = len(text) / 1024
+            print(f"{count:>8} {variant:>7} {kb:>9.1f} {seconds * 1000:>9.2f} {seconds * 1e6 / kb:>8.1f}")
+
+if __name__ == "__main__":
+    main()
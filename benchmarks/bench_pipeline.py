@@ -0,0 +1,306 @@
+"""Load-test the scene pipeline against stub Ollama and Open-Meteo servers.
+
+Measures throughput and latency percentiles of generate_scene (agent, direct
+and structured modes), describe_weather, POST /api/generate and
+GET /api/geocode at each concurrency level, plus validation and JSON
+extraction microbenchmarks.
+Results are written as JSON to benchmarks/results/; pass an earlier result
+with --compare to flag regressions (the exit status is 1 if any).
+
+Every generate request uses a distinct style prompt, so it misses the scene
+cache and runs the full model loop; weather and geocoding caches warm up as
+they would in production unless --cold clears them before every request.
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --concurrency 1,8 --requests 64 --turn-latency 0.05
+    python -m benchmarks.bench_pipeline --compare benchmarks/results/baseline.json
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.stubs import StubOllama, StubOpenMeteo
+from benchmarks.timing import best_of
+
+RESULTS_DIR = Path(__file__).parent / "results"
+CITIES = ("Berlin", "Tokyo", "London", "New York", "Oslo", "Miami", "Sydney", "Cairo")
+SCENARIOS = (
+    "generate_scene",
+    "generate_scene_direct",
+    "generate_scene_structured",
+    "describe_weather",
+    "api_generate",
+    "api_geocode",
+)
+# Relative change in a latency percentile or throughput reported as a regression.
+REGRESSION_THRESHOLD = 0.10
+MICRO_REPEATS = 20
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_load(call, requests: int, concurrency: int, before_each=None) -> dict:
+    """Run ``call(i)`` for i in range(requests) on ``concurrency`` threads and summarize latencies."""
+    latencies: list[float] = []
+    errors: list[str] = []
+    lock = threading.Lock()
+
+    def one(i: int) -> None:
+        if before_each is not None:
+            before_each()
+        start = time.perf_counter()
+        try:
+            call(i)
+        except Exception as e:
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+            return
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    summary = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+    }
+    if latencies:
+        summary.update({
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p90_ms": percentile(latencies, 90) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": latencies[-1] * 1000,
+        })
+    if errors:
+        summary["first_error"] = errors[0]
+    return summary
+
+
+def _configure_environment(ollama: StubOllama, open_meteo: StubOpenMeteo, workdir: str) -> None:
+    # weather_art reads its configuration at import time, so this must run first.
+    os.environ["OLLAMA_HOST"] = ollama.url
+    os.environ["OPEN_METEO_GEOCODING_URL"] = open_meteo.geocoding_url
+    os.environ["OPEN_METEO_FORECAST_URL"] = open_meteo.forecast_url
+    os.environ["GEOCODE_CACHE_PATH"] = os.path.join(workdir, "geocode_cache.sqlite3")
+    os.environ["TRACING_ENABLED"] = "true"
+
+
+def _serve_app() -> tuple[str, object]:
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    from app import app
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def _scenarios(base_url: str, run_id: str) -> dict:
+    import requests
+
+    from weather_art.agent import generate_scene
+    from weather_art.weather_agent import describe_weather
+
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=64))
+
+    def city(i: int) -> str:
+        return CITIES[i % len(CITIES)]
+
+    counter = itertools.count()
+
+    def style(i: int) -> str:
+        return f"benchmark {run_id} request {next(counter)}"
+
+    def api_generate(i: int) -> None:
+        response = session.post(f"{base_url}/api/generate", json={"location": city(i), "style_prompt": style(i)})
+        response.raise_for_status()
+
+    def api_geocode(i: int) -> None:
+        session.get(f"{base_url}/api/geocode", params={"city": city(i)}).raise_for_status()
+
+    return {
+        "generate_scene": lambda i: generate_scene(city(i), style_prompt=style(i), mode="agent"),
+        "generate_scene_direct": lambda i: generate_scene(city(i), style_prompt=style(i), mode="direct"),
+        "generate_scene_structured": lambda i: generate_scene(city(i), style_prompt=style(i), mode="structured"),
+        "describe_weather": lambda i: describe_weather(f"Describe the current weather in {city(i)}."),
+        "api_generate": api_generate,
+        "api_geocode": api_geocode,
+    }
+
+
+def _clear_lookup_caches() -> None:
+    from weather_art.geocoding import get_geocode_cache
+    from weather_art.weather import weather_cache
+
+    weather_cache.clear()
+    get_geocode_cache().clear()
+
+
+def run_micro() -> dict:
+    """Best-of timings, in microseconds, for validation and extraction at a few scene sizes."""
+    from benchmarks.bench_json_extract import make_responses
+    from benchmarks.bench_validation import after, make_scene
+    from weather_art.json_extract import extract_json_from_response
+
+    results = {}
+    for count in (30, 500):
+        text = make_scene(count)
+        results[f"validate_{count}"] = best_of(lambda: after(text), MICRO_REPEATS) * 1e6
+        for variant, response in make_responses(count).items():
+            results[f"extract_{variant}_{count}"] = best_of(
+                lambda: extract_json_from_response(response), MICRO_REPEATS
+            ) * 1e6
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> list[str]:
+    """Print current vs baseline side by side and return a line per regression."""
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    rows = []
+    for scenario, levels in current["load"].items():
+        for level, stats in levels.items():
+            old = baseline.get("load", {}).get(scenario, {}).get(level)
+            if old is None:
+                continue
+            for metric in ("p50_ms", "p99_ms", "throughput_rps"):
+                if metric in stats and metric in old:
+                    lower_is_better = metric != "throughput_rps"
+                    rows.append((f"{scenario} c={level} {metric}", old[metric], stats[metric], lower_is_better))
+    for name, value in current.get("micro", {}).items():
+        old = baseline.get("micro", {}).get(name)
+        if old is not None:
+            rows.append((f"micro {name} us", old, value, True))
+
+    for name, old, new, lower_is_better in rows:
+        change = (new - old) / old if old else 0.0
+        worse = change > threshold if lower_is_better else change < -threshold
+        flag = "  REGRESSION" if worse else ""
+        print(f"{name:<40} {old:>10.2f} {new:>10.2f} {change:>+8.0%}{flag}")
+        if worse:
+            regressions.append(f"{name}: {old:.2f} -> {new:.2f} ({change:+.0%})")
+    return regressions
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,4", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=32, help="requests per scenario and level")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated scenarios to run")
+    parser.add_argument("--turn-latency", type=float, default=0.0, help="stub model delay per turn, seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="stub model streaming rate, 0 = instant")
+    parser.add_argument("--upstream-latency", type=float, default=0.0, help="stub Open-Meteo delay, seconds")
+    parser.add_argument("--cold", action="store_true", help="clear weather and geocoding caches before each request")
+    parser.add_argument("--no-micro", action="store_true", help="skip the microbenchmarks")
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="relative change to flag")
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    names = [name for name in args.scenarios.split(",") if name]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    with StubOllama(args.turn_latency, args.tokens_per_second) as ollama, \
+            StubOpenMeteo(args.upstream_latency) as open_meteo, \
+            tempfile.TemporaryDirectory() as workdir:
+        _configure_environment(ollama, open_meteo, workdir)
+        from weather_art.scene_cache import scene_cache
+        from weather_art.generation_stats import generation_stats
+        from weather_art.tracing import tracer
+
+        base_url, server = _serve_app()
+        scenarios = _scenarios(base_url, uuid.uuid4().hex[:8])
+        results = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "git_revision": _git_revision(),
+                "python": platform.python_version(),
+                "args": {key: str(value) for key, value in vars(args).items()},
+            },
+            "load": {},
+        }
+
+        print(f"{'scenario':<26} {'conc':>4} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        for name in names:
+            call = scenarios[name]
+            scene_cache.clear()
+            with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                call(-1)  # warm up agent pools and connections
+            results["load"][name] = {}
+            for level in levels:
+                tracer.reset()
+                ollama_before, meteo_before = ollama.requests, open_meteo.requests
+                # Strands' default callback handler echoes every streamed token to stdout.
+                with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                    stats = run_load(call, args.requests, level, _clear_lookup_caches if args.cold else None)
+                stats["model_calls"] = ollama.requests - ollama_before
+                stats["upstream_calls"] = open_meteo.requests - meteo_before
+                stats["stages"] = tracer.stats()["stages"]
+                results["load"][name][str(level)] = stats
+                print(
+                    f"{name:<26} {level:>4} {stats['throughput_rps']:>8.1f} {stats.get('p50_ms', 0):>8.1f} "
+                    f"{stats.get('p90_ms', 0):>8.1f} {stats.get('p99_ms', 0):>8.1f} {stats['errors']:>6}"
+                )
+                if "first_error" in stats:
+                    print(f"    first error: {stats['first_error']}")
+        server.shutdown()
+        results["generation"] = generation_stats.stats()
+
+    if not args.no_micro:
+        results["micro"] = run_micro()
+        print(f"\n{'microbenchmark':<24} {'us':>10}")
+        for name, value in results["micro"].items():
+            print(f"{name:<24} {value:>10.1f}")
+
+    output = args.output or RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Compare the per-scene validation cost before and after the fast path.
+
+"before" replays the old pipeline: validate_scene parses the model's JSON,
+validates, dumps and re-serializes it, then the final answer is parsed and
+validated again. "after" runs the current validate_scene tool and final parse,
+which validates straight from the JSON text once and reuses the result.
+
+    python -m benchmarks.bench_validation
+"""
+import json
+
+from benchmarks.timing import best_of
+from weather_art.agent import _parse_scene, validate_scene, validation_memo
+from weather_art.scene_schema import SceneResponse
+
+SIZES = (10, 30, 100, 500)  # elements per scene
+REPEATS = 20
+
+
+def make_scene(count: int) -> str:
+    kinds = [
+        {"type": "ellipse", "x": 100, "y": 100, "width": 80, "height": 40, "fill": "#cccccc", "opacity": 0.8},
+        {"type": "glow", "x": 650, "y": 100, "radius": 120, "color": "#FFD700", "intensity": 0.6},
+        {"type": "particle_system", "preset": "rain", "color": "#aaaaff", "count": 300},
+        {"type": "text", "content": "12C", "x": 20, "y": 40, "size": 24},
+    ]
+    return json.dumps({
+        "scene": {
+            "canvas": {"width": 800, "height": 600},
+            "background": {"type": "gradient", "colors": ["#1a1a2e", "#0f3460"]},
+            "elements": [kinds[i % len(kinds)] for i in range(count)],
+            "metadata": {"title": "Benchmark", "weather_summary": "Rain"},
+        }
+    })
+
+
+def before(text: str) -> dict:
+    tool_output = json.dumps(SceneResponse.model_validate(json.loads(text)).model_dump())
+    return SceneResponse.model_validate(json.loads(tool_output)).model_dump()
+
+
+def after(text: str) -> dict:
+    validation_memo.clear()
+    tool_output = validate_scene(text)["content"][0]["text"]
+    return _parse_scene(tool_output)
+
+
+def main() -> None:
+    print(f"{'elements':>8} {'before ms':>10} {'after ms':>9} {'saved':>7}")
+    for count in SIZES:
+        text = make_scene(count)
+        assert before(text) == after(text)
+        old = best_of(lambda: before(text), REPEATS)
+        new = best_of(lambda: after(text), REPEATS)
+        print(f"{count:>8} {old * 1000:>10.2f} {new * 1000:>9.2f} {1 - new / old:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Local stand-ins for Ollama and Open-Meteo, so benchmarks need no live services.
+
+StubOpenMeteo answers geocoding and forecast queries from recorded responses
+in fixtures/open_meteo.json. StubOllama speaks Ollama's streaming /api/chat
+protocol and plays a fixed script for each agent: the scene agent reads the
+format guide, fetches the weather, validates its scene and answers with it;
+the weather agent geocodes, fetches the weather and answers with a sentence;
+the tool-less direct agent answers with a scene straight away. Scenes come
+from the procedural templates, so they always validate.
+"""
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "open_meteo.json"
+
+_COORDS = re.compile(r"latitude: (-?[\d.]+), longitude: (-?[\d.]+)")
+_CITY = re.compile(r"weather (?:in|for) ([^.?!\n]+)", re.IGNORECASE)
+_STYLE = re.compile(r"Style: (.+)")
+_CURRENT_WEATHER = re.compile(r"Current weather: (\{.*\})")
+
+STREAM_CHUNK_CHARS = 64
+
+
+class _StubServer:
+    """A threaded HTTP server on a free localhost port, run in a daemon thread."""
+
+    def __init__(self, handler: type[BaseHTTPRequestHandler]):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send_json(self, status: int, body) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _OpenMeteoHandler(_Handler):
+    def do_GET(self) -> None:
+        stub = self.server.stub
+        stub.count_request()
+        time.sleep(stub.latency)
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/v1/search":
+            self._send_json(200, stub.geocode(query.get("name", "")))
+        elif url.path == "/v1/forecast":
+            lats = [float(v) for v in query["latitude"].split(",")]
+            lons = [float(v) for v in query["longitude"].split(",")]
+            locations = [stub.forecast(lat, lon) for lat, lon in zip(lats, lons)]
+            self._send_json(200, locations[0] if len(locations) == 1 else locations)
+        else:
+            self._send_json(404, {"error": True, "reason": f"Unknown path {url.path}"})
+
+
+class StubOpenMeteo(_StubServer):
+    """Open-Meteo geocoding and forecast endpoints backed by recorded responses.
+
+    Unknown cities resolve to the recorded cities in turn, so any number of
+    distinct names can be benchmarked. Forecasts come from the nearest
+    recorded location, relabelled with the requested coordinates.
+    """
+
+    def __init__(self, latency: float = 0.0, fixtures_path: Path = FIXTURES_PATH):
+        super().__init__(_OpenMeteoHandler)
+        self.latency = latency
+        fixtures = json.loads(fixtures_path.read_text())
+        self._geocoding: dict[str, dict] = fixtures["geocoding"]
+        self._forecasts: list[dict] = fixtures["forecast"]
+
+    @property
+    def geocoding_url(self) -> str:
+        return f"{self.url}/v1/search"
+
+    @property
+    def forecast_url(self) -> str:
+        return f"{self.url}/v1/forecast"
+
+    def geocode(self, name: str) -> dict:
+        recorded = self._geocoding.get(name.strip().lower())
+        if recorded is not None:
+            return recorded
+        fallback = list(self._geocoding.values())[sum(map(ord, name)) % len(self._geocoding)]
+        result = dict(fallback["results"][0], name=name)
+        return {"results": [result]}
+
+    def forecast(self, lat: float, lon: float) -> dict:
+        nearest = min(
+            self._forecasts, key=lambda f: (f["latitude"] - lat) ** 2 + (f["longitude"] - lon) ** 2
+        )
+        return dict(nearest, latitude=lat, longitude=lon)
+
+
+class _OllamaHandler(_Handler):
+    def do_POST(self) -> None:
+        stub = self.server.stub
+        stub.count_request()
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if urlsplit(self.path).path != "/api/chat":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        content, tool_calls = stub.script(request)
+        time.sleep(stub.turn_latency)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        started = time.perf_counter()
+        pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+        for piece in pieces:
+            if stub.tokens_per_second:
+                time.sleep(len(piece) / 4 / stub.tokens_per_second)
+            self._write_chunk(stub.chunk(request, {"role": "assistant", "content": piece}))
+        if tool_calls:
+            self._write_chunk(stub.chunk(request, {"role": "assistant", "content": "", "tool_calls": tool_calls}))
+        prompt_tokens = sum(len(m.get("content") or "") for m in request.get("messages", [])) // 4
+        completion_tokens = len(content) // 4 + 20 * len(tool_calls)
+        self._write_chunk(stub.chunk(
+            request,
+            {"role": "assistant", "content": ""},
+            done=True,
+            done_reason="stop",
+            total_duration=int((time.perf_counter() - started + stub.turn_latency) * 1e9),
+            prompt_eval_count=prompt_tokens,
+            eval_count=completion_tokens,
+        ))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, body: dict) -> None:
+        line = json.dumps(body).encode() + b"\n"
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+
+class StubOllama(_StubServer):
+    """Ollama's /api/chat with scripted tool calls instead of a model.
+
+    ``turn_latency`` is added before every response and ``tokens_per_second``
+    (0 for instant) paces the streamed text, roughly like a local model.
+    """
+
+    def __init__(self, turn_latency: float = 0.0, tokens_per_second: float = 0.0):
+        super().__init__(_OllamaHandler)
+        self.turn_latency = turn_latency
+        self.tokens_per_second = tokens_per_second
+
+    def chunk(self, request: dict, message: dict, done: bool = False, **extra) -> dict:
+        return {
+            "model": request.get("model", "stub"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": message,
+            "done": done,
+            **extra,
+        }
+
+    def script(self, request: dict) -> tuple[str, list[dict]]:
+        """Return the next turn's text and tool calls for the conversation so far."""
+        messages = request.get("messages", [])
+        tools = {t["function"]["name"] for t in request.get("tools") or []}
+        called = [c["function"]["name"] for m in messages for c in m.get("tool_calls") or []]
+        prompt = next((m.get("content") or "" for m in messages if m["role"] == "user"), "")
+
+        if not tools:
+            match = _CURRENT_WEATHER.search(prompt)
+            return self._scene_text(json.loads(match.group(1)) if match else {}, prompt), []
+
+        if "validate_scene" in tools:
+            if "get_scene_format" not in called:
+                return "", [_call("get_scene_format")]
+            if "get_weather" not in called:
+                lat, lon = _COORDS.search(prompt).groups()
+                return "", [_call("get_weather", latitude=float(lat), longitude=float(lon))]
+            scene = self._scene_text(_tool_result(messages, called, "get_weather"), prompt)
+            if "validate_scene" not in called:
+                return "", [_call("validate_scene", scene_json=scene)]
+            return scene, []
+
+        if "geocode_location" not in called:
+            match = _CITY.search(prompt)
+            return "", [_call("geocode_location", city_name=match.group(1).strip() if match else prompt)]
+        if "get_weather" not in called:
+            place = _tool_result(messages, called, "geocode_location")
+            return "", [_call("get_weather", latitude=place["latitude"], longitude=place["longitude"])]
+        weather = _tool_result(messages, called, "get_weather")
+        place = _tool_result(messages, called, "geocode_location")
+        return (
+            f"It is {weather['weather_description'].lower()} in {place['name']} at "
+            f"{weather['temperature_c']:.0f}C, feeling like {weather['apparent_temperature_c']:.0f}C, "
+            f"with wind at {weather['wind_speed_kmh']:.0f} km/h."
+        ), []
+
+    def _scene_text(self, weather: dict, prompt: str) -> str:
+        from weather_art.scene_templates import template_scene
+
+        scene = template_scene(weather, location="the stub")
+        style = _STYLE.search(prompt)
+        if style:
+            # Distinct styles give distinct scenes, so caches keyed by content do not hide the work.
+            scene["scene"]["metadata"]["title"] += f" ({style.group(1).strip()})"
+        return json.dumps(scene)
+
+
+def _call(name: str, **arguments) -> dict:
+    return {"function": {"name": name, "arguments": arguments}}
+
+
+def _tool_result(messages: list[dict], called: list[str], name: str) -> dict:
+    """Parse the result of the first call to tool ``name`` from the tool messages."""
+    results = [m.get("content") or "" for m in messages if m["role"] == "tool"]
+    return json.loads(results[called.index(name)])
@@ -0,0 +1,12 @@
+"""Timing helpers shared by the benchmarks."""
+import time
+
+
+def best_of(fn, repeats: int) -> float:
+    """Fastest of ``repeats`` timed calls to ``fn``, in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
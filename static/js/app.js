@@ -12,6 +12,15 @@ document.addEventListener("DOMContentLoaded", () => {
   let renderer = new WeatherArtRenderer("canvas-container");
   let userCoords = null;
 
+  // Preset defaults are fetched once (and HTTP-cached) so scenes can be sent compact.
+  let presetsLoaded = fetch("/api/particle-presets")
+    .then((resp) => (resp.ok ? resp.json() : Promise.reject()))
+    .then((presets) => {
+      renderer.setPresets(presets);
+      return true;
+    })
+    .catch(() => false);
+
   function showError(message) {
     errorAlert.textContent = message;
     errorAlert.classList.remove("d-none");
@@ -69,7 +78,8 @@ document.addEventListener("DOMContentLoaded", () => {
       return;
     }
 
-    const body = { style_prompt: stylePrompt };
+    // bake: the server draws the static layers once, so frames only animate particles.
+    const body = { style_prompt: stylePrompt, compact: await presetsLoaded, bake: true };
 
     if (userCoords) {
       body.location = location || "My Location";
@@ -83,30 +93,65 @@ document.addEventListener("DOMContentLoaded", () => {
     metadataFooter.classList.add("d-none");
 
     try {
-      const resp = await fetch("/api/generate", {
+      const resp = await fetch("/api/generate/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(body),
       });
 
-      const data = await resp.json();
-
       if (!resp.ok) {
+        const data = await resp.json();
         showError(data.error || "Generation failed.");
         return;
       }
 
-      renderer.render(data);
-
-      if (data.scene && data.scene.metadata) {
-        metaTitle.textContent = data.scene.metadata.title || "";
-        metaSummary.textContent = data.scene.metadata.weather_summary || "";
-        metadataFooter.classList.remove("d-none");
-      }
+      let streaming = false;
+      await readEvents(resp, (event) => {
+        if (event.stage === "background" || event.stage === "element") {
+          if (!streaming) {
+            renderer.beginStream();
+            streaming = true;
+          }
+          if (event.stage === "background") renderer.setBackground(event.background);
+          else renderer.addElement(event.element);
+        } else if (event.stage === "completed") {
+          showScene(event.result);
+        } else if (event.stage === "failed") {
+          showError(event.error || "Generation failed.");
+        }
+      });
     } catch (err) {
       showError("Request failed: " + err.message);
     } finally {
       setLoading(false);
     }
   }
+
+  function showScene(data) {
+    renderer.render(data);
+
+    if (data.scene && data.scene.metadata) {
+      metaTitle.textContent = data.scene.metadata.title || "";
+      metaSummary.textContent = data.scene.metadata.weather_summary || "";
+      metadataFooter.classList.remove("d-none");
+    }
+  }
+
+  // Read an NDJSON response, calling onEvent for each line; blank lines are keepalives.
+  async function readEvents(resp, onEvent) {
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+      const lines = buffered.split("\n");
+      buffered = lines.pop();
+      for (const line of lines) {
+        if (line.trim()) onEvent(JSON.parse(line));
+      }
+      if (done) break;
+    }
+    if (buffered.trim()) onEvent(JSON.parse(buffered));
+  }
 });
\ No newline at end of file
@@ -4,33 +4,100 @@ class WeatherArtRenderer {
     this.p5Instance = null;
     this.scene = null;
     this.particles = [];
+    this.ready = false;
+    this.presets = {};
+    this.staticLayers = [];
+    this.layerImages = null;
+  }
+
+  // Particle preset defaults, used to expand compact particle systems.
+  setPresets(presets) {
+    this.presets = presets || {};
+  }
+
+  _expandElement(element) {
+    if (element.type !== "particle_system") return element;
+    return { ...this.presets[element.preset], ...element };
   }
 
   render(sceneJSON) {
-    this.scene = sceneJSON.scene;
+    this.scene = {
+      ...sceneJSON.scene,
+      elements: (sceneJSON.scene.elements || []).map((el) => this._expandElement(el)),
+    };
     if (this.p5Instance) {
       this.p5Instance.remove();
     }
     this.particles = [];
+    this.ready = false;
+    // Server-baked images of the background and of each run of static elements,
+    // each standing in for elements [start, end).
+    this.staticLayers = sceneJSON.static_layers || [];
+    this.layerImages = null;
     this.p5Instance = new p5((p) => {
       p.setup = () => this._setup(p);
       p.draw = () => this._draw(p);
     }, document.getElementById(this.containerId));
   }
 
+  // Progressive rendering: start from an empty scene and add parts as they stream in.
+  beginStream() {
+    this.render({ scene: { canvas: { width: 800, height: 600 }, elements: [] } });
+  }
+
+  setBackground(background) {
+    if (this.scene) this.scene.background = background;
+  }
+
+  addElement(element) {
+    if (!this.scene) return;
+    element = this._expandElement(element);
+    this.scene.elements.push(element);
+    if (this.ready && element.type === "particle_system") {
+      this._initParticleGroup(this.p5Instance, element);
+    }
+  }
+
   _setup(p) {
     const canvas = this.scene.canvas || { width: 800, height: 600 };
     p.createCanvas(canvas.width, canvas.height);
+    if (this.staticLayers.length) {
+      const layers = this.staticLayers;
+      const images = [];
+      let loaded = 0;
+      layers.forEach((layer, i) => {
+        p.loadImage(layer.url, (img) => {
+          images[i] = img;
+          loaded += 1;
+          if (loaded === layers.length && this.staticLayers === layers) this.layerImages = images;
+        });
+      });
+    }
     this._initParticles(p);
+    this.ready = true;
   }
 
   _draw(p) {
-    this._drawBackground(p);
-    for (const element of this.scene.elements || []) {
+    // Until every baked layer has loaded, the whole scene is drawn every frame.
+    const elements = this.scene.elements || [];
+    const layers = this.layerImages ? this.staticLayers : [];
+    let next = 0;
+    let i = 0;
+    if (!layers.length) this._drawBackground(p);
+    const layerStartsAt = (index) => next < layers.length && layers[next].start === index;
+    while (i < elements.length || layerStartsAt(i)) {
+      if (layerStartsAt(i)) {
+        p.image(this.layerImages[next], 0, 0, p.width, p.height);
+        i = layers[next].end;
+        next += 1;
+        continue;
+      }
+      const element = elements[i];
       p.push();
       const opacity = element.opacity !== undefined ? element.opacity : 1.0;
       this._drawElement(p, element, opacity);
       p.pop();
+      i += 1;
     }
   }
 
@@ -165,24 +232,28 @@ class WeatherArtRenderer {
     this.particles = [];
     for (const element of this.scene.elements || []) {
       if (element.type === "particle_system") {
-        const ps = [];
-        const region = { x: 0, y: 0, width: p.width, height: p.height };
-        const angleRad = p.radians(element.angle || 270);
-        const speed = element.speed || 2;
-        for (let i = 0; i < (element.count || 100); i++) {
-          ps.push({
-            x: region.x + p.random(region.width),
-            y: region.y + p.random(region.height),
-            vx: Math.cos(angleRad) * speed + (element.drift || 0) * p.random(-1, 1),
-            vy: Math.sin(angleRad) * speed,
-            size: element.size || 3,
-          });
-        }
-        this.particles.push({ element, particles: ps, region });
+        this._initParticleGroup(p, element);
       }
     }
   }
 
+  _initParticleGroup(p, element) {
+    const ps = [];
+    const region = { x: 0, y: 0, width: p.width, height: p.height };
+    const angleRad = p.radians(element.angle || 270);
+    const speed = element.speed || 2;
+    for (let i = 0; i < (element.count || 100); i++) {
+      ps.push({
+        x: region.x + p.random(region.width),
+        y: region.y + p.random(region.height),
+        vx: Math.cos(angleRad) * speed + (element.drift || 0) * p.random(-1, 1),
+        vy: Math.sin(angleRad) * speed,
+        size: element.size || 3,
+      });
+    }
+    this.particles.push({ element, particles: ps, region });
+  }
+
   _updateAndDrawParticles(p, element, opacity) {
     const group = this.particles.find((g) => g.element === element);
     if (!group) return;
@@ -226,6 +297,9 @@ class WeatherArtRenderer {
       this.p5Instance = null;
     }
     this.particles = [];
+    this.ready = false;
     this.scene = null;
+    this.staticLayers = [];
+    this.layerImages = null;
   }
 }
\ No newline at end of file
@@ -0,0 +1,4 @@
+import os
+
+# Keep test runs away from the developer's persistent geocoding cache.
+os.environ["GEOCODE_CACHE_PATH"] = ":memory:"
@@ -1,6 +1,6 @@
 import pytest
 
-from weather_art.weather import get_current_weather, WMO_CODES
+from weather_art.weather import get_current_weather, get_current_weather_batch, WMO_CODES
 
 pytestmark = pytest.mark.integration
 
@@ -38,4 +38,12 @@ def test_get_current_weather_value_ranges():
     assert 0 <= result["wind_direction_deg"] <= 360
     assert result["precipitation_mm"] >= 0
     assert isinstance(result["is_day"], bool)
-    assert result["weather_code"] in WMO_CODES
\ No newline at end of file
+    assert result["weather_code"] in WMO_CODES
+
+
+def test_get_current_weather_batch_multiple_cities():
+    results = get_current_weather_batch([(BERLIN_LAT, BERLIN_LON), (35.68, 139.69)])
+    assert len(results) == 2
+    for result in results:
+        assert result["weather_code"] in WMO_CODES
+        assert isinstance(result["is_day"], bool)
@@ -1,6 +1,18 @@
+from unittest.mock import MagicMock, Mock
+
 import pytest
 
 from app import app as flask_app
+from weather_art.agent import direct_agent_pool, scene_agent_pool, structured_agent_pool, validation_memo
+from weather_art.generation_stats import generation_stats
+from weather_art.geocoding import get_geocode_cache
+from weather_art.prewarm import prewarmer
+from weather_art.scene_cache import scene_cache
+from weather_art.scene_repair import repair_stats
+from weather_art.scene_store import scene_image_cache, scene_store
+from weather_art.tracing import tracer
+from weather_art.weather import forecast_cache, weather_cache
+from weather_art.weather_agent import weather_agent_pool
 
 
 SAMPLE_SCENE = {
@@ -46,6 +58,76 @@ SAMPLE_WEATHER_DATA = {
 }
 
 
+class FakeClock:
+    """A clock for code that takes ``clock=``; tests move it by setting ``now``."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def agent_result(text: str) -> Mock:
+    """Stand-in for a Strands AgentResult whose str() is the model's answer."""
+    result = Mock()
+    result.__str__ = Mock(return_value=text)
+    return result
+
+
+def mock_agent_returning(MockAgent, *texts: str) -> MagicMock:
+    """Make the patched Agent class build an agent answering ``texts`` in turn; the last one repeats."""
+    results = [agent_result(text) for text in texts]
+    agent = MagicMock(side_effect=lambda *args, **kwargs: results.pop(0) if len(results) > 1 else results[0])
+    MockAgent.return_value = agent
+    return agent
+
+
+@pytest.fixture(autouse=True)
+def reset_agent_pools():
+    scene_agent_pool.clear()
+    direct_agent_pool.clear()
+    structured_agent_pool.clear()
+    weather_agent_pool.clear()
+    yield
+    scene_agent_pool.clear()
+    direct_agent_pool.clear()
+    structured_agent_pool.clear()
+    weather_agent_pool.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    weather_cache.clear()
+    forecast_cache.clear()
+    get_geocode_cache().clear()
+    scene_cache.clear()
+    validation_memo.clear()
+    scene_store.clear()
+    scene_image_cache.clear()
+    yield
+    weather_cache.clear()
+    forecast_cache.clear()
+    get_geocode_cache().clear()
+    scene_cache.clear()
+    validation_memo.clear()
+    scene_store.clear()
+    scene_image_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    repair_stats.reset()
+    generation_stats.reset()
+    tracer.reset()
+    prewarmer.reset()
+    yield
+    repair_stats.reset()
+    generation_stats.reset()
+    tracer.reset()
+    prewarmer.reset()
+
+
 @pytest.fixture
 def client():
     flask_app.config["TESTING"] = True
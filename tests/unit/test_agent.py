@@ -1,13 +1,35 @@
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, Mock, MagicMock
 
 import pytest
+from strands.hooks import BeforeModelCallEvent
 
+from tests.unit.conftest import SAMPLE_GEOCODE_RESULT, SAMPLE_WEATHER_DATA, agent_result, mock_agent_returning
+from weather_art.config import AGENT_POOL_SIZE
+from weather_art.deadline import DeadlineExceeded, deadline_scope
+from weather_art.generation_stats import generation_stats
+from weather_art.scene_cache import scene_cache
+from weather_art.scene_repair import repair_stats
 from weather_art.agent import (
     extract_json_from_response,
     generate_scene,
+    geocode_location,
+    get_weather,
     get_scene_format,
+    scene_flight,
+    scene_format_guide,
+    seed_scene_cache,
     validate_scene,
+    validation_memo,
+    _apply_deadline,
+    _build_direct_agent,
+    _build_scene_agent,
+    _build_structured_agent,
+    _count_model_turn,
+    _parse_scene,
+    structured_output_schema,
 )
 
 
@@ -24,6 +46,13 @@ VALID_SCENE_JSON = json.dumps({
 })
 
 
+@pytest.fixture(autouse=True)
+def lookups():
+    with patch("weather_art.agent.geocode_city", return_value=SAMPLE_GEOCODE_RESULT) as geo, \
+            patch("weather_art.agent.get_current_weather", return_value=SAMPLE_WEATHER_DATA) as weather:
+        yield geo, weather
+
+
 class TestExtractJson:
     def test_plain_json(self):
         result = extract_json_from_response('{"scene": {}}')
@@ -61,16 +90,28 @@ class TestGetSceneFormat:
         assert "6 Element Types" in text
         assert "Weather-to-Visual" in text
 
+    def test_guide_rendered_once(self):
+        assert scene_format_guide() is scene_format_guide()
+
+    def test_compact_guide_is_smaller(self):
+        full = scene_format_guide()
+        compact = scene_format_guide(compact=True)
+        assert len(compact) < len(full) * 0.7
+        assert "6 Element Types" in compact
+        assert '"title":{"default":""' in compact
+        assert '"title":"Ellipse"' not in compact
+
+    @patch("weather_art.agent.SCENE_FORMAT_COMPACT", True)
+    def test_tool_serves_compact_guide_when_configured(self):
+        result = get_scene_format()
+        assert result["content"][0]["text"] == scene_format_guide(compact=True)
+
 
 class TestGenerateScene:
     @patch("weather_art.agent.OllamaModel")
     @patch("weather_art.agent.Agent")
     def test_generate_scene_with_city(self, MockAgent, MockModel):
-        mock_agent_instance = MagicMock()
-        mock_result = Mock()
-        mock_result.__str__ = Mock(return_value=VALID_SCENE_JSON)
-        mock_agent_instance.return_value = mock_result
-        MockAgent.return_value = mock_agent_instance
+        mock_agent_instance = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
 
         scene = generate_scene("Berlin")
 
@@ -82,11 +123,7 @@ class TestGenerateScene:
     @patch("weather_art.agent.OllamaModel")
     @patch("weather_art.agent.Agent")
     def test_generate_scene_with_coords(self, MockAgent, MockModel):
-        mock_agent_instance = MagicMock()
-        mock_result = Mock()
-        mock_result.__str__ = Mock(return_value=VALID_SCENE_JSON)
-        mock_agent_instance.return_value = mock_result
-        MockAgent.return_value = mock_agent_instance
+        mock_agent_instance = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
 
         scene = generate_scene("Berlin", latitude=52.52, longitude=13.41)
 
@@ -97,17 +134,461 @@ class TestGenerateScene:
     @patch("weather_art.agent.OllamaModel")
     @patch("weather_art.agent.Agent")
     def test_generate_scene_with_style(self, MockAgent, MockModel):
-        mock_agent_instance = MagicMock()
-        mock_result = Mock()
-        mock_result.__str__ = Mock(return_value=VALID_SCENE_JSON)
-        mock_agent_instance.return_value = mock_result
-        MockAgent.return_value = mock_agent_instance
+        mock_agent_instance = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
 
         generate_scene("Berlin", style_prompt="watercolor")
 
         call_args = mock_agent_instance.call_args[0][0]
         assert "watercolor" in call_args
 
+    @patch("weather_art.agent.OllamaModel")
+    @patch("weather_art.agent.Agent")
+    def test_generate_scene_reuses_pooled_agent(self, MockAgent, MockModel):
+        mock_agent_instance = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        generate_scene("Berlin")
+        generate_scene("Tokyo", style_prompt="ink")
+
+        MockAgent.assert_called_once()
+        MockModel.assert_called_once()
+        assert mock_agent_instance.call_count == 2
+
+    @patch("weather_art.agent.OllamaModel")
+    @patch("weather_art.agent.Agent")
+    def test_generate_scene_resolves_coordinates_for_agent(self, MockAgent, MockModel, lookups):
+        mock_agent_instance = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        generate_scene("Berlin")
+
+        lookups[0].assert_called_once_with("Berlin")
+        call_args = mock_agent_instance.call_args[0][0]
+        assert "latitude: 52.52" in call_args
+
+    def test_generate_scene_unknown_mode(self):
+        with pytest.raises(ValueError, match="Unknown generation mode"):
+            generate_scene("Berlin", mode="psychic")
+
+
+@patch("weather_art.agent.get_current_weather", return_value=SAMPLE_WEATHER_DATA)
+@patch("weather_art.agent.geocode_city", return_value=SAMPLE_GEOCODE_RESULT)
+@patch("weather_art.agent.OllamaModel")
+@patch("weather_art.agent.Agent")
+class TestGenerateSceneDirect:
+    def test_direct_mode_resolves_weather_in_python(self, MockAgent, MockModel, mock_geo, mock_weather):
+        agent = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        scene = generate_scene("Berlin", style_prompt="watercolor", mode="direct")
+
+        assert scene["scene"]["metadata"]["title"] == "Sunny Day"
+        mock_geo.assert_called_once_with("Berlin")
+        mock_weather.assert_called_once_with(52.52, 13.41)
+        assert MockAgent.call_args.kwargs["tools"] == []
+        agent.assert_called_once()
+        message = agent.call_args[0][0]
+        assert "Slight rain" in message
+        assert "watercolor" in message
+
+    def test_direct_mode_reports_progress(self, MockAgent, MockModel, mock_geo, mock_weather):
+        mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+        progress = Mock()
+
+        generate_scene("Berlin", mode="direct", progress=progress)
+
+        stages = [c.args[0] for c in progress.call_args_list]
+        assert stages == ["geocoded", "weather_fetched", "validating"]
+        assert progress.call_args_list[1].kwargs["weather"] == SAMPLE_WEATHER_DATA
+
+    def test_direct_mode_streams_scene_parts(self, MockAgent, MockModel, mock_geo, mock_weather):
+        agent = MagicMock()
+
+        def stream(message):
+            for i in range(0, len(VALID_SCENE_JSON), 7):
+                agent.callback_handler(data=VALID_SCENE_JSON[i:i + 7])
+            return agent_result(VALID_SCENE_JSON)
+
+        agent.side_effect = stream
+        MockAgent.return_value = agent
+        original_handler = agent.callback_handler
+        progress = Mock()
+
+        generate_scene("Berlin", mode="direct", progress=progress)
+
+        stages = [c.args[0] for c in progress.call_args_list]
+        assert stages == [
+            "geocoded", "weather_fetched", "background", "element", "element", "metadata", "validating",
+        ]
+        assert progress.call_args_list[3].kwargs["element"]["type"] == "glow"
+        assert progress.call_args_list[4].kwargs["index"] == 1
+        assert agent.callback_handler is original_handler
+
+    def test_direct_mode_skips_geocoding_with_coords(self, MockAgent, MockModel, mock_geo, mock_weather):
+        mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        generate_scene("Berlin", latitude=48.0, longitude=11.0, mode="direct")
+
+        mock_geo.assert_not_called()
+        mock_weather.assert_called_once_with(48.0, 11.0)
+
+    def test_direct_mode_retries_invalid_json_once(self, MockAgent, MockModel, mock_geo, mock_weather):
+        agent = mock_agent_returning(MockAgent, "not json at all", VALID_SCENE_JSON)
+
+        scene = generate_scene("Berlin", mode="direct")
+
+        assert scene["scene"]["metadata"]["title"] == "Sunny Day"
+        assert agent.call_count == 2
+        assert "Validation failed" in agent.call_args[0][0]
+
+    def test_direct_mode_repairs_before_retrying(self, MockAgent, MockModel, mock_geo, mock_weather):
+        scene = json.loads(VALID_SCENE_JSON)
+        scene["scene"]["elements"][1]["width"] = "80px"
+        scene["scene"]["elements"].append({"preset": "rain", "count": 5000})
+        agent = mock_agent_returning(MockAgent, json.dumps(scene))
+        progress = Mock()
+
+        result = generate_scene("Berlin", mode="direct", progress=progress)
+
+        agent.assert_called_once()
+        elements = result["scene"]["elements"]
+        assert len(elements) == 2
+        assert elements[1]["type"] == "particle_system"
+        assert elements[1]["count"] == 1000
+        repaired = [c for c in progress.call_args_list if c.args[0] == "repaired"]
+        assert len(repaired) == 1
+        assert any("dropped" in change for change in repaired[0].kwargs["changes"])
+        assert repair_stats.stats()["repaired"] == 1
+
+    def test_direct_mode_gives_up_after_max_attempts(self, MockAgent, MockModel, mock_geo, mock_weather):
+        mock_agent_returning(MockAgent, "not json at all", "still not json")
+
+        with pytest.raises(json.JSONDecodeError):
+            generate_scene("Berlin", mode="direct")
+
+
+@patch("weather_art.agent.OllamaModel")
+@patch("weather_art.agent.Agent")
+class TestSceneCache:
+    def test_repeat_request_skips_model(self, MockAgent, MockModel):
+        agent = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        first = generate_scene("Berlin", style_prompt="Watercolor")
+        second = generate_scene("berlin", style_prompt="  watercolor ")
+
+        assert first == second
+        agent.assert_called_once()
+        assert scene_cache.stats()["hits"] == 1
+
+    def test_cache_hit_reports_progress(self, MockAgent, MockModel):
+        mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+        generate_scene("Berlin")
+        progress = Mock()
+
+        generate_scene("Berlin", progress=progress)
+
+        assert progress.call_args_list[-1].args == ("cache_hit",)
+
+    def test_non_string_style_prompt_is_coerced(self, MockAgent, MockModel):
+        agent = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        generate_scene("Berlin", style_prompt=5)
+        generate_scene("Berlin", style_prompt="5")
+
+        agent.assert_called_once()
+        assert "Style: 5" in agent.call_args[0][0]
+
+    def test_different_style_misses(self, MockAgent, MockModel):
+        agent = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        generate_scene("Berlin", style_prompt="watercolor")
+        generate_scene("Berlin", style_prompt="pixel art")
+
+        assert agent.call_count == 2
+
+    def test_changed_weather_misses(self, MockAgent, MockModel, lookups):
+        agent = mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        generate_scene("Berlin")
+        lookups[1].return_value = {**SAMPLE_WEATHER_DATA, "weather_code": 71}
+        generate_scene("Berlin")
+
+        assert agent.call_count == 2
+
+    def test_cached_scene_is_not_shared_with_callers(self, MockAgent, MockModel):
+        mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        generate_scene("Berlin")["scene"]["metadata"]["title"] = "Mutated"
+
+        assert generate_scene("Berlin")["scene"]["metadata"]["title"] == "Sunny Day"
+
+    def test_concurrent_identical_requests_share_generation(self, MockAgent, MockModel):
+        release = threading.Event()
+
+        def slow_agent(message):
+            release.wait(5)
+            return agent_result(VALID_SCENE_JSON)
+
+        agent = MagicMock(side_effect=slow_agent)
+        MockAgent.return_value = agent
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(generate_scene, "Berlin") for _ in range(3)]
+            while scene_flight.stats()["in_flight"] == 0:
+                pass
+            release.set()
+            results = [f.result(timeout=5) for f in futures]
+
+        assert agent.call_count == 1
+        assert results[0] == results[1] == results[2]
+        assert results[0] is not results[1]
+
+    def test_concurrent_requests_in_different_modes_generate_separately(self, MockAgent, MockModel):
+        release = threading.Event()
+
+        def slow_agent(message):
+            release.wait(5)
+            return agent_result(VALID_SCENE_JSON)
+
+        agent = MagicMock(side_effect=slow_agent)
+        MockAgent.return_value = agent
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(generate_scene, "Berlin", mode=mode) for mode in ("direct", "structured")]
+            while scene_flight.stats()["in_flight"] < 2:
+                pass
+            release.set()
+            for future in futures:
+                future.result(timeout=5)
+
+        assert agent.call_count == 2
+
+    def test_entry_ttl_follows_weather_freshness(self, MockAgent, MockModel):
+        mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        with patch("weather_art.agent.weather_ttl_remaining", return_value=120.0):
+            with patch.object(scene_cache, "set", wraps=scene_cache.set) as cache_set:
+                generate_scene("Berlin")
+
+        assert cache_set.call_args.kwargs["ttl"] == 120.0
+
+
+@patch("weather_art.agent.OllamaModel")
+@patch("weather_art.agent.Agent")
+class TestFallback:
+    def test_slow_model_gets_template_then_caches_real_scene(self, MockAgent, MockModel):
+        release = threading.Event()
+
+        def slow_agent(message):
+            release.wait(5)
+            return agent_result(VALID_SCENE_JSON)
+
+        MockAgent.return_value = MagicMock(side_effect=slow_agent)
+        progress = Mock()
+
+        scene = generate_scene("Berlin", mode="direct", progress=progress, fallback_after=0.05)
+
+        assert scene["scene"]["metadata"]["title"] == "Slight rain in Berlin"
+        fallback = [c for c in progress.call_args_list if c.args[0] == "fallback"]
+        assert fallback[0].kwargs["reason"] == "timeout"
+
+        release.set()
+        for _ in range(100):
+            if len(scene_cache):
+                break
+            threading.Event().wait(0.01)
+        assert generate_scene("Berlin", mode="direct")["scene"]["metadata"]["title"] == "Sunny Day"
+        assert progress.call_args_list[-1].args[0] == "fallback"
+
+    def test_failing_model_gets_template(self, MockAgent, MockModel):
+        MockAgent.return_value = MagicMock(side_effect=ConnectionError("Ollama unavailable"))
+        progress = Mock()
+
+        scene = generate_scene("Berlin", mode="direct", progress=progress, fallback_after=5)
+
+        assert scene["scene"]["metadata"]["weather_summary"].startswith("Slight rain")
+        assert progress.call_args_list[-1].kwargs["reason"] == "Ollama unavailable"
+        assert len(scene_cache) == 0
+
+    def test_fast_model_is_returned(self, MockAgent, MockModel):
+        mock_agent_returning(MockAgent, VALID_SCENE_JSON)
+
+        scene = generate_scene("Berlin", mode="direct", fallback_after=5)
+
+        assert scene["scene"]["metadata"]["title"] == "Sunny Day"
+
+    def test_joined_requests_do_not_hold_fallback_threads(self, MockAgent, MockModel):
+        release = threading.Event()
+
+        def agent(message):
+            if "Berlin" in message:
+                release.wait(5)
+            return agent_result(VALID_SCENE_JSON)
+
+        MockAgent.return_value = MagicMock(side_effect=agent)
+        coalesced = scene_flight.stats()["coalesced"]
+        with ThreadPoolExecutor(max_workers=AGENT_POOL_SIZE) as pool:
+            try:
+                for _ in range(AGENT_POOL_SIZE):
+                    pool.submit(generate_scene, "Berlin", mode="direct", fallback_after=5)
+                while scene_flight.stats()["coalesced"] < coalesced + AGENT_POOL_SIZE - 1:
+                    pass
+                scene = generate_scene("Oslo", 59.91, 10.75, mode="direct", fallback_after=5)
+            finally:
+                release.set()
+
+        assert scene["scene"]["metadata"]["title"] == "Sunny Day"
+
+    def test_saturated_executor_serves_template_without_generating(self, MockAgent, MockModel):
+        progress = Mock()
+
+        with patch("weather_art.agent._fallback_slots", threading.BoundedSemaphore(1)) as slots:
+            slots.acquire()
+            scene = generate_scene("Berlin", mode="direct", progress=progress, fallback_after=5)
+
+        assert scene["scene"]["metadata"]["title"] == "Slight rain in Berlin"
+        assert progress.call_args_list[-1].kwargs["reason"] == "busy"
+        MockAgent.assert_not_called()
+
+    def test_seed_scene_cache(self, MockAgent, MockModel):
+        assert seed_scene_cache(52.52, 13.41, SAMPLE_WEATHER_DATA, location="Berlin", ttl=60)
+        assert not seed_scene_cache(52.52, 13.41, SAMPLE_WEATHER_DATA, ttl=60)
+
+        scene = generate_scene("Berlin", latitude=52.52, longitude=13.41)
+
+        MockAgent.assert_not_called()
+        assert scene["scene"]["metadata"]["title"] == "Slight rain in Berlin"
+
+
+@patch("weather_art.agent.OllamaModel")
+@patch("weather_art.agent.Agent")
+class TestStructuredMode:
+    def _counting_agent(self, MockAgent, *texts):
+        """An agent answering ``texts`` in turn that counts its model turns like a real one."""
+        agent = mock_agent_returning(MockAgent, *texts)
+        answer = agent.side_effect
+
+        def counted(message):
+            _count_model_turn(None)
+            return answer(message)
+
+        agent.side_effect = counted
+        return agent
+
+    def test_structured_mode_constrains_output_format(self, MockAgent, MockModel):
+        self._counting_agent(MockAgent, VALID_SCENE_JSON)
+
+        scene = generate_scene("Berlin", mode="structured")
+
+        assert scene["scene"]["metadata"]["title"] == "Sunny Day"
+        assert MockModel.call_args.kwargs["additional_args"] == {"format": structured_output_schema()}
+        assert MockAgent.call_args.kwargs["tools"] == []
+
+    def test_schema_is_reduced(self, MockAgent, MockModel):
+        schema = structured_output_schema()
+        text = json.dumps(schema)
+        assert "$ref" not in text
+        assert "discriminator" not in text
+        assert "oneOf" not in text
+        scene = schema["properties"]["scene"]
+        assert scene["required"] == ["background", "elements", "metadata"]
+        for member in scene["properties"]["elements"]["items"]["anyOf"]:
+            assert member["required"][0] == "type"
+
+    def test_stats_per_mode(self, MockAgent, MockModel):
+        self._counting_agent(MockAgent, "not json at all", VALID_SCENE_JSON)
+        generate_scene("Berlin", mode="direct")
+        scene_cache.clear()
+        self._counting_agent(MockAgent, VALID_SCENE_JSON)
+        generate_scene("Berlin", mode="structured")
+
+        stats = generation_stats.stats()
+        assert stats["direct"]["scenes"] == 1
+        assert stats["direct"]["model_turns"] == 2
+        assert stats["direct"]["validation_failure_rate"] == 0.5
+        assert stats["structured"]["mean_model_turns"] == 1
+        assert stats["structured"]["validation_failure_rate"] == 0
+
+    def test_stats_count_failed_generations(self, MockAgent, MockModel):
+        self._counting_agent(MockAgent, "not json at all", "still not json")
+
+        with pytest.raises(Exception):
+            generate_scene("Berlin", mode="structured")
+
+        stats = generation_stats.stats()["structured"]
+        assert stats["failed"] == 1
+        assert stats["invalid_answers"] == 2
+
+
+@patch("weather_art.agent.OllamaModel")
+@patch("weather_art.agent.Agent")
+class TestDeadline:
+    def test_slow_model_falls_back_at_deadline(self, MockAgent, MockModel):
+        release = threading.Event()
+
+        def slow_agent(message):
+            release.wait(5)
+            raise TimeoutError("model call timed out")
+
+        MockAgent.return_value = MagicMock(side_effect=slow_agent)
+        progress = Mock()
+        try:
+            scene = generate_scene("Berlin", mode="direct", progress=progress, deadline=0.1)
+        finally:
+            release.set()
+
+        assert scene["scene"]["metadata"]["title"] == "Slight rain in Berlin"
+        assert progress.call_args_list[-1].args[0] == "fallback"
+
+    def test_no_correction_turn_near_deadline(self, MockAgent, MockModel):
+        agent = mock_agent_returning(MockAgent, "not json at all")
+
+        scene = generate_scene("Berlin", mode="direct", deadline=1)
+
+        agent.assert_called_once()
+        assert scene["scene"]["metadata"]["title"] == "Slight rain in Berlin"
+
+    def test_model_hook_limits_client_timeout(self, MockAgent, MockModel):
+        event = Mock()
+        event.agent.model.client_args = {}
+        _apply_deadline(event)
+        assert event.agent.model.client_args == {}
+
+        with deadline_scope(3):
+            _apply_deadline(event)
+        assert 0 < event.agent.model.client_args["timeout"] <= 3
+
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceeded):
+                _apply_deadline(event)
+
+    def test_builders_register_hook(self, MockAgent, MockModel):
+        for build in (_build_scene_agent, _build_direct_agent, _build_structured_agent):
+            agent = build()
+            agent.hooks.add_callback.assert_any_call(BeforeModelCallEvent, _apply_deadline)
+
+
+class TestToolProgress:
+    @patch("weather_art.agent.get_current_weather", return_value=SAMPLE_WEATHER_DATA)
+    @patch("weather_art.agent.geocode_city", return_value=SAMPLE_GEOCODE_RESULT)
+    @patch("weather_art.agent.OllamaModel")
+    @patch("weather_art.agent.Agent")
+    def test_tools_report_to_running_generation(self, MockAgent, MockModel, mock_geo, mock_weather):
+        def run_tools(message):
+            geocode_location("Berlin")
+            get_weather(52.52, 13.41)
+            validate_scene(VALID_SCENE_JSON)
+            return agent_result(VALID_SCENE_JSON)
+
+        MockAgent.return_value = MagicMock(side_effect=run_tools)
+        progress = Mock()
+
+        generate_scene("Berlin", progress=progress)
+
+        stages = [c.args[0] for c in progress.call_args_list]
+        assert stages == ["geocoded", "weather_fetched", "validating"]
+
+    def test_tools_silent_outside_generation(self):
+        assert validate_scene(VALID_SCENE_JSON)["status"] == "success"
+
+
 class TestValidateScene:
     def test_validate_scene_success(self):
         result = validate_scene(VALID_SCENE_JSON)
@@ -125,6 +606,31 @@ class TestValidateScene:
         assert result["status"] == "error"
         assert "Validation failed" in result["content"][0]["text"]
 
+    def test_validate_scene_repairs_locally(self):
+        scene = json.loads(VALID_SCENE_JSON)
+        scene["scene"]["elements"][0]["opacity"] = "0.5"
+        del scene["scene"]["elements"][1]["type"]
+        result = validate_scene(json.dumps(scene))
+        assert result["status"] == "success"
+        parsed = json.loads(result["content"][0]["text"])
+        assert parsed["scene"]["elements"][1]["type"] == "ellipse"
+        assert repair_stats.stats()["model_turns_saved"] == 1
+
+    def test_final_answer_reuses_tool_validation(self):
+        result = validate_scene(VALID_SCENE_JSON)
+        returned = result["content"][0]["text"]
+        with patch("weather_art.agent.SceneResponse.model_validate_json") as mock_validate:
+            scene = _parse_scene(returned)
+            again = _parse_scene(VALID_SCENE_JSON)
+        mock_validate.assert_not_called()
+        assert scene == again == json.loads(returned)
+        assert validation_memo.stats()["hits"] == 2
+
+    def test_parse_scene_results_are_independent(self):
+        first = _parse_scene(VALID_SCENE_JSON)
+        first["scene"]["elements"].clear()
+        assert len(_parse_scene(VALID_SCENE_JSON)["scene"]["elements"]) == 2
+
     def test_validate_scene_strips_fences(self):
         fenced = f"```json\n{VALID_SCENE_JSON}\n```"
         result = validate_scene(fenced)
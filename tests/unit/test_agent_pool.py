@@ -0,0 +1,104 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from weather_art.agent_pool import AgentPool
+from weather_art.deadline import deadline_scope
+
+
+def make_pool(**kwargs):
+    factory = MagicMock(side_effect=lambda: MagicMock(messages=[]))
+    return AgentPool(factory, **{"max_size": 2, **kwargs}), factory
+
+
+def test_lease_reuses_idle_agent():
+    pool, factory = make_pool()
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    assert first is second
+    factory.assert_called_once()
+
+
+def test_lease_clears_message_history():
+    pool, _ = make_pool()
+    with pool.lease() as agent:
+        agent.messages.append({"role": "user", "content": [{"text": "hi"}]})
+    with pool.lease() as agent:
+        assert agent.messages == []
+
+
+def test_failed_lease_discards_agent():
+    pool, factory = make_pool()
+    with pytest.raises(RuntimeError):
+        with pool.lease() as first:
+            raise RuntimeError("model connection reset")
+    with pool.lease() as second:
+        pass
+    assert first is not second
+    assert factory.call_count == 2
+    assert pool.stats()["discarded"] == 1
+
+
+def test_agent_recycled_after_max_uses():
+    pool, factory = make_pool(max_uses=2)
+    for _ in range(3):
+        with pool.lease():
+            pass
+    assert factory.call_count == 2
+    assert pool.stats() == {"idle": 1, "created": 2, "discarded": 1}
+
+
+def test_concurrent_leases_get_distinct_agents():
+    pool, factory = make_pool()
+    with pool.lease() as first, pool.lease() as second:
+        assert first is not second
+    assert pool.stats()["idle"] == 2
+
+
+def test_lease_times_out_when_pool_exhausted():
+    pool, _ = make_pool(max_size=1, acquire_timeout=0.01)
+    with pool.lease():
+        with pytest.raises(TimeoutError):
+            with pool.lease():
+                pass
+
+
+def test_lease_wait_bounded_by_deadline():
+    pool, _ = make_pool(max_size=1, acquire_timeout=5)
+    with pool.lease():
+        with deadline_scope(0.01):
+            with pytest.raises(TimeoutError):
+                with pool.lease():
+                    pass
+
+
+def test_lease_waits_for_released_agent():
+    pool, factory = make_pool(max_size=1, acquire_timeout=5)
+    holding = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with pool.lease():
+            holding.set()
+            release.wait()
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    holding.wait()
+    release.set()
+    with pool.lease():
+        pass
+    worker.join()
+    factory.assert_called_once()
+
+
+def test_in_use_counts_leased_agents():
+    pool, _ = make_pool()
+    with pool.lease():
+        with pool.lease():
+            assert pool.in_use() == 2
+        assert pool.in_use() == 1
+    assert pool.in_use() == 0
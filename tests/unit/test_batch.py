@@ -0,0 +1,112 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from tests.unit.conftest import SAMPLE_GEOCODE_RESULT, SAMPLE_SCENE, SAMPLE_WEATHER_DATA
+from weather_art.batch import generate_scenes_batch
+
+
+@pytest.fixture
+def mocks():
+    with patch("weather_art.batch.geocode_city", return_value=SAMPLE_GEOCODE_RESULT) as geo, \
+            patch("weather_art.batch.get_current_weather_batch") as weather, \
+            patch("weather_art.batch.generate_scene", return_value=SAMPLE_SCENE) as gen:
+        weather.side_effect = lambda coords: [SAMPLE_WEATHER_DATA] * len(coords)
+        yield geo, weather, gen
+
+
+def test_results_in_input_order(mocks):
+    geo, weather, gen = mocks
+    results = generate_scenes_batch([
+        {"location": "Berlin"},
+        {"location": "Paris", "latitude": 48.85, "longitude": 2.35},
+    ])
+
+    assert [r["location"] for r in results] == ["Berlin", "Paris"]
+    assert results[0]["latitude"] == 52.52
+    assert all(r["scene"] == SAMPLE_SCENE for r in results)
+    geo.assert_called_once_with("Berlin")
+    weather.assert_called_once_with([(52.52, 13.41), (48.85, 2.35)])
+    assert gen.call_count == 2
+
+
+def test_duplicate_locations_share_one_generation(mocks):
+    _, weather, gen = mocks
+    results = generate_scenes_batch([
+        {"location": "Berlin"},
+        {"location": "Berlin", "latitude": 52.52, "longitude": 13.41},
+        {"location": "Berlin", "style_prompt": "ink"},
+    ], style_prompt="watercolor")
+
+    assert len(results) == 3
+    assert gen.call_count == 2
+    assert {c.kwargs["style_prompt"] for c in gen.call_args_list} == {"watercolor", "ink"}
+    assert len(weather.call_args[0][0]) == 2
+
+
+def test_per_item_errors(mocks):
+    geo, _, gen = mocks
+    geo.side_effect = ValueError("City not found: Xyzzy")
+    gen.side_effect = [RuntimeError("Ollama unavailable")]
+
+    results = generate_scenes_batch([
+        {"location": "Xyzzy"},
+        {"location": "Paris", "latitude": 48.85, "longitude": 2.35},
+    ])
+
+    assert results[0] == {"location": "Xyzzy", "latitude": None, "longitude": None,
+                          "error": "City not found: Xyzzy"}
+    assert results[1]["error"] == "Ollama unavailable"
+
+
+def test_bulk_weather_failure_falls_back_to_per_scene_fetch(mocks):
+    _, weather, gen = mocks
+    weather.side_effect = ConnectionError("upstream down")
+
+    results = generate_scenes_batch([{"location": "Berlin"}])
+
+    assert results[0]["scene"] == SAMPLE_SCENE
+    gen.assert_called_once()
+
+
+def test_generations_run_concurrently(mocks):
+    _, _, gen = mocks
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wait_for_peers(**kwargs):
+        barrier.wait()
+        return SAMPLE_SCENE
+
+    gen.side_effect = wait_for_peers
+    results = generate_scenes_batch(
+        [{"location": str(i), "latitude": i, "longitude": i} for i in range(3)],
+        max_workers=3,
+    )
+
+    assert all("scene" in r for r in results)
+
+
+def test_non_string_style_prompt_is_coerced(mocks):
+    _, _, gen = mocks
+    results = generate_scenes_batch([{"location": "Berlin", "style_prompt": 5}, {"location": "Paris"}],
+                                    style_prompt=None)
+    assert all("scene" in r for r in results)
+    assert sorted(c.kwargs["style_prompt"] for c in gen.call_args_list) == ["", "5"]
+
+
+def test_passes_mode_through(mocks):
+    _, _, gen = mocks
+    generate_scenes_batch([{"location": "Berlin"}], mode="direct")
+    assert gen.call_args.kwargs["mode"] == "direct"
+
+
+def test_deadline_covers_the_whole_batch(mocks):
+    _, _, gen = mocks
+    with patch("weather_art.batch.Deadline") as MockDeadline:
+        MockDeadline.return_value.remaining.return_value = 4.0
+        generate_scenes_batch([{"location": "Berlin"}], fallback_after=1.5, deadline=10)
+
+    MockDeadline.assert_called_once_with(10)
+    assert gen.call_args.kwargs["fallback_after"] == 1.5
+    assert gen.call_args.kwargs["deadline"] == 4.0
@@ -0,0 +1,102 @@
+from tests.unit.conftest import FakeClock
+from weather_art.cache import TTLCache, quantize_coords
+
+
+def test_quantize_coords_shares_grid_cell():
+    assert quantize_coords(52.52, 13.41, 0.05) == quantize_coords(52.51, 13.42, 0.05)
+    assert quantize_coords(52.52, 13.41, 0.05) == (52.5, 13.4)
+
+
+def test_quantize_coords_zero_grid_is_identity():
+    assert quantize_coords(52.5234, 13.4111, 0) == (52.5234, 13.4111)
+
+
+def test_get_and_set():
+    cache = TTLCache(max_entries=4, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=4, ttl=60, clock=clock)
+    cache.set("a", 1)
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_capped_by_cache_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=4, ttl=60, clock=clock)
+    cache.set("short", 1, ttl=10)
+    cache.set("long", 2, ttl=600)
+    clock.now += 30
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    clock.now += 31
+    assert cache.get("long") is None
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_ttl_disables_cache():
+    cache = TTLCache(max_entries=2, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_clear_resets_entries_and_counters():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.clear()
+    assert cache.stats() == {
+        "size": 0,
+        "max_entries": 2,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "expirations": 0,
+    }
+
+
+def test_ttl_remaining():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=2, ttl=60, clock=clock)
+    assert cache.ttl_remaining("a") is None
+    cache.set("a", 1)
+    clock.now += 20
+    assert cache.ttl_remaining("a") == 40
+    clock.now += 40
+    assert cache.ttl_remaining("a") is None
+    assert cache.stats()["hits"] == 0
+
+
+def test_refresh_restarts_expiry_without_counting_a_lookup():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=4, ttl=60, clock=clock)
+    cache.set("a", 1, ttl=10)
+    clock.now += 5
+    assert cache.refresh("a", ttl=30)
+    assert cache.ttl_remaining("a") == 30
+    assert cache.stats()["hits"] == 0
+    assert not cache.refresh("missing")
+    clock.now += 31
+    assert not cache.refresh("a")
@@ -0,0 +1,57 @@
+import pytest
+
+from tests.unit.conftest import FakeClock
+from weather_art.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    clamp_timeout,
+    current_deadline,
+    deadline_scope,
+)
+
+
+def test_deadline_remaining():
+    clock = FakeClock()
+    deadline = Deadline(5, clock=clock)
+    clock.now += 2
+    assert deadline.remaining() == 3
+    assert not deadline.expired
+    clock.now += 4
+    assert deadline.remaining() == 0
+    assert deadline.expired
+
+
+def test_no_deadline_leaves_timeouts_alone():
+    assert current_deadline() is None
+    assert clamp_timeout(10) == 10
+    assert clamp_timeout(None) is None
+
+
+def test_scope_clamps_timeouts():
+    with deadline_scope(2) as deadline:
+        assert current_deadline() is deadline
+        assert clamp_timeout(10) <= 2
+        assert clamp_timeout(0.5) == 0.5
+        assert clamp_timeout(None) <= 2
+    assert current_deadline() is None
+
+
+def test_nested_scope_keeps_sooner_deadline():
+    with deadline_scope(1) as outer:
+        with deadline_scope(60) as inner:
+            assert inner is outer
+        with deadline_scope(0.5) as inner:
+            assert inner is not outer
+            assert current_deadline() is inner
+        with deadline_scope(None) as inner:
+            assert inner is outer
+
+
+def test_expired_deadline_raises():
+    with deadline_scope(0):
+        with pytest.raises(DeadlineExceeded):
+            clamp_timeout(10)
+
+
+def test_deadline_exceeded_is_a_timeout():
+    assert issubclass(DeadlineExceeded, TimeoutError)
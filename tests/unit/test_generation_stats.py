@@ -0,0 +1,36 @@
+from weather_art.generation_stats import GenerationAttempt, GenerationStats, attempt_scope, current_attempt
+
+
+def _attempt(turns, answers, invalid):
+    attempt = GenerationAttempt()
+    attempt.model_turns, attempt.answers, attempt.invalid_answers = turns, answers, invalid
+    return attempt
+
+
+def test_stats_aggregate_per_mode():
+    stats = GenerationStats()
+    stats.record("agent", _attempt(4, 2, 1), succeeded=True)
+    stats.record("agent", _attempt(6, 3, 3), succeeded=False)
+    stats.record("structured", _attempt(1, 1, 0), succeeded=True)
+
+    result = stats.stats()
+    assert result["agent"]["scenes"] == 1
+    assert result["agent"]["failed"] == 1
+    assert result["agent"]["mean_model_turns"] == 5
+    assert result["agent"]["validation_failure_rate"] == 0.8
+    assert result["structured"]["validation_failure_rate"] == 0
+
+
+def test_stats_without_answers():
+    stats = GenerationStats()
+    stats.record("direct", _attempt(1, 0, 0), succeeded=False)
+    assert stats.stats()["direct"]["validation_failure_rate"] == 0.0
+    stats.reset()
+    assert stats.stats() == {}
+
+
+def test_attempt_scope_sets_current_attempt():
+    assert current_attempt() is None
+    with attempt_scope() as attempt:
+        assert current_attempt() is attempt
+    assert current_attempt() is None
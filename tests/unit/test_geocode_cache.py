@@ -0,0 +1,69 @@
+from tests.unit.conftest import FakeClock
+from weather_art.geocode_cache import NOT_FOUND, GeocodeCache, normalize_city_name
+
+BERLIN = {
+    "name": "Berlin",
+    "latitude": 52.52437,
+    "longitude": 13.41053,
+    "country": "Germany",
+    "timezone": "Europe/Berlin",
+}
+
+
+def test_normalize_city_name_folds_case_whitespace_and_diacritics():
+    assert normalize_city_name("  São   Paulo ") == "sao paulo"
+    assert normalize_city_name("ZÜRICH") == "zurich"
+    assert normalize_city_name("Malmö") == normalize_city_name("malmo")
+
+
+def test_set_and_get_by_normalized_name():
+    cache = GeocodeCache(":memory:", negative_ttl=60)
+    cache.set("Berlin", BERLIN)
+    assert cache.get("berlin ") == BERLIN
+    assert cache.get("Paris") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_negative_entries_expire():
+    clock = FakeClock(1_700_000_000.0)
+    cache = GeocodeCache(":memory:", negative_ttl=60, clock=clock)
+    cache.set_not_found("Xyzzy")
+    assert cache.get("xyzzy") is NOT_FOUND
+    clock.now += 61
+    assert cache.get("xyzzy") is None
+
+
+def test_negative_caching_disabled_with_zero_ttl():
+    cache = GeocodeCache(":memory:", negative_ttl=0)
+    cache.set_not_found("Xyzzy")
+    assert cache.get("Xyzzy") is None
+
+
+def test_entries_persist_and_warm_load(tmp_path):
+    path = str(tmp_path / "geocode.sqlite3")
+    cache = GeocodeCache(path, negative_ttl=60)
+    cache.set("Berlin", BERLIN)
+    cache.set_not_found("Xyzzy")
+
+    reopened = GeocodeCache(path, negative_ttl=60)
+    assert len(reopened) == 2
+    assert reopened.get("BERLIN") == BERLIN
+    assert reopened.get("xyzzy") is NOT_FOUND
+
+
+def test_expired_negative_entries_skipped_on_warm_load(tmp_path):
+    path = str(tmp_path / "geocode.sqlite3")
+    clock = FakeClock(1_700_000_000.0)
+    GeocodeCache(path, negative_ttl=60, clock=clock).set_not_found("Xyzzy")
+    clock.now += 61
+
+    reopened = GeocodeCache(path, negative_ttl=60, clock=clock)
+    assert len(reopened) == 0
+
+
+def test_returned_result_is_a_copy():
+    cache = GeocodeCache(":memory:", negative_ttl=60)
+    cache.set("Berlin", BERLIN)
+    cache.get("Berlin")["latitude"] = 0
+    assert cache.get("Berlin")["latitude"] == 52.52437
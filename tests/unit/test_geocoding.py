@@ -2,7 +2,7 @@ from unittest.mock import patch, Mock
 
 import pytest
 
-from weather_art.geocoding import geocode_city
+from weather_art.geocoding import geocode_city, get_geocode_cache
 
 
 BERLIN_RESPONSE = {
@@ -18,7 +18,7 @@ BERLIN_RESPONSE = {
 }
 
 
-@patch("weather_art.geocoding.requests.get")
+@patch("weather_art.geocoding.http_get")
 def test_geocode_city_success(mock_get):
     mock_resp = Mock()
     mock_resp.json.return_value = BERLIN_RESPONSE
@@ -35,7 +35,7 @@ def test_geocode_city_success(mock_get):
     mock_get.assert_called_once()
 
 
-@patch("weather_art.geocoding.requests.get")
+@patch("weather_art.geocoding.http_get")
 def test_geocode_city_not_found(mock_get):
     mock_resp = Mock()
     mock_resp.json.return_value = {}
@@ -46,7 +46,7 @@ def test_geocode_city_not_found(mock_get):
         geocode_city("Nonexistentcity12345")
 
 
-@patch("weather_art.geocoding.requests.get")
+@patch("weather_art.geocoding.http_get")
 def test_geocode_city_empty_results(mock_get):
     mock_resp = Mock()
     mock_resp.json.return_value = {"results": []}
@@ -54,4 +54,45 @@ def test_geocode_city_empty_results(mock_get):
     mock_get.return_value = mock_resp
 
     with pytest.raises(ValueError, match="City not found"):
-        geocode_city("Nonexistentcity12345")
\ No newline at end of file
+        geocode_city("Nonexistentcity12345")
+
+
+@patch("weather_art.geocoding.http_get")
+def test_geocode_city_served_from_cache_after_first_lookup(mock_get):
+    mock_resp = Mock()
+    mock_resp.json.return_value = BERLIN_RESPONSE
+    mock_resp.raise_for_status = Mock()
+    mock_get.return_value = mock_resp
+
+    first = geocode_city("Berlin")
+    second = geocode_city("  BERLIN ")
+
+    assert first == second
+    mock_get.assert_called_once()
+    assert get_geocode_cache().stats()["hits"] == 1
+
+
+@patch("weather_art.geocoding.http_get")
+def test_geocode_city_caches_not_found(mock_get):
+    mock_resp = Mock()
+    mock_resp.json.return_value = {"results": []}
+    mock_resp.raise_for_status = Mock()
+    mock_get.return_value = mock_resp
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="City not found"):
+            geocode_city("Nonexistentcity12345")
+
+    mock_get.assert_called_once()
+    assert get_geocode_cache().stats()["negative_hits"] == 1
+
+
+@patch("weather_art.geocoding.http_get")
+def test_geocode_city_http_errors_not_cached(mock_get):
+    mock_get.side_effect = [ConnectionError("reset"), Mock(json=Mock(return_value=BERLIN_RESPONSE))]
+
+    with pytest.raises(ConnectionError):
+        geocode_city("Berlin")
+
+    assert geocode_city("Berlin")["name"] == "Berlin"
+    assert mock_get.call_count == 2
@@ -0,0 +1,161 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from tests.unit.conftest import FakeClock
+from weather_art.deadline import DeadlineExceeded, deadline_scope
+from weather_art.http_client import CircuitBreaker, CircuitOpenError, HttpClient, build_session
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        status, body = self.server.script.pop(0) if self.server.script else (200, {"ok": True})
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.script = []
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(max_retries=2, failure_threshold=3, reset_timeout=30):
+    session = build_session(
+        max_retries=max_retries, backoff_factor=0, backoff_jitter=0, pool_maxsize=4
+    )
+    return HttpClient(
+        session,
+        connect_timeout=1,
+        read_timeout=2,
+        failure_threshold=failure_threshold,
+        reset_timeout=reset_timeout,
+    )
+
+
+def url(server, path="/v1/forecast"):
+    return f"http://127.0.0.1:{server.server_port}{path}"
+
+
+def test_get_passes_params(stub_server):
+    client = make_client()
+    response = client.get(url(stub_server), params={"latitude": 52.52})
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    assert stub_server.requests == ["/v1/forecast?latitude=52.52"]
+
+
+def test_timeouts_shrink_to_deadline(stub_server):
+    client = make_client()
+    with deadline_scope(0.5):
+        with pytest.MonkeyPatch.context() as mp:
+            seen = {}
+            original = client.session.get
+
+            def spy(*args, **kwargs):
+                seen["timeout"] = kwargs["timeout"]
+                return original(*args, **kwargs)
+
+            mp.setattr(client.session, "get", spy)
+            client.get(url(stub_server))
+    connect, read = seen["timeout"]
+    assert connect <= 0.5 and read <= 0.5
+
+
+def test_expired_deadline_skips_upstream(stub_server):
+    client = make_client()
+    with deadline_scope(0):
+        with pytest.raises(DeadlineExceeded):
+            client.get(url(stub_server))
+    assert stub_server.requests == []
+    assert client.breaker(f"127.0.0.1:{stub_server.server_port}").state == "closed"
+
+
+def test_retries_on_5xx_then_succeeds(stub_server):
+    stub_server.script = [(503, {}), (502, {}), (200, {"current": {}})]
+    client = make_client(max_retries=2)
+    response = client.get(url(stub_server))
+    assert response.status_code == 200
+    assert len(stub_server.requests) == 3
+
+
+def test_retries_on_429(stub_server):
+    stub_server.script = [(429, {}), (200, {})]
+    client = make_client(max_retries=2)
+    assert client.get(url(stub_server)).status_code == 200
+    assert len(stub_server.requests) == 2
+
+
+def test_gives_up_after_max_retries(stub_server):
+    stub_server.script = [(500, {})] * 3
+    client = make_client(max_retries=1)
+    response = client.get(url(stub_server))
+    assert response.status_code == 500
+    assert len(stub_server.requests) == 2
+    with pytest.raises(requests.HTTPError):
+        response.raise_for_status()
+
+
+def test_client_errors_not_retried(stub_server):
+    stub_server.script = [(404, {})]
+    client = make_client()
+    assert client.get(url(stub_server)).status_code == 404
+    assert len(stub_server.requests) == 1
+
+
+def test_circuit_opens_after_repeated_failures(stub_server):
+    stub_server.script = [(503, {})] * 2
+    client = make_client(max_retries=0, failure_threshold=2)
+    client.get(url(stub_server))
+    client.get(url(stub_server))
+
+    with pytest.raises(CircuitOpenError):
+        client.get(url(stub_server))
+    assert len(stub_server.requests) == 2
+
+
+def test_circuit_is_per_host(stub_server):
+    client = make_client(max_retries=0, failure_threshold=1)
+    with pytest.raises(requests.ConnectionError):
+        client.get("http://127.0.0.1:1/unreachable")
+    assert client.get(url(stub_server)).status_code == 200
+
+
+def test_breaker_half_open_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from tests.unit.conftest import FakeClock
+from weather_art.jobs import JobManager, QueueFullError
+
+
+def wait_until_finished(job, timeout=5):
+    seen = 0
+    while not job.finished:
+        seen += len(job.events_since(seen, timeout=timeout))
+    return job
+
+
+def test_job_succeeds_with_progress_events():
+    manager = JobManager(max_workers=1, max_pending=4, result_ttl=60)
+
+    def work(progress):
+        progress("geocoded", location={"name": "Berlin"})
+        progress("weather_fetched")
+        return {"scene": {}}
+
+    job = wait_until_finished(manager.submit(work))
+
+    assert job.status == "succeeded"
+    assert job.result == {"scene": {}}
+    stages = [event["stage"] for event in job.events_since(0)]
+    assert stages == ["queued", "running", "geocoded", "weather_fetched", "completed"]
+    assert job.events_since(0)[2]["location"] == {"name": "Berlin"}
+
+
+def test_job_failure_records_error():
+    manager = JobManager(max_workers=1, max_pending=4, result_ttl=60)
+
+    def work(progress):
+        raise RuntimeError("Ollama unavailable")
+
+    job = wait_until_finished(manager.submit(work))
+
+    assert job.status == "failed"
+    assert job.to_dict()["error"] == "Ollama unavailable"
+    assert job.events_since(0)[-1] == {"stage": "failed", "error": "Ollama unavailable"}
+
+
+def test_queue_depth_limit():
+    manager = JobManager(max_workers=1, max_pending=2, result_ttl=60)
+    release = threading.Event()
+
+    def work(progress):
+        release.wait(5)
+        return {}
+
+    first = manager.submit(work)
+    second = manager.submit(work)
+    with pytest.raises(QueueFullError):
+        manager.submit(work)
+
+    release.set()
+    wait_until_finished(first)
+    wait_until_finished(second)
+    assert manager.pending() == 0
+    manager.submit(work)
+
+
+def test_finished_jobs_expire():
+    clock = FakeClock()
+    manager = JobManager(max_workers=1, max_pending=2, result_ttl=60, clock=clock)
+    job = wait_until_finished(manager.submit(lambda progress: {}))
+
+    clock.now += 59
+    assert manager.get(job.id) is job
+    clock.now += 2
+    assert manager.get(job.id) is None
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from weather_art.json_extract import extract_json_from_response
+
+
+class TestExtractJsonFromResponse:
+    def test_prose_around_object(self):
+        text = 'Here is your scene:\n{"scene": {"a": 1}}\nLet me know if you want changes {or not}.'
+        assert extract_json_from_response(text) == {"scene": {"a": 1}}
+
+    def test_braces_in_prose_before_object(self):
+        text = 'Sure! Use {curly} braces. {"scene": {"a": 1}}'
+        assert extract_json_from_response(text) == {"scene": {"a": 1}}
+
+    def test_trailing_commas(self):
+        text = '{"scene": {"elements": [1, 2, ], "b": {"c": 3,},},}'
+        assert extract_json_from_response(text) == {"scene": {"elements": [1, 2], "b": {"c": 3}}}
+
+    def test_single_quotes(self):
+        text = """{'content': 'It\\'s "cold"', 'n': 1}"""
+        assert extract_json_from_response(text) == {"content": 'It\'s "cold"', "n": 1}
+
+    def test_commas_and_brackets_inside_strings_are_kept(self):
+        text = '{"content": "a, ] } b,", "x": [1,],}'
+        assert extract_json_from_response(text) == {"content": "a, ] } b,", "x": [1]}
+
+    def test_truncated_response_is_closed(self):
+        text = '```json\n{"scene": {"elements": [{"type": "glow", "x": 1}, {"type": "te'
+        assert extract_json_from_response(text) == {
+            "scene": {"elements": [{"type": "glow", "x": 1}, {"type": "te"}]}
+        }
+
+    def test_truncated_after_key(self):
+        assert extract_json_from_response('{"a": 1, "b":') == {"a": 1, "b": None}
+
+    def test_truncated_after_dangling_key(self):
+        assert extract_json_from_response('{"a": 1, "si') == {"a": 1}
+        assert extract_json_from_response("{'a': {'b': 1, 'size'") == {"a": {"b": 1}}
+
+    def test_truncated_after_comma(self):
+        assert extract_json_from_response('{"a": [1, 2,') == {"a": [1, 2]}
+
+    def test_no_object_raises(self):
+        with pytest.raises(json.JSONDecodeError):
+            extract_json_from_response("not json at all")
+
+    def test_prose_object_before_scene_is_skipped(self):
+        text = "Use {'x'} braces. {\"scene\": {\"a\": 1}}"
+        assert extract_json_from_response(text) == {"scene": {"a": 1}}
+
+    def test_broken_outer_object_does_not_yield_inner_one(self):
+        text = ('{"scene": {"background": {"type": "solid" "color": "#000"}, '
+                '"elements": [{"type": "glow", "x": 1}]}}')
+        with pytest.raises(json.JSONDecodeError):
+            extract_json_from_response(text)
+
+    def test_many_prose_braces_are_linear(self):
+        with pytest.raises(json.JSONDecodeError):
+            extract_json_from_response("x{" * 100000)
+        with pytest.raises(json.JSONDecodeError):
+            extract_json_from_response("Use {'x'} braces. " * 20000)
+
+    def test_unrecoverable_raises(self):
+        with pytest.raises(json.JSONDecodeError):
+            extract_json_from_response("{this is not: json}")
+
+    def test_large_response(self):
+        elements = [{"type": "glow", "x": i, "y": i, "radius": 5, "content": "a, b"} for i in range(5000)]
+        text = "Sure!\n" + json.dumps({"scene": {"elements": elements}}).replace("}]", "},]")
+        assert len(extract_json_from_response(text)["scene"]["elements"]) == 5000
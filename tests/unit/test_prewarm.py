@@ -0,0 +1,148 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from tests.unit.conftest import SAMPLE_SCENE, SAMPLE_WEATHER_DATA, FakeClock
+from weather_art.prewarm import Prewarmer
+from weather_art.scene_cache import scene_cache, scene_cache_key
+
+
+def make_prewarmer(**kwargs):
+    options = {
+        "top_n": 2, "always_warm": [], "interval": 60, "lead": 120,
+        "max_concurrency": 2, "half_life": 3600, "mode": "direct",
+    }
+    return Prewarmer(**{**options, **kwargs})
+
+
+def wait_idle(prewarmer):
+    for _ in range(200):
+        if prewarmer.stats()["in_flight"] == 0:
+            return
+        time.sleep(0.01)
+    raise AssertionError("refreshes did not finish")
+
+
+class TestTargets:
+    def test_top_locations_by_request_count(self):
+        prewarmer = make_prewarmer()
+        for location, count in (("Berlin", 3), ("Paris", 1), ("Oslo", 2)):
+            for _ in range(count):
+                prewarmer.record(location)
+        assert [t["location"] for t in prewarmer.targets()] == ["Berlin", "Oslo"]
+
+    def test_counts_decay_over_time(self):
+        clock = FakeClock()
+        prewarmer = make_prewarmer(top_n=1, half_life=60, clock=clock)
+        for _ in range(3):
+            prewarmer.record("Berlin")
+        clock.now += 600
+        prewarmer.record("Paris")
+        assert prewarmer.targets()[0]["location"] == "Paris"
+
+    def test_nearby_coordinates_and_style_are_one_place(self):
+        prewarmer = make_prewarmer()
+        prewarmer.record("Berlin", 52.52, 13.41, "Watercolor")
+        prewarmer.record("Berlin", 52.521, 13.411, " watercolor ")
+        assert prewarmer.stats()["tracked_places"] == 1
+
+    def test_always_warm_cities(self):
+        prewarmer = make_prewarmer(always_warm=["Tokyo"])
+        assert prewarmer.targets() == [
+            {"location": "Tokyo", "latitude": None, "longitude": None, "style_prompt": ""},
+        ]
+
+
+@patch("weather_art.prewarm.generate_scene")
+@patch("weather_art.prewarm.refresh_current_weather")
+@patch("weather_art.prewarm.weather_ttl_remaining")
+class TestRunOnce:
+    def test_skips_places_not_close_to_expiry(self, mock_ttl, mock_refresh, mock_gen):
+        mock_ttl.return_value = 600
+        prewarmer = make_prewarmer()
+        prewarmer.record("Berlin", 52.52, 13.41)
+        assert prewarmer.run_once() == 0
+        mock_refresh.assert_not_called()
+
+    def test_regenerates_scene_when_weather_changes(self, mock_ttl, mock_refresh, mock_gen):
+        mock_ttl.return_value = None
+        mock_refresh.return_value = SAMPLE_WEATHER_DATA
+        prewarmer = make_prewarmer()
+        prewarmer.record("Berlin", 52.52, 13.41, "ink")
+
+        assert prewarmer.run_once() == 1
+        wait_idle(prewarmer)
+
+        mock_refresh.assert_called_once_with(52.52, 13.41)
+        mock_gen.assert_called_once_with("Berlin", 52.52, 13.41, "ink", "direct", fallback_after=0)
+        assert prewarmer.stats()["scenes_generated"] == 1
+
+    def test_extends_scene_when_weather_draws_the_same_one(self, mock_ttl, mock_refresh, mock_gen):
+        mock_ttl.side_effect = [60, 900]
+        mock_refresh.return_value = SAMPLE_WEATHER_DATA
+        key = scene_cache_key(52.52, 13.41, SAMPLE_WEATHER_DATA, "")
+        scene_cache.set(key, SAMPLE_SCENE, ttl=60)
+        prewarmer = make_prewarmer()
+        prewarmer.record("Berlin", 52.52, 13.41)
+
+        prewarmer.run_once()
+        wait_idle(prewarmer)
+
+        mock_gen.assert_not_called()
+        assert scene_cache.ttl_remaining(key) > 60
+        assert prewarmer.stats()["scenes_extended"] == 1
+
+    def test_skips_generation_while_agents_are_busy(self, mock_ttl, mock_refresh, mock_gen):
+        mock_ttl.return_value = None
+        mock_refresh.return_value = SAMPLE_WEATHER_DATA
+        prewarmer = make_prewarmer()
+        prewarmer.record("Berlin", 52.52, 13.41)
+
+        busy = MagicMock(max_size=1)
+        busy.in_use.return_value = 1
+        with patch("weather_art.prewarm.agent_pool_for", return_value=busy):
+            prewarmer.run_once()
+            wait_idle(prewarmer)
+
+        mock_gen.assert_not_called()
+        assert prewarmer.stats()["scenes_skipped"] == 1
+
+    def test_concurrency_cap(self, mock_ttl, mock_refresh, mock_gen):
+        mock_ttl.return_value = None
+        mock_refresh.side_effect = lambda lat, lon: time.sleep(0.05) or SAMPLE_WEATHER_DATA
+        prewarmer = make_prewarmer(top_n=3, max_concurrency=1)
+        for lat in (10.0, 20.0, 30.0):
+            prewarmer.record("Somewhere", lat, 0.0)
+
+        assert prewarmer.run_once() == 1
+        wait_idle(prewarmer)
+
+    @patch("weather_art.prewarm.geocode_city")
+    def test_geocodes_city_names(self, mock_geocode, mock_ttl, mock_refresh, mock_gen):
+        mock_geocode.return_value = {"latitude": 35.68, "longitude": 139.69}
+        mock_ttl.return_value = None
+        mock_refresh.return_value = SAMPLE_WEATHER_DATA
+        prewarmer = make_prewarmer(always_warm=["Tokyo"])
+
+        prewarmer.run_once()
+        wait_idle(prewarmer)
+
+        mock_refresh.assert_called_once_with(35.68, 139.69)
+
+    def test_failures_are_counted(self, mock_ttl, mock_refresh, mock_gen):
+        mock_ttl.return_value = None
+        mock_refresh.side_effect = RuntimeError("upstream down")
+        prewarmer = make_prewarmer()
+        prewarmer.record("Berlin", 52.52, 13.41)
+
+        prewarmer.run_once()
+        wait_idle(prewarmer)
+
+        assert prewarmer.stats()["failures"] == 1
+
+
+def test_start_and_stop():
+    prewarmer = make_prewarmer(interval=60)
+    prewarmer.start()
+    assert prewarmer.stats()["running"]
+    prewarmer.stop()
+    assert not prewarmer.stats()["running"]
@@ -0,0 +1,145 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from tests.unit.conftest import SAMPLE_SCENE
+from weather_art.raster import (
+    encode_png,
+    parse_color,
+    particle_positions,
+    render_png,
+    render_layer,
+    render_scene,
+    static_layers,
+)
+from weather_art.scene_schema import SceneResponse
+
+
+def _scene(elements=(), background=None):
+    data = {
+        "scene": {
+            "canvas": {"width": 200, "height": 100},
+            "background": background or {"type": "solid", "color": "#000000"},
+            "elements": list(elements),
+            "metadata": {"title": "Test", "weather_summary": "Clear"},
+        }
+    }
+    return SceneResponse.model_validate(data).scene
+
+
+def _decode_png(png: bytes) -> np.ndarray:
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    width, height = struct.unpack(">II", png[16:24])
+    channels = {2: 3, 6: 4}[png[25]]
+    idat = png.index(b"IDAT")
+    length = struct.unpack(">I", png[idat - 4:idat])[0]
+    raw = zlib.decompress(png[idat + 4:idat + 4 + length])
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, 1 + width * channels)
+    assert not rows[:, 0].any()
+    return rows[:, 1:].reshape(height, width, channels)
+
+
+class TestParseColor:
+    def test_hex(self):
+        rgb, alpha = parse_color("#ff0000")
+        assert np.allclose(rgb, [1, 0, 0])
+        assert alpha == 1.0
+
+    def test_hex_with_alpha(self):
+        rgb, alpha = parse_color("#0000ff80")
+        assert np.allclose(rgb, [0, 0, 1])
+        assert abs(alpha - 128 / 255) < 1e-6
+
+    def test_invalid_uses_default(self):
+        rgb, _ = parse_color("not a colour", default="#00ff00")
+        assert np.allclose(rgb, [0, 1, 0])
+
+
+class TestRenderScene:
+    def test_output_size_follows_canvas_aspect(self):
+        pixels = render_scene(_scene(), width=100)
+        assert pixels.shape == (50, 100, 3)
+        assert pixels.dtype == np.uint8
+
+    def test_huge_canvas_is_clamped(self):
+        scene = SceneResponse.model_validate({"scene": {
+            **SAMPLE_SCENE["scene"], "canvas": {"width": 100000, "height": 200000},
+        }}).scene
+        assert render_scene(scene).shape == (1600, 800, 3)
+        assert render_scene(scene, width=5000).shape == (1600, 800, 3)
+
+    def test_non_positive_canvas_is_rejected(self):
+        with pytest.raises(ValidationError):
+            SceneResponse.model_validate({"scene": {**SAMPLE_SCENE["scene"], "canvas": {"width": 0, "height": 600}}})
+
+    def test_vertical_gradient_endpoints(self):
+        pixels = render_scene(_scene(background={
+            "type": "gradient", "colors": ["#000000", "#ffffff"], "direction": "vertical",
+        }))
+        assert pixels[0, 100].max() < 10
+        assert pixels[-1, 100].min() > 245
+
+    def test_ellipse_fill(self):
+        pixels = render_scene(_scene([
+            {"type": "ellipse", "x": 100, "y": 50, "width": 40, "height": 20, "fill": "#ff0000"},
+        ]))
+        assert pixels[50, 100].tolist() == [255, 0, 0]
+        assert pixels[50, 10].tolist() == [0, 0, 0]
+
+    def test_glow_fades_outward(self):
+        pixels = render_scene(_scene([
+            {"type": "glow", "x": 100, "y": 50, "radius": 40, "color": "#ffffff", "intensity": 0.8},
+        ]))
+        assert pixels[50, 100, 0] > pixels[50, 125, 0] > pixels[50, 145, 0]
+
+    def test_particles_are_deterministic(self):
+        scene = SceneResponse.model_validate(SAMPLE_SCENE).scene
+        assert np.array_equal(render_scene(scene, 200), render_scene(scene, 200))
+        xs, ys = particle_positions(scene.elements[2], 2, 800, 600)
+        assert ((xs >= 0) & (xs <= 800)).all()
+        assert ((ys >= 0) & (ys <= 600)).all()
+
+
+class TestStaticLayers:
+    def test_runs_between_live_elements(self):
+        types = ["glow", "ellipse", "particle_system", "ellipse", "rect", "text", "particle_system", "line"]
+        assert static_layers(types) == [(0, 2), (3, 5), (7, 8)]
+
+    def test_background_layer_is_always_present(self):
+        assert static_layers([]) == [(0, 0)]
+        assert static_layers(["particle_system", "rect"]) == [(0, 0), (1, 2)]
+
+    def test_layers_composite_to_the_scene_without_live_elements(self):
+        rect = {"type": "rect", "x": 20, "y": 20, "width": 100, "height": 50, "fill": "#ff0000", "opacity": 0.5}
+        ellipse = {"type": "ellipse", "x": 100, "y": 50, "width": 60, "height": 40, "fill": "#00ff00",
+                   "opacity": 0.7}
+        layered = _scene([rect, {"type": "particle_system", "preset": "snow"}, ellipse])
+        flat = _scene([rect, ellipse])
+
+        base = render_layer(layered, 0).astype(np.float32)
+        overlay = render_layer(layered, 1).astype(np.float32)
+        alpha = overlay[..., 3:] / 255
+        composite = overlay[..., :3] * alpha + base * (1 - alpha)
+
+        assert overlay.shape[2] == 4
+        assert overlay[5, 5, 3] == 0
+        assert np.abs(composite - render_scene(flat).astype(np.float32)).max() <= 2
+
+    def test_unknown_layer(self):
+        with pytest.raises(IndexError):
+            render_layer(_scene(), 1)
+
+
+class TestPng:
+    def test_render_png_round_trips(self):
+        scene = SceneResponse.model_validate(SAMPLE_SCENE).scene
+        png = render_png(scene, 160)
+        assert np.array_equal(_decode_png(png), render_scene(scene, 160))
+
+    def test_rgba(self):
+        pixels = np.zeros((2, 3, 4), dtype=np.uint8)
+        pixels[..., 3] = 128
+        assert np.array_equal(_decode_png(encode_png(pixels)), pixels)
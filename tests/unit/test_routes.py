@@ -1,7 +1,13 @@
 import json
 from unittest.mock import patch
 
-from tests.unit.conftest import SAMPLE_SCENE, SAMPLE_GEOCODE_RESULT
+from tests.unit.conftest import SAMPLE_SCENE, SAMPLE_GEOCODE_RESULT, SAMPLE_WEATHER_DATA
+from weather_art.deadline import DeadlineExceeded
+from weather_art.jobs import QueueFullError, job_manager
+from weather_art.prewarm import prewarmer
+from weather_art.scene_schema import SceneResponse
+from weather_art.scene_store import scene_id
+from weather_art.tracing import tracer
 
 
 class TestIndex:
@@ -23,7 +29,8 @@ class TestApiGenerate:
         data = resp.get_json()
         assert data["scene"]["metadata"]["title"] == "Rainy Evening"
         mock_gen.assert_called_once_with(
-            location="Berlin", latitude=None, longitude=None, style_prompt=""
+            location="Berlin", latitude=None, longitude=None, style_prompt="", mode=None,
+            fallback_after=None, deadline=None,
         )
 
     @patch("weather_art.routes.generate_scene")
@@ -35,7 +42,8 @@ class TestApiGenerate:
         )
         assert resp.status_code == 200
         mock_gen.assert_called_once_with(
-            location="Berlin", latitude=52.52, longitude=13.41, style_prompt=""
+            location="Berlin", latitude=52.52, longitude=13.41, style_prompt="", mode=None,
+            fallback_after=None, deadline=None,
         )
 
     @patch("weather_art.routes.generate_scene")
@@ -47,9 +55,53 @@ class TestApiGenerate:
         )
         assert resp.status_code == 200
         mock_gen.assert_called_once_with(
-            location="Berlin", latitude=None, longitude=None, style_prompt="watercolor"
+            location="Berlin", latitude=None, longitude=None, style_prompt="watercolor", mode=None,
+            fallback_after=None, deadline=None,
         )
 
+    @patch("weather_art.routes.generate_scene")
+    def test_generate_with_direct_mode(self, mock_gen, client):
+        mock_gen.return_value = SAMPLE_SCENE
+        resp = client.post(
+            "/api/generate",
+            json={"location": "Berlin", "mode": "direct"},
+        )
+        assert resp.status_code == 200
+        mock_gen.assert_called_once_with(
+            location="Berlin", latitude=None, longitude=None, style_prompt="", mode="direct",
+            fallback_after=None, deadline=None,
+        )
+
+    def test_generate_invalid_fallback_after(self, client):
+        resp = client.post("/api/generate", json={"location": "Berlin", "fallback_after": "soon"})
+        assert resp.status_code == 400
+        assert "fallback_after" in resp.get_json()["error"]
+
+    def test_generate_invalid_deadline(self, client):
+        resp = client.post("/api/generate", json={"location": "Berlin", "deadline": 0})
+        assert resp.status_code == 400
+        assert "deadline" in resp.get_json()["error"]
+
+    @patch("weather_art.routes.generate_scene")
+    def test_generate_deadline_exceeded(self, mock_gen, client):
+        mock_gen.side_effect = DeadlineExceeded("Request deadline exceeded")
+        resp = client.post("/api/generate", json={"location": "Berlin", "deadline": 2.5})
+        assert resp.status_code == 504
+        assert mock_gen.call_args.kwargs["deadline"] == 2.5
+
+    def test_generate_invalid_style_prompt(self, client):
+        for path in ("/api/generate", "/api/jobs", "/api/generate/stream", "/api/timelapse"):
+            resp = client.post(path, json={"location": "Berlin", "style_prompt": 5})
+            assert resp.status_code == 400
+            assert "style_prompt" in resp.get_json()["error"]
+        resp = client.post("/api/generate/batch", json={"locations": [{"location": "Berlin"}], "style_prompt": 5})
+        assert resp.status_code == 400
+
+    def test_generate_unknown_mode(self, client):
+        resp = client.post("/api/generate", json={"location": "Berlin", "mode": "psychic"})
+        assert resp.status_code == 400
+        assert "mode" in resp.get_json()["error"]
+
     def test_generate_missing_body(self, client):
         resp = client.post("/api/generate", content_type="application/json")
         assert resp.status_code == 400
@@ -68,6 +120,252 @@ class TestApiGenerate:
         assert "Ollama unavailable" in resp.get_json()["error"]
 
 
+class TestRequestTracking:
+    @patch("weather_art.routes.generate_scene")
+    def test_generation_requests_are_tracked_for_prewarming(self, mock_gen, client):
+        mock_gen.return_value = SAMPLE_SCENE
+        client.post("/api/generate", json={"location": "Berlin"})
+        client.post("/api/generate", json={"location": "berlin"})
+        assert prewarmer.targets()[0]["location"] == "berlin"
+        assert client.get("/api/cache/stats").get_json()["prewarm"]["tracked_places"] == 1
+
+
+class TestApiGenerateCompact:
+    @patch("weather_art.routes.generate_scene")
+    def test_compact_response_omits_preset_defaults(self, mock_gen, client):
+        mock_gen.return_value = SceneResponse.model_validate(SAMPLE_SCENE).model_dump()
+        resp = client.post("/api/generate", json={"location": "Berlin", "compact": True})
+        particles = resp.get_json()["scene"]["elements"][2]
+        assert particles["preset"] == "rain"
+        assert "particle_shape" not in particles
+
+    @patch("weather_art.routes.generate_scene")
+    def test_full_response_by_default(self, mock_gen, client):
+        mock_gen.return_value = SceneResponse.model_validate(SAMPLE_SCENE).model_dump()
+        resp = client.post("/api/generate", json={"location": "Berlin"})
+        assert resp.get_json()["scene"]["elements"][2]["particle_shape"] == "line"
+
+    def test_particle_presets(self, client):
+        resp = client.get("/api/particle-presets")
+        assert resp.status_code == 200
+        assert resp.get_json()["rain"]["particle_shape"] == "line"
+        assert "max-age" in resp.headers["Cache-Control"]
+
+
+class TestApiSceneImage:
+    @patch("weather_art.routes.generate_scene")
+    def test_generated_scene_is_served_as_png(self, mock_gen, client):
+        mock_gen.return_value = SAMPLE_SCENE
+        scene_id = client.post("/api/generate", json={"location": "Berlin"}).get_json()["scene_id"]
+
+        resp = client.get(f"/api/scene/{scene_id}.png?size=200")
+        assert resp.status_code == 200
+        assert resp.mimetype == "image/png"
+        assert resp.data.startswith(b"\x89PNG")
+        assert int.from_bytes(resp.data[16:20], "big") == 200
+        assert int.from_bytes(resp.data[20:24], "big") == 150
+        assert "max-age" in resp.headers["Cache-Control"]
+
+    @patch("weather_art.routes.generate_scene")
+    def test_bake_references_static_layers(self, mock_gen, client):
+        mock_gen.return_value = SAMPLE_SCENE
+        data = client.post("/api/generate", json={"location": "Berlin", "bake": True}).get_json()
+        assert data["static_layers"] == [
+            {"url": f"/api/scene/{data['scene_id']}/layers/0.png", "start": 0, "end": 2},
+        ]
+        assert data["scene"] == SAMPLE_SCENE["scene"]
+
+        resp = client.get(data["static_layers"][0]["url"])
+        assert resp.status_code == 200
+        assert resp.mimetype == "image/png"
+        assert int.from_bytes(resp.data[16:20], "big") == 800
+        assert client.get(f"/api/scene/{data['scene_id']}/layers/1.png").status_code == 404
+
+    @patch("weather_art.routes.generate_scene")
+    def test_no_static_layer_by_default(self, mock_gen, client):
+        mock_gen.return_value = SAMPLE_SCENE
+        assert "static_layers" not in client.post("/api/generate", json={"location": "Berlin"}).get_json()
+
+    def test_unknown_scene(self, client):
+        assert client.get("/api/scene/deadbeef.png").status_code == 404
+        assert client.get("/api/scene/deadbeef/layers/0.png").status_code == 404
+
+    def test_invalid_size(self, client):
+        assert client.get("/api/scene/deadbeef.png?size=big").status_code == 400
+        assert client.get("/api/scene/deadbeef.png?size=5000").status_code == 400
+
+
+class TestApiGenerateBatch:
+    @patch("weather_art.routes.generate_scenes_batch")
+    def test_batch_success(self, mock_batch, client):
+        mock_batch.return_value = [{"location": "Berlin", "latitude": 52.52, "longitude": 13.41,
+                                    "scene": SAMPLE_SCENE["scene"]}]
+        resp = client.post(
+            "/api/generate/batch",
+            json={"locations": [{"location": "Berlin"}, {"latitude": 1, "longitude": 2, "style_prompt": "ink"}],
+                  "style_prompt": "watercolor", "mode": "direct"},
+        )
+        assert resp.status_code == 200
+        assert resp.get_json()["results"][0]["location"] == "Berlin"
+        items = mock_batch.call_args[0][0]
+        assert items[0] == {"location": "Berlin", "latitude": None, "longitude": None,
+                            "style_prompt": "watercolor"}
+        assert items[1]["location"] == "Unknown"
+        assert items[1]["style_prompt"] == "ink"
+        assert mock_batch.call_args.kwargs["mode"] == "direct"
+
+    @patch("weather_art.routes.generate_scenes_batch")
+    def test_batch_passes_deadline_and_fallback(self, mock_batch, client):
+        mock_batch.return_value = []
+        resp = client.post(
+            "/api/generate/batch",
+            json={"locations": [{"location": "Berlin"}], "deadline": 20, "fallback_after": 2},
+        )
+        assert resp.status_code == 200
+        assert mock_batch.call_args.kwargs == {"mode": None, "fallback_after": 2, "deadline": 20}
+
+    def test_batch_rejects_invalid_deadline(self, client):
+        resp = client.post("/api/generate/batch", json={"locations": [{"location": "Berlin"}], "deadline": 0})
+        assert resp.status_code == 400
+
+    def test_batch_rejects_per_item_deadline(self, client):
+        resp = client.post("/api/generate/batch", json={"locations": [{"location": "Berlin", "deadline": 5}]})
+        assert resp.status_code == 400
+        assert "locations[0]" in resp.get_json()["error"]
+
+    def test_batch_requires_locations(self, client):
+        assert client.post("/api/generate/batch", json={"locations": []}).status_code == 400
+
+    def test_batch_reports_invalid_item(self, client):
+        resp = client.post("/api/generate/batch", json={"locations": [{"location": "Berlin"}, {}]})
+        assert resp.status_code == 400
+        assert "locations[1]" in resp.get_json()["error"]
+
+    def test_batch_rejects_unknown_mode(self, client):
+        resp = client.post("/api/generate/batch", json={"locations": [{"location": "Berlin"}], "mode": "x"})
+        assert resp.status_code == 400
+
+    @patch("weather_art.routes.GENERATE_BATCH_MAX_LOCATIONS", 1)
+    def test_batch_size_limit(self, client):
+        resp = client.post("/api/generate/batch", json={"locations": [{"location": "A"}, {"location": "B"}]})
+        assert resp.status_code == 400
+
+
+class TestApiTimelapse:
+    @patch("weather_art.routes.generate_timelapse")
+    def test_timelapse(self, mock_timelapse, client):
+        mock_timelapse.return_value = {"frames": [], "frame_ms": 1500, "duration_ms": 0}
+        resp = client.post("/api/timelapse", json={"location": "Berlin", "hours": 6})
+        assert resp.status_code == 200
+        assert mock_timelapse.call_args.kwargs["hours"] == 6
+        assert mock_timelapse.call_args.kwargs["location"] == "Berlin"
+
+    def test_validates_hours_and_frame_ms(self, client):
+        assert client.post("/api/timelapse", json={"location": "Berlin", "hours": 0}).status_code == 400
+        assert client.post("/api/timelapse", json={"location": "Berlin", "hours": 1000}).status_code == 400
+        assert client.post("/api/timelapse", json={"location": "Berlin", "frame_ms": -1}).status_code == 400
+        assert client.post("/api/timelapse", json={}).status_code == 400
+
+
+class TestApiJobs:
+    def _wait(self, client, job_id):
+        job = job_manager.get(job_id)
+        seen = 0
+        while not job.finished:
+            seen += len(job.events_since(seen, timeout=5))
+        return client.get(f"/api/jobs/{job_id}")
+
+    @patch("weather_art.routes.generate_scene")
+    def test_create_job_and_poll_result(self, mock_gen, client):
+        mock_gen.return_value = SAMPLE_SCENE
+        resp = client.post("/api/jobs", json={"location": "Berlin", "mode": "direct"})
+        assert resp.status_code == 202
+        data = resp.get_json()
+        assert data["status_url"] == f"/api/jobs/{data['job_id']}"
+
+        status = self._wait(client, data["job_id"])
+        assert status.status_code == 200
+        body = status.get_json()
+        assert body["status"] == "succeeded"
+        assert body["result"]["scene"]["metadata"]["title"] == "Rainy Evening"
+        kwargs = mock_gen.call_args.kwargs
+        assert kwargs["location"] == "Berlin"
+        assert kwargs["mode"] == "direct"
+        assert callable(kwargs["progress"])
+
+    @patch("weather_art.routes.generate_scene")
+    def test_job_events_stream(self, mock_gen, client):
+        def fake_generate(progress, **kwargs):
+            progress("geocoded", location=SAMPLE_GEOCODE_RESULT)
+            return SAMPLE_SCENE
+
+        mock_gen.side_effect = fake_generate
+        job_id = client.post("/api/jobs", json={"location": "Berlin"}).get_json()["job_id"]
+        self._wait(client, job_id)
+
+        resp = client.get(f"/api/jobs/{job_id}/events")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/event-stream"
+        body = resp.get_data(as_text=True)
+        assert "event: geocoded" in body
+        assert "event: completed" in body
+        completed = body.split("event: completed\ndata: ")[1].split("\n\n")[0]
+        assert json.loads(completed)["result"] == {**SAMPLE_SCENE, "scene_id": scene_id(SAMPLE_SCENE)}
+
+    @patch("weather_art.routes.generate_scene")
+    def test_failed_job(self, mock_gen, client):
+        mock_gen.side_effect = RuntimeError("Ollama unavailable")
+        job_id = client.post("/api/jobs", json={"location": "Berlin"}).get_json()["job_id"]
+        body = self._wait(client, job_id).get_json()
+        assert body["status"] == "failed"
+        assert "Ollama unavailable" in body["error"]
+
+    def test_create_job_validates_body(self, client):
+        resp = client.post("/api/jobs", json={})
+        assert resp.status_code == 400
+
+    @patch("weather_art.routes.job_manager.submit")
+    def test_create_job_queue_full(self, mock_submit, client):
+        mock_submit.side_effect = QueueFullError("Too many generation jobs in progress")
+        resp = client.post("/api/jobs", json={"location": "Berlin"})
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "5"
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/jobs/nope").status_code == 404
+        assert client.get("/api/jobs/nope/events").status_code == 404
+
+
+class TestApiGenerateStream:
+    @patch("weather_art.routes.generate_scene")
+    def test_streams_ndjson_events(self, mock_gen, client):
+        def fake_generate(progress, **kwargs):
+            progress("background", background=SAMPLE_SCENE["scene"]["background"])
+            progress("element", index=0, element=SAMPLE_SCENE["scene"]["elements"][0])
+            return SAMPLE_SCENE
+
+        mock_gen.side_effect = fake_generate
+        resp = client.post("/api/generate/stream", json={"location": "Berlin"})
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/x-ndjson"
+
+        events = [json.loads(line) for line in resp.get_data(as_text=True).splitlines() if line]
+        assert [e["stage"] for e in events] == ["queued", "running", "background", "element", "completed"]
+        assert events[3]["element"] == SAMPLE_SCENE["scene"]["elements"][0]
+        assert events[-1]["result"] == {**SAMPLE_SCENE, "scene_id": scene_id(SAMPLE_SCENE)}
+
+    @patch("weather_art.routes.generate_scene")
+    def test_streams_failure(self, mock_gen, client):
+        mock_gen.side_effect = RuntimeError("Ollama unavailable")
+        resp = client.post("/api/generate/stream", json={"location": "Berlin"})
+        last = json.loads(resp.get_data(as_text=True).splitlines()[-1])
+        assert last["stage"] == "failed"
+        assert "Ollama unavailable" in last["error"]
+
+    def test_validates_body(self, client):
+        assert client.post("/api/generate/stream", json={}).status_code == 400
+
+
 class TestApiGeocode:
     @patch("weather_art.routes.geocode_city")
     def test_geocode_success(self, mock_geo, client):
@@ -88,4 +386,76 @@ class TestApiGeocode:
         mock_geo.side_effect = ValueError("City not found: Xyzzy")
         resp = client.get("/api/geocode?city=Xyzzy")
         assert resp.status_code == 404
-        assert "City not found" in resp.get_json()["error"]
\ No newline at end of file
+        assert "City not found" in resp.get_json()["error"]
+
+
+class TestApiWeatherBatch:
+    @patch("weather_art.routes.get_current_weather_batch")
+    def test_batch_success(self, mock_batch, client):
+        mock_batch.return_value = [SAMPLE_WEATHER_DATA, SAMPLE_WEATHER_DATA]
+        resp = client.post(
+            "/api/weather/batch",
+            json={"locations": [
+                {"latitude": 52.52, "longitude": 13.41},
+                {"latitude": 48.85, "longitude": 2.35},
+            ]},
+        )
+        assert resp.status_code == 200
+        results = resp.get_json()["results"]
+        assert results[1]["latitude"] == 48.85
+        assert results[0]["weather"]["weather_description"] == "Slight rain"
+        mock_batch.assert_called_once_with([(52.52, 13.41), (48.85, 2.35)])
+
+    def test_batch_requires_locations(self, client):
+        assert client.post("/api/weather/batch", json={}).status_code == 400
+        assert client.post("/api/weather/batch", json={"locations": []}).status_code == 400
+
+    def test_batch_rejects_bad_coordinates(self, client):
+        resp = client.post("/api/weather/batch", json={"locations": [{"latitude": "north"}]})
+        assert resp.status_code == 400
+
+    @patch("weather_art.routes.WEATHER_BATCH_MAX_LOCATIONS", 1)
+    def test_batch_size_limit(self, client):
+        locations = [{"latitude": 1, "longitude": 1}, {"latitude": 2, "longitude": 2}]
+        resp = client.post("/api/weather/batch", json={"locations": locations})
+        assert resp.status_code == 400
+
+
+class TestApiCacheStats:
+    def test_cache_stats(self, client):
+        resp = client.get("/api/cache/stats")
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["weather"]["hits"] == 0
+        assert "evictions" in data["weather"]
+
+
+class TestApiGenerationStats:
+    def test_generation_stats(self, client):
+        resp = client.get("/api/generation/stats")
+        assert resp.status_code == 200
+        assert resp.get_json()["repair"]["model_turns_saved"] == 0
+        assert resp.get_json()["modes"] == {}
+
+
+class TestMetrics:
+    def test_metrics_exposes_stage_histograms(self, client):
+        tracer.record("geocode", 0.02)
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/plain"
+        assert 'weather_art_stage_duration_seconds_count{stage="geocode"} 1' in resp.get_data(as_text=True)
+
+    def test_server_timing_header(self, client):
+        with patch("weather_art.routes.SERVER_TIMING_ENABLED", True), \
+                patch("weather_art.geocoding.get_geocode_cache") as mock_cache:
+            mock_cache.return_value.get.return_value = SAMPLE_GEOCODE_RESULT
+            resp = client.get("/api/geocode?city=Berlin")
+        assert resp.status_code == 200
+        assert resp.headers["Server-Timing"].startswith("geocode;dur=")
+
+    def test_no_server_timing_header_by_default(self, client):
+        with patch("weather_art.geocoding.get_geocode_cache") as mock_cache:
+            mock_cache.return_value.get.return_value = SAMPLE_GEOCODE_RESULT
+            resp = client.get("/api/geocode?city=Berlin")
+        assert "Server-Timing" not in resp.headers
@@ -0,0 +1,32 @@
+from tests.unit.conftest import SAMPLE_WEATHER_DATA
+from weather_art.scene_cache import normalize_style_prompt, scene_cache_key, weather_signature
+
+
+def test_weather_signature_buckets_temperature_and_wind():
+    warmer = {**SAMPLE_WEATHER_DATA, "temperature_c": 9.4, "wind_speed_kmh": 28.0}
+    assert weather_signature(SAMPLE_WEATHER_DATA) == weather_signature(warmer)
+    assert weather_signature(SAMPLE_WEATHER_DATA) == (61, False, 1, 2)
+
+
+def test_weather_signature_ignores_minor_fields():
+    drier = {**SAMPLE_WEATHER_DATA, "humidity_pct": 40, "wind_direction_deg": 10}
+    assert weather_signature(SAMPLE_WEATHER_DATA) == weather_signature(drier)
+
+
+def test_weather_signature_distinguishes_conditions():
+    snowy = {**SAMPLE_WEATHER_DATA, "weather_code": 71}
+    daytime = {**SAMPLE_WEATHER_DATA, "is_day": True}
+    assert weather_signature(snowy) != weather_signature(SAMPLE_WEATHER_DATA)
+    assert weather_signature(daytime) != weather_signature(SAMPLE_WEATHER_DATA)
+
+
+def test_normalize_style_prompt():
+    assert normalize_style_prompt("  Water   Color ") == "water color"
+
+
+def test_scene_cache_key_shares_nearby_locations():
+    a = scene_cache_key(52.52, 13.41, SAMPLE_WEATHER_DATA, "Watercolor")
+    b = scene_cache_key(52.51, 13.42, SAMPLE_WEATHER_DATA, "watercolor")
+    c = scene_cache_key(48.85, 2.35, SAMPLE_WEATHER_DATA, "watercolor")
+    assert a == b
+    assert a != c
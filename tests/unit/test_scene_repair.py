@@ -0,0 +1,134 @@
+import copy
+
+import pytest
+
+from tests.unit.conftest import SAMPLE_SCENE
+from weather_art.scene_repair import (
+    MAX_ELEMENTS,
+    RepairStats,
+    infer_element_type,
+    normalize_color,
+    repair_scene,
+)
+from weather_art.scene_schema import SceneResponse
+
+
+def repaired(scene):
+    result, changes = repair_scene(scene)
+    SceneResponse.model_validate(result)
+    return result["scene"], changes
+
+
+class TestNormalizeColor:
+    @pytest.mark.parametrize("value,expected", [
+        ("#FFD700", "#FFD700"),
+        ("ffd700", "#ffd700"),
+        ("#abc", "#abc"),
+        ("rgb(255, 0, 16)", "#ff0010"),
+        ("rgba(10,20,30,0.5)", "#0a141e"),
+        ("Sky Blue", "#87ceeb"),
+        ("not a color", None),
+        (12, None),
+    ])
+    def test_normalize(self, value, expected):
+        assert normalize_color(value) == expected
+
+
+class TestInferElementType:
+    @pytest.mark.parametrize("element,expected", [
+        ({"preset": "rain"}, "particle_system"),
+        ({"x1": 0, "y1": 0, "x2": 1, "y2": 1}, "line"),
+        ({"content": "hi"}, "text"),
+        ({"radius": 10}, "glow"),
+        ({"width": 1, "height": 1, "corner_radius": 2}, "rect"),
+        ({"width": 1, "height": 1}, "ellipse"),
+        ({"foo": 1}, None),
+    ])
+    def test_infer(self, element, expected):
+        assert infer_element_type(element) == expected
+
+
+class TestRepairScene:
+    def test_clamps_and_coerces(self):
+        scene = copy.deepcopy(SAMPLE_SCENE)
+        scene["scene"]["elements"][0].update({"x": 900, "y": "-5", "intensity": 3})
+        scene["scene"]["elements"][1]["opacity"] = 1.4
+
+        result, changes = repaired(scene)
+
+        glow = result["elements"][0]
+        assert (glow["x"], glow["y"], glow["intensity"]) == (800.0, 0.0, 1.0)
+        assert result["elements"][1]["opacity"] == 1.0
+        assert len(changes) == 4
+
+    def test_does_not_modify_input(self):
+        scene = copy.deepcopy(SAMPLE_SCENE)
+        scene["scene"]["elements"][0]["x"] = 900
+        before = copy.deepcopy(scene)
+        repair_scene(scene)
+        assert scene == before
+
+    def test_drops_unrecoverable_elements(self):
+        scene = copy.deepcopy(SAMPLE_SCENE)
+        scene["scene"]["elements"] += [
+            {"type": "hexagon"},
+            {"type": "text", "x": 1, "y": 1},
+            {"type": "particle_system", "preset": "hail"},
+            "cloud",
+        ]
+
+        result, changes = repaired(scene)
+
+        assert len(result["elements"]) == len(SAMPLE_SCENE["scene"]["elements"])
+        assert sum("dropped" in change for change in changes) == 4
+
+    def test_caps_element_count(self):
+        scene = copy.deepcopy(SAMPLE_SCENE)
+        glow = scene["scene"]["elements"][0]
+        scene["scene"]["elements"] = [dict(glow) for _ in range(MAX_ELEMENTS + 5)]
+
+        result, _ = repaired(scene)
+
+        assert len(result["elements"]) == MAX_ELEMENTS
+
+    def test_repairs_background(self):
+        scene = copy.deepcopy(SAMPLE_SCENE)
+        scene["scene"]["background"] = {"colors": ["navy", "nonsense"]}
+
+        result, _ = repaired(scene)
+
+        assert result["background"] == {"type": "solid", "color": "#000080"}
+
+    def test_invalid_literal_falls_back_to_default(self):
+        scene = copy.deepcopy(SAMPLE_SCENE)
+        scene["scene"]["elements"][2]["particle_shape"] = "hexagon"
+
+        result, _ = repair_scene(scene)
+
+        validated = SceneResponse.model_validate(result).model_dump()
+        assert validated["scene"]["elements"][2]["particle_shape"] == "line"
+
+    def test_wraps_bare_scene(self):
+        result, changes = repaired(copy.deepcopy(SAMPLE_SCENE["scene"]))
+        assert result["metadata"]["title"] == "Rainy Evening"
+        assert changes == ["scene: wrapped top-level scene fields"]
+
+    def test_nothing_salvageable(self):
+        with pytest.raises(ValueError):
+            repair_scene({"scene": {"elements": [{"type": "bogus"}]}})
+        with pytest.raises(ValueError):
+            repair_scene(["not", "a", "scene"])
+
+
+class TestRepairStats:
+    def test_counts(self):
+        stats = RepairStats()
+        stats.record(["a", "b"])
+        stats.record(None)
+        assert stats.stats() == {
+            "attempts": 2,
+            "repaired": 1,
+            "failed": 1,
+            "changes": 2,
+            "model_turns_saved": 1,
+        }
@@ -1,7 +1,9 @@
+import copy
+
 import pytest
 from pydantic import ValidationError
 
-from weather_art.scene_schema import SceneResponse
+from weather_art.scene_schema import PARTICLE_PRESETS, SceneResponse, compact_element, compact_scene
 
 
 VALID_SCENE = {
@@ -166,4 +168,34 @@ def test_removed_types_rejected():
 def test_gradient_needs_at_least_two_colors():
     data = {"scene": {"background": {"type": "gradient", "colors": ["#000"]}, "elements": []}}
     with pytest.raises(ValidationError):
-        SceneResponse.model_validate(data)
\ No newline at end of file
+        SceneResponse.model_validate(data)
+
+
+def test_preset_does_not_mutate_input():
+    data = copy.deepcopy(VALID_SCENE)
+    SceneResponse.model_validate(data)
+    assert data == VALID_SCENE
+
+
+def test_compact_element_keeps_only_overrides():
+    full = SceneResponse.model_validate(VALID_SCENE).model_dump()["scene"]["elements"][3]
+    full["count"] = 50
+    # opacity 0.6 matches the rain preset, so it is dropped along with the untouched defaults.
+    assert compact_element(full) == {
+        "type": "particle_system", "preset": "rain", "color": "#aaccff", "count": 50,
+    }
+
+
+def test_compact_element_ignores_other_types():
+    glow = VALID_SCENE["scene"]["elements"][0]
+    assert compact_element(glow) is glow
+
+
+def test_compact_scene_round_trips():
+    full = SceneResponse.model_validate(VALID_SCENE).model_dump()
+    compact = compact_scene(full)
+
+    assert SceneResponse.model_validate(compact).model_dump() == full
+    assert "particle_shape" in full["scene"]["elements"][3]
+    particle = compact["scene"]["elements"][3]
+    assert all(particle.get(key) != value for key, value in PARTICLE_PRESETS["rain"].items())
@@ -0,0 +1,71 @@
+import json
+
+from weather_art.scene_stream import SceneStreamParser
+
+SCENE = {
+    "scene": {
+        "canvas": {"width": 800, "height": 600},
+        "background": {"type": "gradient", "colors": ["#0a0a2e", "#1a1a3e"], "direction": "vertical"},
+        "elements": [
+            {"type": "glow", "x": 650, "y": 100, "radius": 120, "color": "#FFD700", "intensity": 0.6},
+            {"type": "text", "content": "It's {cold}, \"brr\" [sic]", "x": 10, "y": 20, "size": 16, "fill": "#FFFFFF"},
+            {"type": "particle_system", "preset": "snow", "color": "#FFFFFF"},
+        ],
+        "metadata": {"title": "Snowy Night", "weather_summary": "Snow, -2C"},
+    }
+}
+
+
+def feed_in_chunks(parser, text, size):
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return events
+
+
+class TestSceneStreamParser:
+    def test_emits_parts_in_order(self):
+        events = feed_in_chunks(SceneStreamParser(), json.dumps(SCENE), 5)
+
+        assert [e["event"] for e in events] == ["background", "element", "element", "element", "metadata"]
+        assert events[0]["background"]["colors"] == ["#0a0a2e", "#1a1a3e"]
+        assert [e["index"] for e in events[1:4]] == [0, 1, 2]
+        assert events[2]["element"]["content"] == "It's {cold}, \"brr\" [sic]"
+        assert events[4]["metadata"]["title"] == "Snowy Night"
+
+    def test_emits_element_as_soon_as_it_closes(self):
+        text = json.dumps(SCENE)
+        cut = text.index('{"type": "text"')
+        parser = SceneStreamParser()
+
+        events = parser.feed(text[:cut])
+
+        assert [e["event"] for e in events] == ["background", "element"]
+
+    def test_skips_prose_and_fences(self):
+        text = "Here is your scene:\n```json\n" + json.dumps(SCENE, indent=2) + "\n```\nEnjoy {it}!"
+        parser = SceneStreamParser()
+
+        events = feed_in_chunks(parser, text, 3)
+
+        assert len(events) == 5
+        assert parser.done
+
+    def test_accepts_unwrapped_scene(self):
+        events = SceneStreamParser().feed(json.dumps(SCENE["scene"]))
+        assert [e["event"] for e in events] == ["background", "element", "element", "element", "metadata"]
+
+    def test_skips_invalid_elements(self):
+        scene = json.loads(json.dumps(SCENE))
+        scene["scene"]["elements"].insert(1, {"type": "hexagon", "x": 1})
+
+        events = SceneStreamParser().feed(json.dumps(scene))
+
+        elements = [e for e in events if e["event"] == "element"]
+        assert [e["index"] for e in elements] == [0, 2, 3]
+
+    def test_validated_elements_include_defaults(self):
+        events = SceneStreamParser().feed(json.dumps(SCENE))
+        particles = events[3]["element"]
+        assert particles["preset"] == "snow"
+        assert "count" in particles
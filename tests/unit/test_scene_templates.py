@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from tests.unit.conftest import SAMPLE_WEATHER_DATA
+from weather_art.scene_schema import SceneResponse
+from weather_art.scene_templates import template_scene, weather_condition
+from weather_art.weather import WMO_CODES
+
+
+def elements_of(scene, kind):
+    return [el for el in scene["scene"]["elements"] if el["type"] == kind]
+
+
+class TestWeatherCondition:
+    @pytest.mark.parametrize("code,expected", [
+        (0, "clear"), (2, "partly_cloudy"), (3, "overcast"), (45, "fog"),
+        (53, "drizzle"), (63, "rain"), (81, "rain"), (75, "snow"), (86, "snow"), (99, "thunderstorm"),
+    ])
+    def test_condition(self, code, expected):
+        assert weather_condition(code) == expected
+
+
+class TestTemplateScene:
+    @pytest.mark.parametrize("code", sorted(WMO_CODES))
+    @pytest.mark.parametrize("is_day", [True, False])
+    def test_every_code_produces_valid_scene(self, code, is_day):
+        weather = {**SAMPLE_WEATHER_DATA, "weather_code": code, "is_day": is_day}
+        SceneResponse.model_validate(template_scene(weather))
+
+    def test_rain_scales_with_precipitation_and_wind(self):
+        light = template_scene({**SAMPLE_WEATHER_DATA, "precipitation_mm": 0.1, "wind_speed_kmh": 0})
+        heavy = template_scene({**SAMPLE_WEATHER_DATA, "precipitation_mm": 5, "wind_speed_kmh": 50})
+        light_rain, heavy_rain = elements_of(light, "particle_system")[0], elements_of(heavy, "particle_system")[0]
+        assert light_rain["preset"] == "rain"
+        assert heavy_rain["count"] > light_rain["count"]
+        assert heavy_rain["angle"] < light_rain["angle"]
+
+    def test_clear_night_has_moon_and_stars(self):
+        scene = template_scene({**SAMPLE_WEATHER_DATA, "weather_code": 0, "cloud_cover_pct": 0, "is_day": False})
+        assert elements_of(scene, "glow")
+        assert elements_of(scene, "particle_system")[0]["preset"] == "stars"
+
+    def test_thunderstorm_has_lightning(self):
+        scene = template_scene({**SAMPLE_WEATHER_DATA, "weather_code": 95})
+        assert len(elements_of(scene, "line")) == 3
+
+    def test_metadata(self):
+        scene = template_scene(SAMPLE_WEATHER_DATA, "Berlin")
+        assert scene["scene"]["metadata"] == {
+            "title": "Slight rain in Berlin",
+            "weather_summary": "Slight rain, 8C, wind 25 km/h",
+        }
+
+    def test_deterministic(self):
+        assert template_scene(SAMPLE_WEATHER_DATA) == template_scene(SAMPLE_WEATHER_DATA)
+
+    def test_fast(self):
+        start = time.perf_counter()
+        for _ in range(100):
+            template_scene(SAMPLE_WEATHER_DATA)
+        assert (time.perf_counter() - start) / 100 < 0.005
@@ -0,0 +1,90 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from weather_art.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, "berlin", work)]
+        while flight.stats()["in_flight"] == 0:
+            pass
+        futures += [pool.submit(flight.do, "berlin", work) for _ in range(4)]
+        while flight.stats()["coalesced"] < 4:
+            pass
+        release.set()
+        results = [f.result(timeout=5) for f in futures]
+
+    assert calls == [1]
+    assert all(r == {"value": 42} for r in results)
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+def test_waiters_receive_leader_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def work():
+        release.wait(5)
+        raise ValueError("City not found: Xyzzy")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "xyzzy", work)
+        while flight.stats()["in_flight"] == 0:
+            pass
+        waiter = pool.submit(flight.do, "xyzzy", work)
+        while flight.stats()["coalesced"] < 1:
+            pass
+        release.set()
+        for future in (leader, waiter):
+            with pytest.raises(ValueError, match="City not found"):
+                future.result(timeout=5)
+
+
+def test_sequential_calls_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2
+    assert flight.stats()["executions"] == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_different_keys_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: "a") == "a"
+    assert flight.do("b", lambda: "b") == "b"
+    assert flight.stats()["executions"] == 2
+
+
+def test_submit_shares_the_leaders_future():
+    flight = SingleFlight()
+    started = []
+
+    def start():
+        started.append(1)
+        return Future()
+
+    leader = flight.submit("berlin", start)
+    assert flight.submit("berlin", start) is leader
+    leader.set_result(42)
+
+    assert started == [1]
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 1}
+
+
+def test_submit_that_does_not_start_leaves_key_free():
+    flight = SingleFlight()
+    assert flight.submit("berlin", lambda: None) is None
+    assert flight.do("berlin", lambda: 1) == 1
+    assert flight.stats()["executions"] == 1
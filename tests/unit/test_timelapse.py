@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from tests.unit.conftest import SAMPLE_SCENE, SAMPLE_WEATHER_DATA
+from weather_art.scene_schema import SceneResponse
+from weather_art.timelapse import derive_frame, generate_timelapse
+
+BASE_SCENE = SceneResponse.model_validate(SAMPLE_SCENE).model_dump()
+CLEAR_NIGHT = {**SAMPLE_WEATHER_DATA, "weather_code": 0, "weather_description": "Clear sky", "cloud_cover_pct": 10,
+               "precipitation_mm": 0.0, "rain_mm": 0.0, "temperature_c": 5.0}
+
+
+def _presets(scene):
+    return {el["preset"]: el for el in scene["scene"]["elements"] if el["type"] == "particle_system"}
+
+
+class TestDeriveFrame:
+    def test_same_weather_keeps_scene(self):
+        frame = derive_frame(BASE_SCENE, SAMPLE_WEATHER_DATA, SAMPLE_WEATHER_DATA)
+        assert frame["scene"]["elements"] == BASE_SCENE["scene"]["elements"]
+        assert frame["scene"]["background"] == BASE_SCENE["scene"]["background"]
+
+    def test_heavier_rain_scales_particle_count(self):
+        heavier = {**SAMPLE_WEATHER_DATA, "precipitation_mm": SAMPLE_WEATHER_DATA["precipitation_mm"] + 2}
+        frame = derive_frame(BASE_SCENE, SAMPLE_WEATHER_DATA, heavier)
+        assert _presets(frame)["rain"]["count"] > _presets(BASE_SCENE)["rain"]["count"]
+
+    def test_clear_night_drops_rain_and_adds_stars(self):
+        frame = derive_frame(BASE_SCENE, SAMPLE_WEATHER_DATA, CLEAR_NIGHT)
+        presets = _presets(frame)
+        assert "rain" not in presets
+        assert "stars" in presets
+        assert frame["scene"]["background"]["colors"] != BASE_SCENE["scene"]["background"]["colors"]
+        assert frame["scene"]["metadata"]["title"] == BASE_SCENE["scene"]["metadata"]["title"]
+        assert frame["scene"]["metadata"]["weather_summary"].startswith("Clear sky")
+
+    def test_glow_brightens_as_clouds_clear(self):
+        frame = derive_frame(BASE_SCENE, SAMPLE_WEATHER_DATA, CLEAR_NIGHT)
+        assert frame["scene"]["elements"][0]["intensity"] > BASE_SCENE["scene"]["elements"][0]["intensity"]
+
+    def test_temperature_text_follows_the_hour(self):
+        base = SceneResponse.model_validate({"scene": {
+            **SAMPLE_SCENE["scene"],
+            "elements": [{"type": "text", "content": f"{SAMPLE_WEATHER_DATA['temperature_c']:.0f}°C",
+                          "x": 10, "y": 10}],
+        }}).model_dump()
+        frame = derive_frame(base, SAMPLE_WEATHER_DATA, CLEAR_NIGHT)
+        assert frame["scene"]["elements"][-1]["content"] == "5°C"
+
+
+class TestGenerateTimelapse:
+    @patch("weather_art.timelapse.get_current_weather")
+    @patch("weather_art.timelapse.generate_scene")
+    @patch("weather_art.timelapse.get_hourly_forecast")
+    def test_one_generation_for_all_frames(self, mock_forecast, mock_gen, mock_weather):
+        mock_forecast.return_value = [
+            {**SAMPLE_WEATHER_DATA, "time": "2026-01-01T10:00"},
+            {**CLEAR_NIGHT, "time": "2026-01-01T11:00"},
+        ]
+        mock_gen.return_value = BASE_SCENE
+        mock_weather.return_value = SAMPLE_WEATHER_DATA
+
+        result = generate_timelapse("Berlin", 52.52, 13.41, hours=2, frame_ms=500)
+
+        mock_gen.assert_called_once()
+        mock_forecast.assert_called_once_with(52.52, 13.41, 2)
+        assert [f["time"] for f in result["frames"]] == ["2026-01-01T10:00", "2026-01-01T11:00"]
+        assert [f["start_ms"] for f in result["frames"]] == [0, 500]
+        assert result["duration_ms"] == 1000
+        assert "rain" not in _presets(result["frames"][1])
+
+    @patch("weather_art.timelapse.get_current_weather")
+    @patch("weather_art.timelapse.generate_scene")
+    @patch("weather_art.timelapse.get_hourly_forecast")
+    @patch("weather_art.timelapse.geocode_city")
+    def test_geocodes_location_name(self, mock_geocode, mock_forecast, mock_gen, mock_weather):
+        mock_geocode.return_value = {"latitude": 52.52, "longitude": 13.41}
+        mock_forecast.return_value = []
+        mock_gen.return_value = BASE_SCENE
+
+        generate_timelapse("Berlin")
+
+        assert mock_gen.call_args.args[:3] == ("Berlin", 52.52, 13.41)
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+from weather_art.tracing import (
+    AgentTracingHooks,
+    Tracer,
+    finish_timings,
+    server_timing_header,
+    start_timings,
+    traced,
+    tracer,
+)
+
+
+def test_span_records_duration_and_errors():
+    t = Tracer(enabled=True)
+    with t.span("geocode"):
+        pass
+    with pytest.raises(ValueError):
+        with t.span("geocode"):
+            raise ValueError("boom")
+    stage = t.stats()["stages"]["geocode"]
+    assert stage["count"] == 2
+    assert stage["errors"] == 1
+    assert stage["sum_seconds"] >= 0
+
+
+def test_disabled_tracer_records_nothing():
+    t = Tracer(enabled=False)
+    with t.span("geocode"):
+        pass
+    t.record("model", 1.0)
+    t.add_tokens(10, 5)
+    assert t.stats() == {"stages": {}, "tokens": {"prompt": 0, "completion": 0}}
+
+
+def test_traced_decorator_uses_module_tracer():
+    @traced("lookup")
+    def lookup(x):
+        """Docstring."""
+        return x * 2
+
+    assert lookup(2) == 4
+    assert lookup.__doc__ == "Docstring."
+    assert tracer.stats()["stages"]["lookup"]["count"] == 1
+
+
+def test_render_prometheus_buckets_are_cumulative():
+    t = Tracer(enabled=True, buckets=(0.1, 1.0))
+    t.record("model", 0.05)
+    t.record("model", 0.5)
+    t.record("model", 5.0)
+    t.add_tokens(100, 20)
+    text = t.render_prometheus()
+    assert 'weather_art_stage_duration_seconds_bucket{stage="model",le="0.1"} 1' in text
+    assert 'weather_art_stage_duration_seconds_bucket{stage="model",le="1.0"} 2' in text
+    assert 'weather_art_stage_duration_seconds_bucket{stage="model",le="+Inf"} 3' in text
+    assert 'weather_art_stage_duration_seconds_count{stage="model"} 3' in text
+    assert 'weather_art_model_tokens_total{kind="prompt"} 100' in text
+    assert 'weather_art_model_tokens_total{kind="completion"} 20' in text
+
+
+def test_agent_hooks_time_model_calls_and_count_tokens():
+    t = Tracer(enabled=True)
+    hooks = AgentTracingHooks(t)
+    message = {"role": "assistant", "content": [], "metadata": {"usage": {"inputTokens": 120, "outputTokens": 30}}}
+    hooks._before_model(SimpleNamespace())
+    hooks._after_model(SimpleNamespace(exception=None, stop_response=SimpleNamespace(message=message)))
+    stats = t.stats()
+    assert stats["stages"]["model"]["count"] == 1
+    assert stats["tokens"] == {"prompt": 120, "completion": 30}
+
+
+def test_agent_hooks_time_tool_calls_by_id():
+    t = Tracer(enabled=True)
+    hooks = AgentTracingHooks(t)
+    first = {"toolUseId": "1", "name": "get_weather"}
+    second = {"toolUseId": "2", "name": "get_weather"}
+    hooks._before_tool(SimpleNamespace(tool_use=first))
+    hooks._before_tool(SimpleNamespace(tool_use=second))
+    hooks._after_tool(SimpleNamespace(tool_use=second, exception=None, result={"status": "error"}))
+    hooks._after_tool(SimpleNamespace(tool_use=first, exception=None, result={"status": "success"}))
+    stage = t.stats()["stages"]["tool.get_weather"]
+    assert stage["count"] == 2
+    assert stage["errors"] == 1
+
+
+def test_timings_collected_only_while_started():
+    tracer.record("weather", 0.01)
+    token = start_timings()
+    tracer.record("geocode", 0.002)
+    tracer.record("model", 0.5)
+    tracer.record("model", 0.25)
+    timings = finish_timings(token)
+    assert timings == [("geocode", 0.002), ("model", 0.5), ("model", 0.25)]
+    assert server_timing_header(timings) == 'geocode;dur=2.0;desc="1x", model;dur=750.0;desc="2x"'
@@ -1,6 +1,17 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 from unittest.mock import patch, Mock
 
-from weather_art.weather import get_current_weather, WMO_CODES
+from weather_art.weather import (
+    HOURLY_PARAMS,
+    get_current_weather,
+    get_current_weather_batch,
+    get_hourly_forecast,
+    weather_cache,
+    weather_flight,
+    WMO_CODES,
+)
 
 
 BERLIN_WEATHER_RESPONSE = {
@@ -21,7 +32,7 @@ BERLIN_WEATHER_RESPONSE = {
 }
 
 
-@patch("weather_art.weather.requests.get")
+@patch("weather_art.weather.http_get")
 def test_get_current_weather_success(mock_get):
     mock_resp = Mock()
     mock_resp.json.return_value = BERLIN_WEATHER_RESPONSE
@@ -46,7 +57,7 @@ def test_get_current_weather_success(mock_get):
     mock_get.assert_called_once()
 
 
-@patch("weather_art.weather.requests.get")
+@patch("weather_art.weather.http_get")
 def test_get_current_weather_night(mock_get):
     night_data = {
         "current": {**BERLIN_WEATHER_RESPONSE["current"], "is_day": 0}
@@ -60,7 +71,7 @@ def test_get_current_weather_night(mock_get):
     assert result["is_day"] is False
 
 
-@patch("weather_art.weather.requests.get")
+@patch("weather_art.weather.http_get")
 def test_get_current_weather_unknown_code(mock_get):
     unknown_data = {
         "current": {**BERLIN_WEATHER_RESPONSE["current"], "weather_code": 999}
@@ -74,6 +85,172 @@ def test_get_current_weather_unknown_code(mock_get):
     assert result["weather_description"] == "Unknown"
 
 
+@patch("weather_art.weather.http_get")
+def test_get_current_weather_cached_per_grid_cell(mock_get):
+    mock_resp = Mock()
+    mock_resp.json.return_value = BERLIN_WEATHER_RESPONSE
+    mock_resp.raise_for_status = Mock()
+    mock_get.return_value = mock_resp
+
+    first = get_current_weather(52.52, 13.41)
+    second = get_current_weather(52.51, 13.42)
+
+    assert first == second
+    mock_get.assert_called_once()
+    assert weather_cache.stats()["hits"] == 1
+    assert weather_cache.stats()["misses"] == 1
+
+
+@patch("weather_art.weather.http_get")
+def test_get_current_weather_distinct_cells_not_shared(mock_get):
+    mock_resp = Mock()
+    mock_resp.json.return_value = BERLIN_WEATHER_RESPONSE
+    mock_resp.raise_for_status = Mock()
+    mock_get.return_value = mock_resp
+
+    get_current_weather(52.52, 13.41)
+    get_current_weather(48.85, 2.35)
+
+    assert mock_get.call_count == 2
+
+
+@patch("weather_art.weather.http_get")
+def test_get_current_weather_returns_copy_of_cached_entry(mock_get):
+    mock_resp = Mock()
+    mock_resp.json.return_value = BERLIN_WEATHER_RESPONSE
+    mock_resp.raise_for_status = Mock()
+    mock_get.return_value = mock_resp
+
+    get_current_weather(52.52, 13.41)["temperature_c"] = -99
+
+    assert get_current_weather(52.52, 13.41)["temperature_c"] == 8.3
+
+
+@patch("weather_art.weather.http_get")
+def test_concurrent_misses_share_one_request(mock_get):
+    release = threading.Event()
+    mock_resp = Mock()
+    mock_resp.json.return_value = BERLIN_WEATHER_RESPONSE
+    mock_resp.raise_for_status = Mock()
+
+    def slow_get(*args, **kwargs):
+        release.wait(5)
+        return mock_resp
+
+    mock_get.side_effect = slow_get
+    coalesced_before = weather_flight.stats()["coalesced"]
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(get_current_weather, 52.52, 13.41) for _ in range(3)]
+        while weather_flight.stats()["coalesced"] < coalesced_before + 2:
+            pass
+        release.set()
+        results = [f.result(timeout=5) for f in futures]
+
+    mock_get.assert_called_once()
+    assert all(r["temperature_c"] == 8.3 for r in results)
+    assert results[0] is not results[1]
+
+
+def mock_batch_response(*codes):
+    mock_resp = Mock()
+    mock_resp.json.return_value = [
+        {"current": {**BERLIN_WEATHER_RESPONSE["current"], "weather_code": code}}
+        for code in codes
+    ]
+    mock_resp.raise_for_status = Mock()
+    return mock_resp
+
+
+@patch("weather_art.weather.http_get")
+def test_batch_fetches_many_locations_in_one_request(mock_get):
+    mock_get.return_value = mock_batch_response(61, 0, 71)
+
+    results = get_current_weather_batch([(52.52, 13.41), (48.85, 2.35), (35.68, 139.69)])
+
+    mock_get.assert_called_once()
+    params = mock_get.call_args.kwargs["params"]
+    assert params["latitude"] == "52.52,48.85,35.68"
+    assert params["longitude"] == "13.41,2.35,139.69"
+    assert [r["weather_description"] for r in results] == ["Slight rain", "Clear sky", "Slight snowfall"]
+    assert set(results[0]) == set(get_current_weather(52.52, 13.41))
+
+
+@patch("weather_art.weather.http_get")
+def test_batch_serves_cached_cells_and_dedupes(mock_get):
+    mock_get.return_value = mock_batch_response(61)
+    get_current_weather_batch([(52.52, 13.41)])
+    mock_get.return_value = mock_batch_response(0)
+
+    results = get_current_weather_batch([(52.52, 13.41), (48.85, 2.35), (48.86, 2.34)])
+
+    assert mock_get.call_count == 2
+    assert mock_get.call_args.kwargs["params"]["latitude"] == "48.85"
+    assert [r["weather_code"] for r in results] == [61, 0, 0]
+
+
+@patch("weather_art.weather.OPEN_METEO_BATCH_SIZE", 2)
+@patch("weather_art.weather.http_get")
+def test_batch_chunks_requests(mock_get):
+    mock_get.side_effect = [mock_batch_response(0, 1), mock_batch_response(2)]
+
+    results = get_current_weather_batch([(10.0, 10.0), (20.0, 20.0), (30.0, 30.0)])
+
+    assert mock_get.call_count == 2
+    assert [r["weather_code"] for r in results] == [0, 1, 2]
+
+
+@patch("weather_art.weather.http_get")
+def test_batch_populates_single_lookup_cache(mock_get):
+    mock_get.return_value = mock_batch_response(3)
+    get_current_weather_batch([(52.52, 13.41)])
+
+    assert get_current_weather(52.52, 13.41)["weather_code"] == 3
+    mock_get.assert_called_once()
+
+
+def mock_hourly_response(start: datetime, codes: list[int]):
+    hours = [start + timedelta(hours=i) for i in range(len(codes))]
+    hourly = {name: [value] * len(codes) for name, value in BERLIN_WEATHER_RESPONSE["current"].items()}
+    hourly["time"] = [hour.strftime("%Y-%m-%dT%H:00") for hour in hours]
+    hourly["weather_code"] = codes
+    mock_resp = Mock()
+    mock_resp.json.return_value = {"hourly": hourly}
+    mock_resp.raise_for_status = Mock()
+    return mock_resp
+
+
+@patch("weather_art.weather.http_get")
+def test_hourly_forecast_normalizes_each_hour(mock_get):
+    now = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+    mock_get.return_value = mock_hourly_response(now, [61, 3, 0])
+
+    forecast = get_hourly_forecast(52.52, 13.41, hours=2)
+
+    assert [h["weather_description"] for h in forecast] == ["Slight rain", "Overcast"]
+    assert forecast[0]["time"] == now.strftime("%Y-%m-%dT%H:00")
+    assert forecast[0]["temperature_c"] == 8.3
+    assert mock_get.call_args.kwargs["params"]["hourly"] == HOURLY_PARAMS
+
+
+@patch("weather_art.weather.http_get")
+def test_hourly_forecast_cached_per_grid_cell(mock_get):
+    now = datetime.now(UTC)
+    mock_get.return_value = mock_hourly_response(now, [0] * 6)
+
+    get_hourly_forecast(52.52, 13.41, hours=3)
+    assert len(get_hourly_forecast(52.521, 13.411, hours=6)) == 6
+    mock_get.assert_called_once()
+
+
+@patch("weather_art.weather.http_get")
+def test_hourly_forecast_skips_past_hours(mock_get):
+    mock_get.return_value = mock_hourly_response(datetime.now(UTC) - timedelta(hours=2), [1, 2, 3, 45])
+
+    forecast = get_hourly_forecast(52.52, 13.41)
+    assert [h["weather_code"] for h in forecast] == [3, 45]
+
+
 def test_wmo_codes_coverage():
     """Verify key WMO codes are present."""
     assert 0 in WMO_CODES  # Clear sky
@@ -1,13 +1,53 @@
+import contextvars
+import copy
+import functools
+import hashlib
 import json
-import re
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
 
+from pydantic import ValidationError
 from strands import Agent, tool
+from strands.hooks import BeforeModelCallEvent
 from strands.models import OllamaModel
 
-from weather_art.config import OLLAMA_HOST, OLLAMA_MODEL_ID
+from weather_art.agent_pool import AgentPool
+from weather_art.cache import TTLCache
+from weather_art.config import (
+    AGENT_POOL_ACQUIRE_TIMEOUT,
+    AGENT_POOL_MAX_USES,
+    AGENT_POOL_SIZE,
+    OLLAMA_HOST,
+    OLLAMA_MODEL_ID,
+    REQUEST_DEADLINE_SECONDS,
+    SCENE_FALLBACK_AFTER_SECONDS,
+    SCENE_FORMAT_COMPACT,
+    SCENE_GENERATION_MODE,
+)
+from weather_art.deadline import clamp_timeout, current_deadline, deadline_scope
+from weather_art.generation_stats import attempt_scope, current_attempt, generation_stats
 from weather_art.geocoding import geocode_city
-from weather_art.weather import get_current_weather
+from weather_art.json_extract import extract_json_from_response
+from weather_art.weather import get_current_weather, weather_ttl_remaining
+from weather_art.scene_cache import scene_cache, scene_cache_key
+from weather_art.scene_repair import repair_scene, repair_stats
 from weather_art.scene_schema import SceneResponse
+from weather_art.scene_stream import SceneStreamParser
+from weather_art.scene_templates import template_scene
+from weather_art.singleflight import SingleFlight
+from weather_art.tracing import AgentTracingHooks, span
+
+# Progress callback of the generate_scene call currently running in this
+# context; Strands copies the context into the threads that run tools.
+_progress: ContextVar[Callable[..., None] | None] = ContextVar("_progress", default=None)
+
+
+def _report(stage: str, **data) -> None:
+    progress = _progress.get()
+    if progress is not None:
+        progress(stage, **data)
 
 
 @tool
@@ -49,7 +89,37 @@ def get_scene_format() -> dict:
     Returns:
         Complete reference for the scene JSON format the renderer expects.
     """
-    schema_ref = json.dumps(SceneResponse.model_json_schema(), indent=2)
+    guide = scene_format_guide(compact=SCENE_FORMAT_COMPACT)
+    return {"status": "success", "content": [{"text": guide}]}
+
+
+def _strip_titles(schema: dict | list) -> dict | list:
+    """Drop pydantic's auto-generated "title" keywords, keeping properties named "title"."""
+    if isinstance(schema, list):
+        return [_strip_titles(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    stripped = {}
+    for key, value in schema.items():
+        if key == "properties":
+            stripped[key] = {name: _strip_titles(prop) for name, prop in value.items()}
+        elif key != "title":
+            stripped[key] = _strip_titles(value)
+    return stripped
+
+
+@functools.cache
+def scene_format_guide(compact: bool = False) -> str:
+    """Render the scene format reference shared by get_scene_format and direct mode.
+
+    Rendered once per variant. The compact variant minifies the JSON schema and
+    drops its generated titles, cutting the prompt tokens it costs the model.
+    """
+    schema = SceneResponse.model_json_schema()
+    if compact:
+        schema_ref = json.dumps(_strip_titles(schema), separators=(",", ":"))
+    else:
+        schema_ref = json.dumps(schema, indent=2)
 
     guide = f"""\
 ## Scene JSON Schema (auto-generated from Pydantic models)
@@ -129,7 +199,7 @@ Organize visually by ordering: background shapes first, then weather effects, th
 - Keep total element count reasonable (under 30 elements)
 - Order elements back-to-front (background shapes first, foreground last)
 """
-    return {"status": "success", "content": [{"text": guide}]}
+    return guide
 
 
 @tool
@@ -145,13 +215,17 @@ def validate_scene(scene_json: str) -> dict:
 
     Returns:
         Validation result: success with the validated JSON, or error with details.
+        Minor problems are repaired automatically; use the returned JSON.
     """
+    _report("validating")
     try:
-        raw = extract_json_from_response(scene_json)
-        validated = SceneResponse.model_validate(raw)
+        validated = _validate_scene_text(scene_json)
+        text = validated.model_dump_json()
+        # The model usually answers with exactly this text; let the final parse reuse it.
+        validation_memo.set(_content_key(text), validated)
         return {
             "status": "success",
-            "content": [{"text": json.dumps(validated.model_dump())}],
+            "content": [{"text": text}],
         }
     except (json.JSONDecodeError, Exception) as e:
         return {
@@ -175,27 +249,43 @@ artistically represents the current weather conditions.
 Return ONLY the validated JSON as your final answer — no markdown fences, no explanation text.
 """
 
+DIRECT_SYSTEM_PROMPT = f"""\
+You are a weather artist AI. You will be given a location, its current weather conditions \
+and optionally a style prompt. Produce a JSON object describing a p5.js scene that \
+artistically represents those weather conditions, following the scene format reference below.
 
-def extract_json_from_response(text: str) -> dict:
-    """Extract and parse JSON from agent response, stripping markdown fences if present."""
-    cleaned = text.strip()
-    cleaned = re.sub(r"^```(?:json)?\s*\n?", "", cleaned)
-    cleaned = re.sub(r"\n?```\s*$", "", cleaned)
-    cleaned = cleaned.strip()
-    return json.loads(cleaned)
+Return ONLY the JSON object — no markdown fences, no explanation text.
 
+{scene_format_guide(compact=SCENE_FORMAT_COMPACT)}"""
 
-def generate_scene(
-    location: str,
-    latitude: float | None = None,
-    longitude: float | None = None,
-    style_prompt: str = "",
-) -> dict:
-    """Generate a weather art scene for the given location.
+GENERATION_MODES = ("agent", "direct", "structured")
 
-    Creates a fresh Strands Agent, fetches weather data via tools, and returns
-    a validated scene dict.
-    """
+DIRECT_MAX_ATTEMPTS = 2
+
+# A correction turn is only attempted with at least this much of the deadline left.
+DIRECT_RETRY_MIN_SECONDS = 5.0
+
+# Time kept back from the deadline to build and return a fallback scene.
+DEADLINE_FALLBACK_MARGIN_SECONDS = 0.05
+
+
+def _apply_deadline(event: BeforeModelCallEvent) -> None:
+    """Give each model call only the time left before the request deadline."""
+    client_args = event.agent.model.client_args
+    timeout = clamp_timeout(None)
+    if timeout is None:
+        client_args.pop("timeout", None)
+    else:
+        client_args["timeout"] = timeout
+
+
+def _count_model_turn(event: BeforeModelCallEvent) -> None:
+    attempt = current_attempt()
+    if attempt is not None:
+        attempt.model_turns += 1
+
+
+def _build_scene_agent() -> Agent:
     model = OllamaModel(
         host=OLLAMA_HOST,
         model_id=OLLAMA_MODEL_ID,
@@ -205,22 +295,446 @@ def generate_scene(
         model=model,
         system_prompt=SYSTEM_PROMPT,
         tools=[geocode_location, get_weather, get_scene_format, validate_scene],
+        hooks=[AgentTracingHooks()],
     )
+    agent.hooks.add_callback(BeforeModelCallEvent, _apply_deadline)
+    agent.hooks.add_callback(BeforeModelCallEvent, _count_model_turn)
+    return agent
 
-    if latitude is not None and longitude is not None:
-        user_message = (
-            f"Create a weather art scene for {location} "
-            f"(latitude: {latitude}, longitude: {longitude})."
-        )
-    else:
-        user_message = f"Create a weather art scene for {location}."
 
+scene_agent_pool = AgentPool(
+    _build_scene_agent,
+    max_size=AGENT_POOL_SIZE,
+    max_uses=AGENT_POOL_MAX_USES,
+    acquire_timeout=AGENT_POOL_ACQUIRE_TIMEOUT,
+)
+
+
+def _build_direct_agent() -> Agent:
+    model = OllamaModel(
+        host=OLLAMA_HOST,
+        model_id=OLLAMA_MODEL_ID,
+    )
+
+    agent = Agent(
+        model=model,
+        system_prompt=DIRECT_SYSTEM_PROMPT,
+        tools=[],
+        hooks=[AgentTracingHooks()],
+    )
+    agent.hooks.add_callback(BeforeModelCallEvent, _apply_deadline)
+    agent.hooks.add_callback(BeforeModelCallEvent, _count_model_turn)
+    return agent
+
+
+direct_agent_pool = AgentPool(
+    _build_direct_agent,
+    max_size=AGENT_POOL_SIZE,
+    max_uses=AGENT_POOL_MAX_USES,
+    acquire_timeout=AGENT_POOL_ACQUIRE_TIMEOUT,
+)
+
+
+def _inline_refs(schema, defs: dict):
+    if isinstance(schema, list):
+        return [_inline_refs(item, defs) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    if "$ref" in schema:
+        return _inline_refs(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    reduced = {}
+    for key, value in schema.items():
+        if key in ("$defs", "discriminator", "default", "description"):
+            continue
+        reduced["anyOf" if key == "oneOf" else key] = _inline_refs(value, defs)
+    # The discriminator is the only way to tell union members apart, so it may not be left out.
+    if "const" in reduced.get("properties", {}).get("type", {}):
+        reduced["required"] = ["type", *reduced.get("required", [])]
+    return reduced
+
+
+@functools.cache
+def structured_output_schema() -> dict:
+    """SceneResponse's JSON schema reduced for Ollama's ``format`` constraint.
+
+    References are inlined, discriminated unions become plain anyOf with the
+    "type" discriminator required, and titles, defaults and descriptions are
+    dropped, so the grammar Ollama compiles from it stays small. The scene
+    must spell out its background, elements and metadata rather than lean on
+    the model defaults.
+    """
+    schema = _strip_titles(SceneResponse.model_json_schema())
+    reduced = _inline_refs(schema, schema.get("$defs", {}))
+    reduced["properties"]["scene"]["required"] = ["background", "elements", "metadata"]
+    return reduced
+
+
+def _build_structured_agent() -> Agent:
+    model = OllamaModel(
+        host=OLLAMA_HOST,
+        model_id=OLLAMA_MODEL_ID,
+        additional_args={"format": structured_output_schema()},
+    )
+
+    agent = Agent(
+        model=model,
+        system_prompt=DIRECT_SYSTEM_PROMPT,
+        tools=[],
+        hooks=[AgentTracingHooks()],
+    )
+    agent.hooks.add_callback(BeforeModelCallEvent, _apply_deadline)
+    agent.hooks.add_callback(BeforeModelCallEvent, _count_model_turn)
+    return agent
+
+
+structured_agent_pool = AgentPool(
+    _build_structured_agent,
+    max_size=AGENT_POOL_SIZE,
+    max_uses=AGENT_POOL_MAX_USES,
+    acquire_timeout=AGENT_POOL_ACQUIRE_TIMEOUT,
+)
+
+
+def agent_pool_for(mode: str) -> AgentPool:
+    """The pool whose agents generate scenes in ``mode``."""
+    if mode == "agent":
+        return scene_agent_pool
+    return structured_agent_pool if mode == "structured" else direct_agent_pool
+
+
+def _validate_scene_data(raw: dict) -> SceneResponse:
+    """Validate parsed scene JSON, repairing it locally before giving up.
+
+    The repair pass only runs when validation fails; if the repaired scene
+    still does not validate, the original error is raised so the model sees
+    what it got wrong.
+    """
+    try:
+        with span("validate"):
+            return SceneResponse.model_validate(raw)
+    except ValidationError as error:
+        try:
+            with span("repair"):
+                repaired, changes = repair_scene(raw)
+                validated = SceneResponse.model_validate(repaired)
+        except ValueError:
+            repair_stats.record(None)
+            raise error
+        repair_stats.record(changes)
+        _report("repaired", changes=changes)
+        return validated
+
+
+# Validated scenes by content hash of the text they were parsed from, so the
+# final answer is not re-validated after validate_scene has already checked it.
+VALIDATION_MEMO_SIZE = 64
+VALIDATION_MEMO_TTL_SECONDS = 600
+
+validation_memo = TTLCache(max_entries=VALIDATION_MEMO_SIZE, ttl=VALIDATION_MEMO_TTL_SECONDS)
+
+
+def _content_key(text: str) -> bytes:
+    return hashlib.blake2b(text.strip().encode(), digest_size=16).digest()
+
+
+def _validate_scene_text(text: str) -> SceneResponse:
+    """Validate scene JSON text, memoized by content hash.
+
+    Clean JSON is validated straight from the text by pydantic's JSON parser;
+    anything else goes through the tolerant extractor and the repair pass.
+    """
+    key = _content_key(text)
+    validated = validation_memo.get(key)
+    if validated is None:
+        attempt = current_attempt()
+        if attempt is not None:
+            attempt.answers += 1
+        try:
+            with span("validate"):
+                validated = SceneResponse.model_validate_json(text.strip())
+        except ValidationError:
+            try:
+                with span("extract_json"):
+                    raw = extract_json_from_response(text)
+                validated = _validate_scene_data(raw)
+            except ValueError:
+                if attempt is not None:
+                    attempt.invalid_answers += 1
+                raise
+        validation_memo.set(key, validated)
+    return validated
+
+
+def _parse_scene(response_text: str) -> dict:
+    return _validate_scene_text(response_text).model_dump()
+
+
+scene_flight = SingleFlight()
+
+
+def generate_scene(
+    location: str,
+    latitude: float | None = None,
+    longitude: float | None = None,
+    style_prompt: str = "",
+    mode: str | None = None,
+    progress: Callable[..., None] | None = None,
+    fallback_after: float | None = None,
+    deadline: float | None = None,
+) -> dict:
+    """Generate a weather art scene for the given location.
+
+    Coordinates and current weather are resolved first so the scene cache can
+    be consulted; a hit for the same grid cell, weather signature and style
+    prompt skips the model entirely, whichever mode drew the scene. Scenes are
+    cached until the weather they were drawn from goes stale, and concurrent
+    misses for the same key and mode share one generation. That generation
+    runs under the deadline of the request that started it and reports
+    progress only to that request; a request that joins it still falls back
+    at its own ``fallback_after`` and ``deadline``.
+
+    In "agent" mode the model drives the weather/format/validate tool loop
+    itself. In "direct" mode the resolved weather is handed to the model, which
+    only performs the creative step, usually in a single turn. "structured"
+    mode is direct mode with the answer constrained by Ollama's ``format``
+    to structured_output_schema(), so it is schema-conformant by construction.
+    ``mode`` defaults to SCENE_GENERATION_MODE. Model turns and validation
+    failures are tallied per mode in generation_stats.
+
+    ``progress``, if given, is called as ``progress(stage, **data)`` when the
+    location is geocoded, weather is fetched and the scene is being validated.
+    In direct mode it also receives "background", "element" and "metadata"
+    stages as each part of the scene finishes streaming from the model and
+    passes validation, so clients can start drawing before the scene is done.
+
+    If the model has not produced a scene ``fallback_after`` seconds after the
+    cache miss, or fails, a procedural template scene for the same weather is
+    returned instead and a "fallback" stage is reported; a timed-out
+    generation keeps running and caches its scene for the next request. While
+    AGENT_POOL_SIZE such generations are running, the template is served at
+    once without starting another. ``fallback_after`` defaults to SCENE_FALLBACK_AFTER_SECONDS; 0 disables it.
+
+    ``deadline`` bounds the whole request to that many seconds, defaulting to
+    REQUEST_DEADLINE_SECONDS (0 means unbounded). Upstream HTTP timeouts, the
+    wait for a pooled agent and every model call are shrunk to the time left,
+    correction turns are skipped when too little remains, and the fallback
+    scene is served if the model is still busy when the deadline arrives.
+    Raises DeadlineExceeded if the budget runs out before the weather is known.
+
+    Returns a validated scene dict.
+    """
+    # Callers may pass any value; it only ever ends up formatted into the prompt.
+    style_prompt = str(style_prompt) if style_prompt else ""
+    mode = mode or SCENE_GENERATION_MODE
+    if mode not in GENERATION_MODES:
+        raise ValueError(f"Unknown generation mode: {mode}")
+    if fallback_after is None:
+        fallback_after = SCENE_FALLBACK_AFTER_SECONDS
+    if deadline is None:
+        deadline = REQUEST_DEADLINE_SECONDS or None
+
+    token = _progress.set(progress)
+    try:
+        with deadline_scope(deadline):
+            return _resolve_and_generate(
+                location, latitude, longitude, style_prompt, mode, fallback_after
+            )
+    finally:
+        _progress.reset(token)
+
+
+def _resolve_and_generate(
+    location: str,
+    latitude: float | None,
+    longitude: float | None,
+    style_prompt: str,
+    mode: str,
+    fallback_after: float,
+) -> dict:
+    # Weather depends on the coordinates, so the two lookups cannot overlap;
+    # both are served from their caches after the first request for a place.
+    if latitude is None or longitude is None:
+        geocoded = geocode_city(location)
+        _report("geocoded", location=geocoded)
+        latitude, longitude = geocoded["latitude"], geocoded["longitude"]
+    weather = get_current_weather(latitude, longitude)
+    _report("weather_fetched", weather=weather)
+
+    key = scene_cache_key(latitude, longitude, weather, style_prompt)
+    cached = scene_cache.get(key)
+    if cached is not None:
+        _report("cache_hit")
+        return copy.deepcopy(cached)
+
+    def generate() -> dict:
+        with span("generate"), attempt_scope() as attempt:
+            try:
+                if mode == "agent":
+                    scene = _generate_with_tools(location, latitude, longitude, style_prompt)
+                else:
+                    pool = agent_pool_for(mode)
+                    scene = _generate_direct(location, latitude, longitude, weather, style_prompt, pool)
+            except Exception:
+                generation_stats.record(mode, attempt, succeeded=False)
+                raise
+            generation_stats.record(mode, attempt, succeeded=True)
+        scene_cache.set(key, scene, ttl=weather_ttl_remaining(latitude, longitude))
+        return scene
+
+    wait = fallback_after if fallback_after > 0 else None
+    request_deadline = current_deadline()
+    if request_deadline is not None:
+        left = max(request_deadline.remaining() - DEADLINE_FALLBACK_MARGIN_SECONDS, 0.0)
+        wait = left if wait is None else min(wait, left)
+    flight_key = (mode, key)
+    if wait is None:
+        return copy.deepcopy(scene_flight.do(flight_key, generate))
+    return _generate_or_fallback(flight_key, generate, weather, location, wait)
+
+
+def seed_scene_cache(
+    latitude: float,
+    longitude: float,
+    weather: dict,
+    style_prompt: str = "",
+    location: str = "",
+    ttl: float | None = None,
+) -> bool:
+    """Cache a template scene for a place that has no cached scene yet.
+
+    Lets the first request for a cell be served instantly; the model takes
+    over once the seeded entry expires. Returns True if a scene was seeded.
+    """
+    key = scene_cache_key(latitude, longitude, weather, style_prompt)
+    if scene_cache.ttl_remaining(key) is not None:
+        return False
+    if ttl is None:
+        ttl = weather_ttl_remaining(latitude, longitude)
+    scene_cache.set(key, template_scene(weather, location), ttl=ttl)
+    return True
+
+
+# Runs generations that may outlive the request that started them. Each
+# holds one of as many slots as there are threads, so none ever queue.
+_fallback_executor = ThreadPoolExecutor(
+    max_workers=AGENT_POOL_SIZE, thread_name_prefix="weather-art-fallback"
+)
+_fallback_slots = threading.BoundedSemaphore(AGENT_POOL_SIZE)
+
+
+def _submit_detached(fn: Callable[[], dict]) -> Future | None:
+    """Run ``fn`` on the fallback executor, or return None if every thread is busy."""
+    if not _fallback_slots.acquire(blocking=False):
+        return None
+    future = _fallback_executor.submit(fn)
+    future.add_done_callback(lambda _: _fallback_slots.release())
+    return future
+
+
+def _generate_or_fallback(
+    flight_key: tuple,
+    generate: Callable[[], dict],
+    weather: dict,
+    location: str,
+    fallback_after: float,
+) -> dict:
+    """Return the scene if it is generated within ``fallback_after`` seconds, else a template scene.
+
+    Only the request that starts a generation submits it to the fallback
+    executor; requests joining it wait on its future with their own timeout.
+    A generation that cannot get a thread is not started, and the template
+    is served straight away.
+    """
+    progress = _progress.get()
+    detached = threading.Event()
+
+    def report_until_detached(stage: str, **data) -> None:
+        # Once the caller has its fallback, a late generation must not report to it.
+        if not detached.is_set():
+            progress(stage, **data)
+
+    context = contextvars.copy_context()
+    context.run(_progress.set, report_until_detached if progress is not None else None)
+    future = scene_flight.submit(flight_key, lambda: _submit_detached(lambda: context.run(generate)))
+    if future is None:
+        _report("fallback", reason="busy")
+        return template_scene(weather, location)
+    try:
+        return copy.deepcopy(future.result(timeout=fallback_after))
+    except Exception as e:
+        detached.set()
+        reason = "timeout" if isinstance(e, TimeoutError) else str(e)
+        _report("fallback", reason=reason)
+        return template_scene(weather, location)
+
+
+def _generate_with_tools(
+    location: str,
+    latitude: float,
+    longitude: float,
+    style_prompt: str,
+) -> dict:
+    user_message = (
+        f"Create a weather art scene for {location} "
+        f"(latitude: {latitude}, longitude: {longitude})."
+    )
     if style_prompt:
         user_message += f" Style: {style_prompt}"
 
-    result = agent(user_message)
-    response_text = str(result)
+    with scene_agent_pool.lease() as agent:
+        result = agent(user_message)
+    return _parse_scene(str(result))
 
-    raw = extract_json_from_response(response_text)
-    validated = SceneResponse.model_validate(raw)
-    return validated.model_dump()
\ No newline at end of file
+
+def _generate_direct(
+    location: str,
+    latitude: float,
+    longitude: float,
+    weather: dict,
+    style_prompt: str,
+    pool: AgentPool = direct_agent_pool,
+) -> dict:
+    user_message = (
+        f"Create a weather art scene for {location} "
+        f"(latitude: {latitude}, longitude: {longitude}).\n"
+        f"Current weather: {json.dumps(weather)}"
+    )
+    if style_prompt:
+        user_message += f"\nStyle: {style_prompt}"
+
+    with pool.lease() as agent:
+        result = _call_streaming(agent, user_message)
+        for _ in range(DIRECT_MAX_ATTEMPTS - 1):
+            _report("validating")
+            try:
+                return _parse_scene(str(result))
+            except Exception as e:
+                request_deadline = current_deadline()
+                if request_deadline is not None and request_deadline.remaining() < DIRECT_RETRY_MIN_SECONDS:
+                    raise
+                result = agent(
+                    f"Validation failed: {e}. Return the corrected scene JSON only."
+                )
+    _report("validating")
+    return _parse_scene(str(result))
+
+
+def _call_streaming(agent: Agent, message: str):
+    """Call ``agent``, reporting each scene part as soon as it has streamed in and validated."""
+    if _progress.get() is None:
+        return agent(message)
+
+    parser = SceneStreamParser()
+
+    def on_event(**event) -> None:
+        if "data" in event:
+            for part in parser.feed(event["data"]):
+                _report(part.pop("event"), **part)
+
+    # The agent is leased exclusively, so swapping its handler for this call is safe.
+    previous = agent.callback_handler
+    agent.callback_handler = on_event
+    try:
+        return agent(message)
+    finally:
+        agent.callback_handler = previous
@@ -0,0 +1,96 @@
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from strands import Agent
+from strands.telemetry.metrics import EventLoopMetrics
+
+from weather_art.deadline import clamp_timeout
+
+
+class AgentPool:
+    """Bounded, process-wide pool of warm Strands agents.
+
+    Agents are built lazily by ``factory`` up to ``max_size`` and handed out one
+    caller at a time. Every lease starts with an empty conversation. An agent
+    is discarded instead of returned when the call that used it raised, or once
+    it has served ``max_uses`` leases (0 means no limit).
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Agent],
+        max_size: int,
+        max_uses: int = 0,
+        acquire_timeout: float | None = None,
+    ):
+        self._factory = factory
+        self.max_size = max_size
+        self._max_uses = max_uses
+        self._acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle: list[tuple[Agent, int]] = []
+        self._created = 0
+        self._discarded = 0
+        self._leased = 0
+
+    @contextmanager
+    def lease(self) -> Iterator[Agent]:
+        """Borrow an agent with a cleared message history.
+
+        Raises TimeoutError if no agent frees up within ``acquire_timeout``,
+        or before the current request deadline.
+        """
+        if not self._slots.acquire(timeout=clamp_timeout(self._acquire_timeout)):
+            raise TimeoutError("Timed out waiting for a free agent")
+        with self._lock:
+            self._leased += 1
+        try:
+            agent, uses = self._checkout()
+            healthy = False
+            try:
+                yield agent
+                healthy = True
+            finally:
+                self._checkin(agent, uses + 1, healthy)
+        finally:
+            with self._lock:
+                self._leased -= 1
+            self._slots.release()
+
+    def _checkout(self) -> tuple[Agent, int]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        agent = self._factory()
+        with self._lock:
+            self._created += 1
+        return agent, 0
+
+    def _checkin(self, agent: Agent, uses: int, healthy: bool) -> None:
+        agent.messages.clear()
+        agent.event_loop_metrics = EventLoopMetrics()
+        with self._lock:
+            if healthy and (self._max_uses <= 0 or uses < self._max_uses):
+                self._idle.append((agent, uses))
+            else:
+                self._discarded += 1
+
+    def in_use(self) -> int:
+        """Number of agents currently leased out."""
+        with self._lock:
+            return self._leased
+
+    def clear(self) -> None:
+        """Drop all idle agents so the next lease builds a fresh one."""
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "created": self._created,
+                "discarded": self._discarded,
+            }
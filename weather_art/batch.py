@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from weather_art.agent import generate_scene
+from weather_art.cache import quantize_coords
+from weather_art.config import BATCH_MAX_CONCURRENCY, WEATHER_CACHE_GRID_DEG
+from weather_art.deadline import Deadline
+from weather_art.geocoding import geocode_city
+from weather_art.scene_cache import normalize_style_prompt
+from weather_art.weather import get_current_weather_batch
+
+
+def generate_scenes_batch(
+    locations: list[dict],
+    style_prompt: str = "",
+    mode: str | None = None,
+    max_workers: int | None = None,
+    fallback_after: float | None = None,
+    deadline: float | None = None,
+) -> list[dict]:
+    """Generate scenes for many locations with bounded concurrency.
+
+    Each item takes the generate_scene arguments ``location``, ``latitude``,
+    ``longitude`` and optionally its own ``style_prompt``. Names without
+    coordinates are geocoded first, weather for every distinct grid cell is
+    fetched in bulk, and items that land on the same cell with the same style
+    share one generation. Geocoding and generations run on up to
+    ``max_workers`` threads (BATCH_MAX_CONCURRENCY by default).
+
+    ``fallback_after`` is passed to every generation. ``deadline`` bounds the
+    whole batch: each generation gets the time left of it when it starts, so
+    items still waiting for a thread do not get a fresh budget.
+
+    Returns one dict per input item, in order, holding either ``scene`` or
+    ``error`` alongside the resolved ``location``/``latitude``/``longitude``.
+    """
+    resolved = [
+        {
+            "location": item.get("location") or "Unknown",
+            "latitude": item.get("latitude"),
+            "longitude": item.get("longitude"),
+            "style_prompt": str(item.get("style_prompt", style_prompt) or ""),
+        }
+        for item in locations
+    ]
+
+    batch_deadline = Deadline(deadline) if deadline is not None else None
+    workers = max(1, min(max_workers or BATCH_MAX_CONCURRENCY, len(resolved) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        to_geocode = [e for e in resolved if e["latitude"] is None or e["longitude"] is None]
+        for entry, outcome in zip(to_geocode, pool.map(_try_geocode, to_geocode)):
+            if isinstance(outcome, Exception):
+                entry["error"] = str(outcome)
+            else:
+                entry["latitude"] = outcome["latitude"]
+                entry["longitude"] = outcome["longitude"]
+
+        unique: dict[tuple, dict] = {}
+        for entry in resolved:
+            if "error" in entry:
+                continue
+            cell = quantize_coords(entry["latitude"], entry["longitude"], WEATHER_CACHE_GRID_DEG)
+            entry["key"] = (cell, normalize_style_prompt(entry["style_prompt"]))
+            unique.setdefault(entry["key"], entry)
+
+        if unique:
+            try:
+                get_current_weather_batch(
+                    [(entry["latitude"], entry["longitude"]) for entry in unique.values()]
+                )
+            except Exception:
+                # The bulk fetch only warms the weather cache; each generation
+                # fetches its own weather, and reports any error, if this fails.
+                pass
+
+        def generate(entry: dict) -> dict:
+            return generate_scene(
+                location=entry["location"],
+                latitude=entry["latitude"],
+                longitude=entry["longitude"],
+                style_prompt=entry["style_prompt"],
+                mode=mode,
+                fallback_after=fallback_after,
+                deadline=batch_deadline.remaining() if batch_deadline is not None else None,
+            )
+
+        futures = {key: pool.submit(generate, entry) for key, entry in unique.items()}
+
+    results = []
+    for entry in resolved:
+        result = {
+            "location": entry["location"],
+            "latitude": entry["latitude"],
+            "longitude": entry["longitude"],
+        }
+        if "error" in entry:
+            result["error"] = entry["error"]
+        else:
+            try:
+                result["scene"] = futures[entry["key"]].result()
+            except Exception as e:
+                result["error"] = str(e)
+        results.append(result)
+    return results
+
+
+def _try_geocode(entry: dict) -> dict | Exception:
+    try:
+        return geocode_city(entry["location"])
+    except Exception as e:
+        return e
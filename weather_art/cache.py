@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+def quantize_coords(lat: float, lon: float, grid_deg: float) -> tuple[float, float]:
+    """Snap coordinates to the centre-aligned grid cell of size ``grid_deg`` degrees."""
+    if grid_deg <= 0:
+        return (lat, lon)
+    return (
+        round(round(lat / grid_deg) * grid_deg, 6),
+        round(round(lon / grid_deg) * grid_deg, 6),
+    )
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    Holds at most ``max_entries`` items, evicting the least recently used one
+    when full. A ``ttl`` of 0 or less disables the cache entirely.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for ``key``, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def ttl_remaining(self, key: Hashable) -> float | None:
+        """Seconds until ``key`` expires, or None if it is not cached. Not counted as a lookup."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            remaining = entry[0] - self._clock()
+            return remaining if remaining > 0 else None
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def refresh(self, key: Hashable, ttl: float | None = None) -> bool:
+        """Restart the expiry of a live entry for ``key``, like set() with its current value.
+
+        Not counted as a lookup. Returns False if ``key`` is not cached.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock() or ttl <= 0:
+                return False
+            self._entries[key] = (self._clock() + ttl, entry[1])
+            return True
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
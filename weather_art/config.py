@@ -9,3 +9,76 @@ OPEN_METEO_GEOCODING_URL = os.environ.get(
 OPEN_METEO_FORECAST_URL = os.environ.get(
     "OPEN_METEO_FORECAST_URL", "https://api.open-meteo.com/v1/forecast"
 )
+
+AGENT_POOL_SIZE = int(os.environ.get("AGENT_POOL_SIZE", "4"))
+AGENT_POOL_MAX_USES = int(os.environ.get("AGENT_POOL_MAX_USES", "50"))
+AGENT_POOL_ACQUIRE_TIMEOUT = float(os.environ.get("AGENT_POOL_ACQUIRE_TIMEOUT", "120"))
+
+WEATHER_CACHE_TTL_SECONDS = float(os.environ.get("WEATHER_CACHE_TTL_SECONDS", "900"))
+WEATHER_CACHE_MAX_ENTRIES = int(os.environ.get("WEATHER_CACHE_MAX_ENTRIES", "1024"))
+WEATHER_CACHE_GRID_DEG = float(os.environ.get("WEATHER_CACHE_GRID_DEG", "0.05"))
+# Hours of hourly forecast fetched (and cached per grid cell) in one upstream call.
+FORECAST_HOURS = int(os.environ.get("FORECAST_HOURS", "24"))
+FORECAST_CACHE_TTL_SECONDS = float(os.environ.get("FORECAST_CACHE_TTL_SECONDS", "1800"))
+
+GEOCODE_CACHE_PATH = os.environ.get("GEOCODE_CACHE_PATH", "geocode_cache.sqlite3")
+GEOCODE_NEGATIVE_TTL_SECONDS = float(os.environ.get("GEOCODE_NEGATIVE_TTL_SECONDS", "86400"))
+
+# "agent" (tool loop), "direct" (weather in the prompt) or "structured" (direct, schema-constrained output).
+SCENE_GENERATION_MODE = os.environ.get("SCENE_GENERATION_MODE", "agent")
+SCENE_FORMAT_COMPACT = os.environ.get("SCENE_FORMAT_COMPACT", "false").lower() in ("1", "true", "yes")
+# Serve a procedural template scene if the model has not finished after this many seconds; 0 disables.
+SCENE_FALLBACK_AFTER_SECONDS = float(os.environ.get("SCENE_FALLBACK_AFTER_SECONDS", "0"))
+# Default end-to-end time budget for one generation request; 0 means unbounded.
+REQUEST_DEADLINE_SECONDS = float(os.environ.get("REQUEST_DEADLINE_SECONDS", "0"))
+
+# Per-stage timing histograms served at /metrics.
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+# Add a Server-Timing header with the stage timings of each API response.
+SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "false").lower() in ("1", "true", "yes")
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "4"))
+JOB_MAX_PENDING = int(os.environ.get("JOB_MAX_PENDING", "32"))
+JOB_RESULT_TTL_SECONDS = float(os.environ.get("JOB_RESULT_TTL_SECONDS", "600"))
+
+SCENE_CACHE_TTL_SECONDS = float(
+    os.environ.get("SCENE_CACHE_TTL_SECONDS", str(WEATHER_CACHE_TTL_SECONDS))
+)
+SCENE_CACHE_MAX_ENTRIES = int(os.environ.get("SCENE_CACHE_MAX_ENTRIES", "512"))
+# Generated scenes kept addressable by id for /api/scene/<id>.png, and their rendered PNGs.
+SCENE_STORE_TTL_SECONDS = float(os.environ.get("SCENE_STORE_TTL_SECONDS", "86400"))
+SCENE_STORE_MAX_ENTRIES = int(os.environ.get("SCENE_STORE_MAX_ENTRIES", "2048"))
+SCENE_IMAGE_CACHE_MAX_ENTRIES = int(os.environ.get("SCENE_IMAGE_CACHE_MAX_ENTRIES", "256"))
+
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "10"))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_FACTOR = float(os.environ.get("HTTP_BACKOFF_FACTOR", "0.3"))
+HTTP_BACKOFF_JITTER = float(os.environ.get("HTTP_BACKOFF_JITTER", "0.2"))
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "16"))
+HTTP_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("HTTP_CIRCUIT_FAILURE_THRESHOLD", "5"))
+HTTP_CIRCUIT_RESET_SECONDS = float(os.environ.get("HTTP_CIRCUIT_RESET_SECONDS", "30"))
+
+OPEN_METEO_BATCH_SIZE = int(os.environ.get("OPEN_METEO_BATCH_SIZE", "100"))
+WEATHER_BATCH_MAX_LOCATIONS = int(os.environ.get("WEATHER_BATCH_MAX_LOCATIONS", "500"))
+
+BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", str(AGENT_POOL_SIZE)))
+GENERATE_BATCH_MAX_LOCATIONS = int(os.environ.get("GENERATE_BATCH_MAX_LOCATIONS", "100"))
+
+# Time-lapse sequences: hours covered by default and how long each frame is shown.
+TIMELAPSE_DEFAULT_HOURS = int(os.environ.get("TIMELAPSE_DEFAULT_HOURS", "12"))
+TIMELAPSE_FRAME_MS = int(os.environ.get("TIMELAPSE_FRAME_MS", "1500"))
+
+# Refresh-ahead: keep weather and scenes of the most requested places warm in the background.
+PREWARM_ENABLED = os.environ.get("PREWARM_ENABLED", "false").lower() in ("1", "true", "yes")
+PREWARM_TOP_N = int(os.environ.get("PREWARM_TOP_N", "10"))
+# Comma-separated city names kept warm regardless of traffic.
+PREWARM_ALWAYS_WARM_CITIES = [
+    city.strip() for city in os.environ.get("PREWARM_ALWAYS_WARM_CITIES", "").split(",") if city.strip()
+]
+PREWARM_INTERVAL_SECONDS = float(os.environ.get("PREWARM_INTERVAL_SECONDS", "60"))
+# Refresh entries that expire within this many seconds.
+PREWARM_LEAD_SECONDS = float(os.environ.get("PREWARM_LEAD_SECONDS", "120"))
+PREWARM_MAX_CONCURRENCY = int(os.environ.get("PREWARM_MAX_CONCURRENCY", "1"))
+# Request counts halve over this many seconds, so popularity follows recent traffic.
+PREWARM_HALF_LIFE_SECONDS = float(os.environ.get("PREWARM_HALF_LIFE_SECONDS", "3600"))
@@ -0,0 +1,67 @@
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request's time budget runs out before work could start."""
+
+
+class Deadline:
+    """A point in time by which a request must have produced its result."""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(self.expires_at - self._clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+# Deadline of the request running in this context.
+_deadline: ContextVar[Deadline | None] = ContextVar("_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[Deadline | None]:
+    """Run the block under a deadline ``seconds`` from now.
+
+    An enclosing deadline that expires sooner stays in force. ``seconds`` of
+    None leaves the current deadline, if any, unchanged.
+    """
+    outer = _deadline.get()
+    if seconds is None:
+        yield outer
+        return
+    deadline = Deadline(seconds)
+    if outer is not None and outer.expires_at <= deadline.expires_at:
+        deadline = outer
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def clamp_timeout(timeout: float | None) -> float | None:
+    """Shrink ``timeout`` to the time left before the current deadline.
+
+    Returns ``timeout`` unchanged outside a deadline. Raises DeadlineExceeded
+    if the deadline has already passed.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return timeout
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return remaining if timeout is None else min(timeout, remaining)
@@ -0,0 +1,77 @@
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class GenerationAttempt:
+    """Model turns and validated answers of one scene generation."""
+
+    __slots__ = ("model_turns", "answers", "invalid_answers")
+
+    def __init__(self):
+        self.model_turns = 0
+        self.answers = 0
+        self.invalid_answers = 0
+
+
+# Attempt of the generation running in this context.
+_attempt: ContextVar[GenerationAttempt | None] = ContextVar("_attempt", default=None)
+
+
+def current_attempt() -> GenerationAttempt | None:
+    return _attempt.get()
+
+
+@contextmanager
+def attempt_scope() -> Iterator[GenerationAttempt]:
+    """Count the model turns and answers of the generation run in the block."""
+    attempt = GenerationAttempt()
+    token = _attempt.set(attempt)
+    try:
+        yield attempt
+    finally:
+        _attempt.reset(token)
+
+
+class GenerationStats:
+    """Per-mode scene counts, model turns and validation failures.
+
+    Lets the generation modes be compared on how often the model's answers
+    fail validation and how many model turns a scene costs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modes: dict[str, dict[str, int]] = {}
+
+    def record(self, mode: str, attempt: GenerationAttempt, succeeded: bool) -> None:
+        with self._lock:
+            totals = self._modes.setdefault(
+                mode, {"scenes": 0, "failed": 0, "model_turns": 0, "answers": 0, "invalid_answers": 0}
+            )
+            totals["scenes" if succeeded else "failed"] += 1
+            totals["model_turns"] += attempt.model_turns
+            totals["answers"] += attempt.answers
+            totals["invalid_answers"] += attempt.invalid_answers
+
+    def reset(self) -> None:
+        with self._lock:
+            self._modes.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            result = {}
+            for mode, totals in sorted(self._modes.items()):
+                generations = totals["scenes"] + totals["failed"]
+                result[mode] = {
+                    **totals,
+                    "mean_model_turns": totals["model_turns"] / generations if generations else 0.0,
+                    "validation_failure_rate": (
+                        totals["invalid_answers"] / totals["answers"] if totals["answers"] else 0.0
+                    ),
+                }
+            return result
+
+
+generation_stats = GenerationStats()
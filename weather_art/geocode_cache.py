@@ -0,0 +1,109 @@
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections.abc import Callable
+
+NOT_FOUND = object()
+
+
+def normalize_city_name(name: str) -> str:
+    """Fold case, whitespace and diacritics so "  São  Paulo" matches "sao paulo"."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+class GeocodeCache:
+    """SQLite-backed geocoding cache mirrored in an in-memory index.
+
+    Every row is loaded when the cache is opened, so lookups never touch disk;
+    writes go to both the index and the database. Found cities never expire.
+    Cities the API could not find are remembered for ``negative_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        negative_ttl: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            "key TEXT PRIMARY KEY, result TEXT, expires_at REAL)"
+        )
+        self._db.commit()
+        self._index: dict[str, tuple[dict | None, float | None]] = {}
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        now = self._clock()
+        rows = self._db.execute("SELECT key, result, expires_at FROM geocode")
+        for key, result, expires_at in rows:
+            if expires_at is not None and expires_at <= now:
+                continue
+            self._index[key] = (json.loads(result) if result else None, expires_at)
+
+    def get(self, city_name: str) -> dict | object | None:
+        """Return the cached result, NOT_FOUND for a remembered miss, or None if unknown."""
+        key = normalize_city_name(city_name)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None:
+                result, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    if result is None:
+                        self._negative_hits += 1
+                        return NOT_FOUND
+                    self._hits += 1
+                    return dict(result)
+                del self._index[key]
+            self._misses += 1
+            return None
+
+    def set(self, city_name: str, result: dict) -> None:
+        self._store(normalize_city_name(city_name), dict(result), None)
+
+    def set_not_found(self, city_name: str) -> None:
+        if self.negative_ttl <= 0:
+            return
+        expires_at = self._clock() + self.negative_ttl
+        self._store(normalize_city_name(city_name), None, expires_at)
+
+    def _store(self, key: str, result: dict | None, expires_at: float | None) -> None:
+        with self._lock:
+            self._index[key] = (result, expires_at)
+            self._db.execute(
+                "INSERT OR REPLACE INTO geocode (key, result, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result) if result is not None else None, expires_at),
+            )
+            self._db.commit()
+
+    def clear(self) -> None:
+        """Delete every entry, on disk and in memory, and reset the counters."""
+        with self._lock:
+            self._index.clear()
+            self._db.execute("DELETE FROM geocode")
+            self._db.commit()
+            self._hits = self._negative_hits = self._misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._index),
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+            }
@@ -1,30 +1,71 @@
-import requests
+import threading
 
-from weather_art.config import OPEN_METEO_GEOCODING_URL
+from weather_art.config import (
+    GEOCODE_CACHE_PATH,
+    GEOCODE_NEGATIVE_TTL_SECONDS,
+    OPEN_METEO_GEOCODING_URL,
+)
+from weather_art.geocode_cache import NOT_FOUND, GeocodeCache, normalize_city_name
+from weather_art.http_client import http_get
+from weather_art.singleflight import SingleFlight
+from weather_art.tracing import traced
 
+_cache: GeocodeCache | None = None
+_cache_lock = threading.Lock()
+geocode_flight = SingleFlight()
 
+
+def get_geocode_cache() -> GeocodeCache:
+    """Open (and warm-load) the persistent geocoding cache on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = GeocodeCache(
+                GEOCODE_CACHE_PATH, negative_ttl=GEOCODE_NEGATIVE_TTL_SECONDS
+            )
+        return _cache
+
+
+@traced("geocode")
 def geocode_city(city_name: str) -> dict:
     """Look up a city via Open-Meteo Geocoding API.
 
+    Answers from the persistent geocoding cache when the normalized name has
+    been seen before, including remembered misses. Concurrent lookups of the
+    same normalized name wait on a single request.
+
     Returns dict with keys: name, latitude, longitude, country, timezone.
     Raises ValueError if the city is not found.
     """
-    response = requests.get(
+    cache = get_geocode_cache()
+    cached = cache.get(city_name)
+    if cached is NOT_FOUND:
+        raise ValueError(f"City not found: {city_name}")
+    if cached is not None:
+        return cached
+    key = normalize_city_name(city_name)
+    return dict(geocode_flight.do(key, lambda: _fetch_city(city_name, cache)))
+
+
+def _fetch_city(city_name: str, cache: GeocodeCache) -> dict:
+    response = http_get(
         OPEN_METEO_GEOCODING_URL,
         params={"name": city_name, "count": 1, "language": "en", "format": "json"},
-        timeout=10,
     )
     response.raise_for_status()
     data = response.json()
 
     if "results" not in data or len(data["results"]) == 0:
+        cache.set_not_found(city_name)
         raise ValueError(f"City not found: {city_name}")
 
     result = data["results"][0]
-    return {
+    geocoded = {
         "name": result["name"],
         "latitude": result["latitude"],
         "longitude": result["longitude"],
         "country": result.get("country", ""),
         "timezone": result.get("timezone", ""),
-    }
\ No newline at end of file
+    }
+    cache.set(city_name, geocoded)
+    return geocoded
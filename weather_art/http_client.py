@@ -0,0 +1,181 @@
+import threading
+import time
+from collections.abc import Callable
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from weather_art.config import (
+    HTTP_BACKOFF_FACTOR,
+    HTTP_BACKOFF_JITTER,
+    HTTP_CIRCUIT_FAILURE_THRESHOLD,
+    HTTP_CIRCUIT_RESET_SECONDS,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_MAXSIZE,
+    HTTP_READ_TIMEOUT,
+)
+from weather_art.deadline import clamp_timeout
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without contacting a host whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream host.
+
+    Opens after ``failure_threshold`` failed calls in a row. Once
+    ``reset_timeout`` seconds have passed a single trial call is let through;
+    its outcome closes the circuit or opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+def build_session(
+    max_retries: int,
+    backoff_factor: float,
+    backoff_jitter: float,
+    pool_maxsize: int,
+) -> requests.Session:
+    """Create a keep-alive session that retries GETs on connection errors, 429 and 5xx."""
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class HttpClient:
+    """Shared, thread-safe GET client with pooling, retries and per-host circuit breaking."""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        connect_timeout: float,
+        read_timeout: float,
+        failure_threshold: int,
+        reset_timeout: float,
+    ):
+        self.session = session
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout
+                )
+            return breaker
+
+    def get(self, url: str, params: dict | None = None) -> requests.Response:
+        """GET ``url``; the caller is responsible for ``raise_for_status``.
+
+        Timeouts are shrunk to fit the current request deadline. Raises
+        DeadlineExceeded if it has already passed, CircuitOpenError if the
+        host's breaker is open, or the underlying requests exception once
+        retries are exhausted.
+        """
+        timeout = (clamp_timeout(self.connect_timeout), clamp_timeout(self.read_timeout))
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}, not calling upstream")
+
+        try:
+            response = self.session.get(url, params=params, timeout=timeout)
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+
+        if response.status_code in RETRY_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def reset(self) -> None:
+        """Forget all circuit breaker state."""
+        with self._lock:
+            self._breakers.clear()
+
+
+http_client = HttpClient(
+    build_session(
+        max_retries=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        backoff_jitter=HTTP_BACKOFF_JITTER,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+    ),
+    connect_timeout=HTTP_CONNECT_TIMEOUT,
+    read_timeout=HTTP_READ_TIMEOUT,
+    failure_threshold=HTTP_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=HTTP_CIRCUIT_RESET_SECONDS,
+)
+
+
+def http_get(url: str, params: dict | None = None) -> requests.Response:
+    return http_client.get(url, params=params)
@@ -0,0 +1,144 @@
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from weather_art.config import JOB_MAX_PENDING, JOB_RESULT_TTL_SECONDS, JOB_WORKERS
+
+Progress = Callable[..., None]
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+class QueueFullError(RuntimeError):
+    """Raised when too many jobs are already queued or running."""
+
+
+class Job:
+    """A background generation with its progress event log and outcome."""
+
+    def __init__(self, job_id: str, created_at: float):
+        self.id = job_id
+        self.status = "queued"
+        self.result: dict | None = None
+        self.error: str | None = None
+        self.created_at = created_at
+        self.finished_at: float | None = None
+        self._events: list[dict] = []
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def emit(self, stage: str, **data) -> None:
+        """Append a progress event and wake any event-stream readers."""
+        with self._cond:
+            self._events.append({"stage": stage, **data})
+            self._cond.notify_all()
+
+    def transition(self, status: str, stage: str, **data) -> None:
+        """Change status and record the matching event atomically."""
+        with self._cond:
+            self.status = status
+            self._events.append({"stage": stage, **data})
+            self._cond.notify_all()
+
+    def events_since(self, index: int, timeout: float | None = None) -> list[dict]:
+        """Return events after ``index``, waiting up to ``timeout`` for new ones."""
+        with self._cond:
+            if len(self._events) <= index and not self.finished:
+                self._cond.wait(timeout)
+            return self._events[index:]
+
+    def to_dict(self) -> dict:
+        with self._cond:
+            data = {
+                "job_id": self.id,
+                "status": self.status,
+                "events": [event["stage"] for event in self._events],
+            }
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class JobManager:
+    """Run jobs on a bounded executor and keep their results until they expire.
+
+    At most ``max_pending`` jobs may be queued or running at once; finished
+    jobs are forgotten ``result_ttl`` seconds after completion.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        result_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="weather-art-job"
+        )
+        self._lock = threading.Lock()
+        self._jobs: dict[str, Job] = {}
+
+    def submit(self, fn: Callable[[Progress], dict]) -> Job:
+        """Queue ``fn(progress)`` and return its Job immediately.
+
+        Raises QueueFullError when ``max_pending`` jobs are already in flight.
+        """
+        with self._lock:
+            self._purge_expired()
+            pending = sum(1 for job in self._jobs.values() if not job.finished)
+            if pending >= self.max_pending:
+                raise QueueFullError("Too many generation jobs in progress, try again later")
+            job = Job(uuid.uuid4().hex, self._clock())
+            self._jobs[job.id] = job
+        job.emit("queued")
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def _run(self, job: Job, fn: Callable[[Progress], dict]) -> None:
+        job.transition("running", "running")
+        try:
+            job.result = fn(job.emit)
+        except Exception as e:
+            job.error = str(e)
+            job.finished_at = self._clock()
+            job.transition("failed", "failed", error=job.error)
+        else:
+            job.finished_at = self._clock()
+            job.transition("succeeded", "completed", result=job.result)
+
+    def _purge_expired(self) -> None:
+        now = self._clock()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at + self.result_ttl <= now
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+job_manager = JobManager(
+    max_workers=JOB_WORKERS,
+    max_pending=JOB_MAX_PENDING,
+    result_ttl=JOB_RESULT_TTL_SECONDS,
+)
@@ -0,0 +1,120 @@
+import json
+import re
+
+_decoder = json.JSONDecoder()
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+# A "{" opening an object rather than prose: followed by a quoted key or "}".
+_OBJECT_START = re.compile(r"""\{\s*["'}]""")
+
+
+def extract_json_from_response(text: str) -> dict:
+    """Extract the outermost JSON object from a model response.
+
+    Prose or markdown fences around the object are ignored. An object starts
+    at a "{" followed by a key or "}", so braces in prose are skipped; if the
+    object found there cannot be recovered, the search resumes after its end,
+    never inside it. Well-formed JSON is decoded directly; otherwise the
+    object is rewritten in a single linear scan that turns single-quoted
+    strings into double-quoted ones, drops trailing commas and closes brackets
+    and strings left open by a truncated response.
+
+    Raises json.JSONDecodeError if no object can be recovered.
+    """
+    match = _OBJECT_START.search(text)
+    if match is None:
+        raise json.JSONDecodeError("No JSON object found", text, 0)
+    try:
+        return _decoder.raw_decode(text, match.start())[0]
+    except json.JSONDecodeError:
+        pass
+
+    # Only the first candidate is decoded strictly: a decode error locates
+    # itself from the start of ``text``, which would make many candidates
+    # quadratic. The lenient pass also tells where each candidate ends.
+    error = None
+    while match is not None:
+        normalized, end = _normalize(text, match.start())
+        try:
+            return json.loads(normalized)
+        except json.JSONDecodeError as exc:
+            error = error or exc
+        match = _OBJECT_START.search(text, end)
+    raise error
+
+
+def _normalize(text: str, start: int) -> tuple[str, int]:
+    """Rewrite the lenient JSON object starting at ``start`` as strict JSON.
+
+    Returns the rewritten object and the index just past its end in ``text``.
+    """
+    end = len(text)
+    out: list[str] = []
+    stack: list[str] = []
+    quote = None  # quote character of the string being copied, if any
+    escaped = False
+    last = ""  # last significant character outside strings
+    pending_comma = None  # index in ``out`` of a comma that may turn out to be trailing
+    key_start = None  # index in ``out`` of an object key not yet followed by ":"
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if quote is not None:
+            if escaped:
+                escaped = False
+                # \' is not a valid JSON escape; inside a double-quoted string it is just '.
+                if char == "'":
+                    out[-1] = "'"
+                    continue
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+                char = '"'
+            elif char == '"':
+                char = '\\"'
+            elif char == "\n":
+                char = "\\n"
+            out.append(char)
+            continue
+
+        if char.isspace():
+            out.append(char)
+            continue
+        if char in "\"'":
+            if stack and stack[-1] == "}" and last in "{,":
+                key_start = len(out)
+            quote = char
+            char = '"'
+        elif char in "{[":
+            stack.append(_CLOSERS[char])
+        elif char in "}]":
+            if pending_comma is not None:
+                out[pending_comma] = ""
+            key_start = None
+            if stack:
+                stack.pop()
+            if not stack:
+                out.append(char)
+                end = i + 1
+                break
+        elif char == ":":
+            key_start = None
+        out.append(char)
+        last = char
+        pending_comma = len(out) - 1 if char == "," else None
+
+    # Truncated mid-object: drop a dangling key or comma, complete a dangling value.
+    if key_start is not None:
+        del out[key_start:]
+    elif quote is not None:
+        if escaped:
+            out.pop()
+        out.append('"')
+    tail = "".join(out).rstrip()
+    if tail.endswith(","):
+        tail = tail[:-1]
+    elif tail.endswith(":"):
+        tail += "null"
+    return tail + "".join(reversed(stack)), end
@@ -0,0 +1,226 @@
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from weather_art.agent import agent_pool_for, generate_scene
+from weather_art.cache import quantize_coords
+from weather_art.config import (
+    PREWARM_ALWAYS_WARM_CITIES,
+    PREWARM_HALF_LIFE_SECONDS,
+    PREWARM_INTERVAL_SECONDS,
+    PREWARM_LEAD_SECONDS,
+    PREWARM_MAX_CONCURRENCY,
+    PREWARM_TOP_N,
+    SCENE_GENERATION_MODE,
+    WEATHER_CACHE_GRID_DEG,
+)
+from weather_art.geocoding import geocode_city
+from weather_art.scene_cache import normalize_style_prompt, scene_cache, scene_cache_key
+from weather_art.weather import refresh_current_weather, weather_ttl_remaining
+
+# Places tracked at most; the least requested half is forgotten when exceeded.
+MAX_TRACKED_PLACES = 1000
+
+
+class Prewarmer:
+    """Refresh the weather and scenes of popular places shortly before they expire.
+
+    record() counts live requests per place and style prompt, with counts
+    that halve every ``half_life`` seconds. Every ``interval`` seconds the
+    ``top_n`` places and the ``always_warm`` cities (without a style prompt)
+    are checked, and those whose cached weather expires within ``lead``
+    seconds, or is not cached, are refreshed on at most ``max_concurrency``
+    threads. A refresh refetches the weather, then extends the cached scene if
+    the new weather still draws the same one, or regenerates it otherwise.
+    Regeneration is skipped while every agent is busy with live requests.
+    """
+
+    def __init__(
+        self,
+        top_n: int,
+        always_warm: list[str],
+        interval: float,
+        lead: float,
+        max_concurrency: int,
+        half_life: float,
+        mode: str = SCENE_GENERATION_MODE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.top_n = top_n
+        self.always_warm = always_warm
+        self.interval = interval
+        self.lead = lead
+        self.max_concurrency = max_concurrency
+        self.half_life = half_life
+        self.mode = mode
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(max_concurrency, 1), thread_name_prefix="weather-art-prewarm"
+        )
+        self._lock = threading.Lock()
+        self._places: dict[tuple, dict] = {}
+        self._in_flight: set[tuple] = set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._counters = self._zero_counters()
+
+    @staticmethod
+    def _zero_counters() -> dict[str, int]:
+        return {
+            "weather_refreshes": 0,
+            "scenes_extended": 0,
+            "scenes_generated": 0,
+            "scenes_skipped": 0,
+            "failures": 0,
+        }
+
+    def _decayed(self, place: dict, now: float) -> float:
+        if self.half_life <= 0:
+            return place["score"]
+        return place["score"] * 0.5 ** ((now - place["updated"]) / self.half_life)
+
+    def record(
+        self,
+        location: str,
+        latitude: float | None = None,
+        longitude: float | None = None,
+        style_prompt: str = "",
+    ) -> None:
+        """Count one live request for a place."""
+        style = normalize_style_prompt(style_prompt)
+        if latitude is not None and longitude is not None:
+            key = (quantize_coords(latitude, longitude, WEATHER_CACHE_GRID_DEG), style)
+        else:
+            key = (location.casefold().strip(), style)
+        now = self._clock()
+        with self._lock:
+            place = self._places.get(key)
+            score = self._decayed(place, now) if place is not None else 0.0
+            self._places[key] = {
+                "location": location,
+                "latitude": latitude,
+                "longitude": longitude,
+                "style_prompt": style_prompt,
+                "score": score + 1,
+                "updated": now,
+            }
+            if len(self._places) > MAX_TRACKED_PLACES:
+                ranked = sorted(self._places, key=lambda k: self._decayed(self._places[k], now), reverse=True)
+                for stale in ranked[MAX_TRACKED_PLACES // 2:]:
+                    del self._places[stale]
+
+    def targets(self) -> list[dict]:
+        """The places to keep warm: the most requested first, then the always-warm cities."""
+        now = self._clock()
+        with self._lock:
+            ranked = sorted(self._places.values(), key=lambda p: self._decayed(p, now), reverse=True)
+        targets = [
+            {key: place[key] for key in ("location", "latitude", "longitude", "style_prompt")}
+            for place in ranked[:self.top_n]
+        ]
+        targets += [
+            {"location": city, "latitude": None, "longitude": None, "style_prompt": ""}
+            for city in self.always_warm
+        ]
+        return targets
+
+    def run_once(self) -> int:
+        """Start refreshes for the targets that are due; returns how many were started."""
+        started = 0
+        for target in self.targets():
+            latitude, longitude = target["latitude"], target["longitude"]
+            try:
+                if latitude is None or longitude is None:
+                    geocoded = geocode_city(target["location"])
+                    latitude, longitude = geocoded["latitude"], geocoded["longitude"]
+            except Exception:
+                self._count("failures")
+                continue
+            ttl = weather_ttl_remaining(latitude, longitude)
+            if ttl is not None and ttl > self.lead:
+                continue
+
+            key = (quantize_coords(latitude, longitude, WEATHER_CACHE_GRID_DEG),
+                   normalize_style_prompt(target["style_prompt"]))
+            with self._lock:
+                if len(self._in_flight) >= self.max_concurrency:
+                    break
+                if key in self._in_flight:
+                    continue
+                self._in_flight.add(key)
+            self._executor.submit(
+                self._refresh, key, target["location"], latitude, longitude, target["style_prompt"]
+            )
+            started += 1
+        return started
+
+    def _refresh(self, key: tuple, location: str, latitude: float, longitude: float, style_prompt: str) -> None:
+        try:
+            weather = refresh_current_weather(latitude, longitude)
+            self._count("weather_refreshes")
+            scene_key = scene_cache_key(latitude, longitude, weather, style_prompt)
+            pool = agent_pool_for(self.mode)
+            if scene_cache.refresh(scene_key, ttl=weather_ttl_remaining(latitude, longitude)):
+                self._count("scenes_extended")
+            elif pool.in_use() >= pool.max_size:
+                self._count("scenes_skipped")
+            else:
+                generate_scene(location, latitude, longitude, style_prompt, self.mode, fallback_after=0)
+                self._count("scenes_generated")
+        except Exception:
+            self._count("failures")
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def start(self) -> None:
+        """Run run_once() every ``interval`` seconds on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="weather-art-prewarm-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception:
+                self._count("failures")
+            if self._stop.wait(self.interval):
+                return
+
+    def reset(self) -> None:
+        with self._lock:
+            self._places.clear()
+            self._counters = self._zero_counters()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "tracked_places": len(self._places),
+                "in_flight": len(self._in_flight),
+                **self._counters,
+            }
+
+
+prewarmer = Prewarmer(
+    top_n=PREWARM_TOP_N,
+    always_warm=PREWARM_ALWAYS_WARM_CITIES,
+    interval=PREWARM_INTERVAL_SECONDS,
+    lead=PREWARM_LEAD_SECONDS,
+    max_concurrency=PREWARM_MAX_CONCURRENCY,
+    half_life=PREWARM_HALF_LIFE_SECONDS,
+)
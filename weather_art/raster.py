@@ -0,0 +1,331 @@
+import math
+import struct
+import zlib
+from collections.abc import Sequence
+
+import numpy as np
+
+from weather_art.scene_repair import normalize_color
+from weather_art.scene_schema import Scene
+
+# Rings the browser renderer stacks to draw a glow, largest and faintest first.
+GLOW_LAYERS = 10
+PNG_COMPRESSION_LEVEL = 6
+# Longest side of a rendered image in pixels, whatever the canvas size or requested width.
+SCENE_IMAGE_MAX_WIDTH = 1600
+
+# Element types the browser has to draw itself: particles move every frame and
+# text needs its font renderer. They separate a scene's static layers.
+LIVE_ELEMENT_TYPES = ("particle_system", "text")
+
+
+def parse_color(value: str | None, default: str = "#ffffff") -> tuple[np.ndarray, float]:
+    """Return ``value`` as an RGB array in 0..1 and its alpha, or ``default`` if unreadable."""
+    digits = (normalize_color(value) or default)[1:]
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    rgb = np.array([int(digits[i:i + 2], 16) for i in (0, 2, 4)], dtype=np.float32) / 255
+    alpha = int(digits[6:8], 16) / 255 if len(digits) == 8 else 1.0
+    return rgb, alpha
+
+
+def _coverage(distance: np.ndarray) -> np.ndarray:
+    """Anti-aliased coverage of pixels ``distance`` pixels outside a shape's edge."""
+    return np.clip(0.5 - distance, 0.0, 1.0)
+
+
+class _Raster:
+    """An RGB(A) float canvas drawn in scene coordinates scaled by ``scale``."""
+
+    def __init__(self, width: int, height: int, scale: float, transparent: bool = False):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.rgb = np.zeros((height, width, 3), dtype=np.float32)
+        self.alpha = np.zeros((height, width), dtype=np.float32) if transparent else None
+
+    def window(self, x0: float, y0: float, x1: float, y1: float, pad: float = 1.0):
+        """Pixel slices covering a scene-space box, with the pixel-center coordinates inside it.
+
+        Returns None if the box is off the canvas.
+        """
+        s = self.scale
+        c0 = max(int(math.floor(x0 * s - pad)), 0)
+        c1 = min(int(math.ceil(x1 * s + pad)), self.width)
+        r0 = max(int(math.floor(y0 * s - pad)), 0)
+        r1 = min(int(math.ceil(y1 * s + pad)), self.height)
+        if c0 >= c1 or r0 >= r1:
+            return None
+        xs = (np.arange(c0, c1, dtype=np.float32) + 0.5) / s
+        ys = (np.arange(r0, r1, dtype=np.float32) + 0.5) / s
+        return (slice(r0, r1), slice(c0, c1)), xs[None, :], ys[:, None]
+
+    def blend(self, region, coverage: np.ndarray, rgb: np.ndarray, alpha: float) -> None:
+        amount = coverage * alpha
+        if self.alpha is None:
+            target = self.rgb[region]
+            target += (rgb - target) * amount[..., None]
+            return
+        # Source-over onto a transparent canvas, keeping colors unpremultiplied.
+        below = self.alpha[region]
+        out = amount + below * (1 - amount)
+        safe = np.where(out > 0, out, 1)
+        target = self.rgb[region]
+        target[...] = (rgb * amount[..., None] + target * (below * (1 - amount))[..., None]) / safe[..., None]
+        self.alpha[region] = out
+
+    def blend_pixels(self, rows: np.ndarray, cols: np.ndarray, rgb: np.ndarray, alpha: float) -> None:
+        """Blend ``rgb`` into the listed pixels only, each pixel at most once."""
+        if self.alpha is None:
+            target = self.rgb[rows, cols]
+            self.rgb[rows, cols] = target + (rgb - target) * alpha
+            return
+        below = self.alpha[rows, cols]
+        out = alpha + below * (1 - alpha)
+        self.rgb[rows, cols] = (rgb * alpha + self.rgb[rows, cols] * (below * (1 - alpha))[:, None]) / out[:, None]
+        self.alpha[rows, cols] = out
+
+    def to_uint8(self) -> np.ndarray:
+        channels = [self.rgb] if self.alpha is None else [self.rgb, self.alpha[..., None]]
+        pixels = np.concatenate(channels, axis=2) if len(channels) > 1 else self.rgb
+        return (np.clip(pixels, 0, 1) * 255 + 0.5).astype(np.uint8)
+
+
+def _draw_background(raster: _Raster, background) -> None:
+    if background.type == "solid":
+        raster.rgb[...] = parse_color(background.color, "#000000")[0]
+    else:
+        # Like the browser renderer, only the first and last stops are used.
+        first = parse_color(background.colors[0], "#000000")[0]
+        last = parse_color(background.colors[-1], "#000000")[0]
+        if background.direction == "horizontal":
+            t = np.linspace(0, 1, raster.width, dtype=np.float32)[None, :, None]
+        else:
+            t = np.linspace(0, 1, raster.height, dtype=np.float32)[:, None, None]
+        raster.rgb[...] = first + (last - first) * t
+
+
+def _fill_and_stroke(raster: _Raster, region, distance: np.ndarray, element, opacity: float) -> None:
+    """Draw a shape given each pixel's signed distance, in pixels, from its edge."""
+    if element.fill:
+        rgb, alpha = parse_color(element.fill)
+        raster.blend(region, _coverage(distance), rgb, alpha * opacity)
+    if element.stroke:
+        rgb, alpha = parse_color(element.stroke)
+        half = element.stroke_weight * raster.scale / 2
+        raster.blend(region, _coverage(np.abs(distance) - half), rgb, alpha * opacity)
+
+
+def _stroke_pad(element) -> float:
+    return element.stroke_weight / 2 if element.stroke else 0.0
+
+
+def _draw_ellipse(raster: _Raster, el) -> None:
+    rx, ry = abs(el.width) / 2, abs(el.height) / 2
+    pad = _stroke_pad(el)
+    window = raster.window(el.x - rx - pad, el.y - ry - pad, el.x + rx + pad, el.y + ry + pad)
+    if window is None or rx == 0 or ry == 0:
+        return
+    region, xs, ys = window
+    q = np.sqrt(((xs - el.x) / rx) ** 2 + ((ys - el.y) / ry) ** 2)
+    _fill_and_stroke(raster, region, (q - 1) * min(rx, ry) * raster.scale, el, el.opacity)
+
+
+def _draw_rect(raster: _Raster, el) -> None:
+    pad = _stroke_pad(el)
+    x0, x1 = sorted((el.x, el.x + el.width))
+    y0, y1 = sorted((el.y, el.y + el.height))
+    window = raster.window(x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+    if window is None:
+        return
+    region, xs, ys = window
+    half_w, half_h = (x1 - x0) / 2, (y1 - y0) / 2
+    radius = min(max(el.corner_radius, 0.0), half_w, half_h)
+    qx = np.abs(xs - (x0 + half_w)) - half_w + radius
+    qy = np.abs(ys - (y0 + half_h)) - half_h + radius
+    outside = np.sqrt(np.maximum(qx, 0) ** 2 + np.maximum(qy, 0) ** 2)
+    distance = outside + np.minimum(np.maximum(qx, qy), 0) - radius
+    _fill_and_stroke(raster, region, distance * raster.scale, el, el.opacity)
+
+
+def _draw_line(raster: _Raster, el) -> None:
+    half = el.stroke_weight / 2
+    window = raster.window(
+        min(el.x1, el.x2) - half, min(el.y1, el.y2) - half, max(el.x1, el.x2) + half, max(el.y1, el.y2) + half
+    )
+    if window is None:
+        return
+    region, xs, ys = window
+    dx, dy = el.x2 - el.x1, el.y2 - el.y1
+    length_sq = dx * dx + dy * dy
+    if length_sq:
+        t = np.clip(((xs - el.x1) * dx + (ys - el.y1) * dy) / length_sq, 0, 1)
+    else:
+        t = np.zeros_like(xs + ys)
+    distance = np.hypot(xs - (el.x1 + t * dx), ys - (el.y1 + t * dy))
+    rgb, alpha = parse_color(el.stroke)
+    raster.blend(region, _coverage((distance - half) * raster.scale), rgb, alpha * el.opacity)
+
+
+def _glow_alphas(intensity: float) -> np.ndarray:
+    """Combined alpha of the stacked glow rings covering each ring band, outermost band last."""
+    # Ring i has radius i/GLOW_LAYERS of the glow's and alpha fading to 0 at the
+    # outermost ring; a pixel in band k lies inside rings k..GLOW_LAYERS.
+    combined = np.zeros(GLOW_LAYERS + 2, dtype=np.float32)
+    transmitted = 1.0
+    for band in range(GLOW_LAYERS, 0, -1):
+        transmitted *= 1 - intensity * (1 - band / GLOW_LAYERS)
+        combined[band] = 1 - transmitted
+    combined[0] = combined[1]
+    return combined
+
+
+def _draw_glow(raster: _Raster, el) -> None:
+    radius = abs(el.radius)
+    window = raster.window(el.x - radius, el.y - radius, el.x + radius, el.y + radius)
+    if window is None or radius == 0:
+        return
+    region, xs, ys = window
+    band = np.ceil(np.hypot(xs - el.x, ys - el.y) * GLOW_LAYERS / radius).astype(np.intp)
+    coverage = _glow_alphas(el.intensity or 0.5)[np.minimum(band, GLOW_LAYERS + 1)]
+    rgb, alpha = parse_color(el.color)
+    raster.blend(region, coverage, rgb, alpha)
+
+
+def particle_positions(el, index: int, width: float, height: float) -> tuple[np.ndarray, np.ndarray]:
+    """Deterministic particle positions for a snapshot of particle system ``index``."""
+    rng = np.random.default_rng([index, el.count, len(el.preset)])
+    return rng.random(el.count) * width, rng.random(el.count) * height
+
+
+def _draw_particles(raster: _Raster, el, index: int, scene_width: float, scene_height: float) -> None:
+    xs, ys = particle_positions(el, index, scene_width, scene_height)
+    s = raster.scale
+    size = el.size * s
+    if el.particle_shape == "line":
+        angle = math.radians(el.angle)
+        steps = max(int(math.ceil(2 * size)), 1)
+        t = np.linspace(0, 2 * el.size, steps + 1, dtype=np.float32)
+        px = ((xs[:, None] + math.cos(angle) * t) * s).astype(np.intp)
+        py = ((ys[:, None] + math.sin(angle) * t) * s).astype(np.intp)
+    else:
+        extent = max(int(math.ceil(size)), 1)
+        if el.particle_shape == "rect":
+            oy, ox = np.mgrid[0:extent, 0:extent]
+        else:
+            r = max(size / 2, 0.5)
+            span = int(math.ceil(r))
+            oy, ox = np.mgrid[-span:span + 1, -span:span + 1]
+            inside = (ox + 0.5) ** 2 + (oy + 0.5) ** 2 <= r * r + 0.5
+            ox, oy = ox[inside], oy[inside]
+        px = (xs * s).astype(np.intp)[:, None] + ox.ravel()[None, :]
+        py = (ys * s).astype(np.intp)[:, None] + oy.ravel()[None, :]
+    px, py = px.ravel(), py.ravel()
+    visible = (px >= 0) & (px < raster.width) & (py >= 0) & (py < raster.height)
+    # Overlapping particles are drawn once, so only the touched pixels are blended.
+    flat = np.unique(py[visible] * raster.width + px[visible])
+    rgb, alpha = parse_color(el.color)
+    raster.blend_pixels(flat // raster.width, flat % raster.width, rgb, alpha * el.opacity)
+
+
+def _raster_for(scene: Scene, width: int | None, transparent: bool = False) -> _Raster:
+    width = min(width or scene.canvas.width, SCENE_IMAGE_MAX_WIDTH)
+    scale = min(width / scene.canvas.width, SCENE_IMAGE_MAX_WIDTH / scene.canvas.height)
+    width = max(int(round(scene.canvas.width * scale)), 1)
+    height = max(int(round(scene.canvas.height * scale)), 1)
+    return _Raster(width, height, scale, transparent)
+
+
+def render_scene(scene: Scene, width: int | None = None) -> np.ndarray:
+    """Rasterize a validated scene into an RGB uint8 array of the given pixel width.
+
+    ``width`` defaults to the canvas width; either way neither side of the
+    image exceeds SCENE_IMAGE_MAX_WIDTH pixels.
+
+    Shapes are drawn as vectorized signed-distance masks over their bounding
+    boxes, following the browser renderer's drawing order and styling.
+    Particle systems are drawn as a deterministic snapshot. Text is left out,
+    since there is no font rasterizer without extra dependencies.
+    """
+    raster = _raster_for(scene, width)
+    _draw_background(raster, scene.background)
+    for index, element in enumerate(scene.elements):
+        _draw_element(raster, element, index, scene)
+    return raster.to_uint8()
+
+
+def _draw_element(raster: _Raster, element, index: int, scene: Scene) -> None:
+    if element.type == "ellipse":
+        _draw_ellipse(raster, element)
+    elif element.type == "rect":
+        _draw_rect(raster, element)
+    elif element.type == "line":
+        _draw_line(raster, element)
+    elif element.type == "glow":
+        _draw_glow(raster, element)
+    elif element.type == "particle_system":
+        _draw_particles(raster, element, index, scene.canvas.width, scene.canvas.height)
+
+
+def encode_png(pixels: np.ndarray, level: int = PNG_COMPRESSION_LEVEL) -> bytes:
+    """Encode an RGB or RGBA uint8 array as a PNG."""
+    height, width, channels = pixels.shape
+    color_type = {3: 2, 4: 6}[channels]
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)  # leading 0: no row filter
+    rows[:, 1:] = pixels.reshape(height, -1)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows.tobytes(), level))
+        + chunk(b"IEND", b"")
+    )
+
+
+def render_png(scene: Scene, width: int | None = None) -> bytes:
+    return encode_png(render_scene(scene, width))
+
+
+def static_layers(element_types: Sequence[str]) -> list[tuple[int, int]]:
+    """The ``(start, end)`` element ranges of a scene's static layers, bottom first.
+
+    The first layer is the background plus the static elements before the
+    first live one, possibly none. Each later layer is a run of static
+    elements between live ones. Drawing the layers and the live elements in
+    element order reproduces the scene.
+    """
+    layers: list[tuple[int, int]] = []
+    start = 0
+    for index, element_type in enumerate(element_types):
+        if element_type in LIVE_ELEMENT_TYPES:
+            if index > start or not layers:
+                layers.append((start, index))
+            start = index + 1
+    if len(element_types) > start or not layers:
+        layers.append((start, len(element_types)))
+    return layers
+
+
+def render_layer(scene: Scene, layer: int, width: int | None = None) -> np.ndarray:
+    """Rasterize one of the scene's static_layers().
+
+    The first layer is opaque RGB; later ones are RGBA overlays, transparent
+    wherever their elements do not reach. Raises IndexError for an unknown layer.
+    """
+    if layer < 0:
+        raise IndexError(layer)
+    start, end = static_layers([element.type for element in scene.elements])[layer]
+    raster = _raster_for(scene, width, transparent=layer > 0)
+    if layer == 0:
+        _draw_background(raster, scene.background)
+    for index in range(start, end):
+        _draw_element(raster, scene.elements[index], index, scene)
+    return raster.to_uint8()
+
+
+def render_layer_png(scene: Scene, layer: int, width: int | None = None) -> bytes:
+    return encode_png(render_layer(scene, layer, width))
@@ -1,42 +1,371 @@
-from flask import Blueprint, jsonify, render_template, request
+import json
 
-from weather_art.agent import generate_scene
-from weather_art.geocoding import geocode_city
+from flask import Blueprint, Response, g, jsonify, render_template, request, stream_with_context
+
+from weather_art.agent import GENERATION_MODES, generate_scene, scene_flight
+from weather_art.batch import generate_scenes_batch
+from weather_art.config import (
+    FORECAST_HOURS,
+    GENERATE_BATCH_MAX_LOCATIONS,
+    SERVER_TIMING_ENABLED,
+    TIMELAPSE_DEFAULT_HOURS,
+    TIMELAPSE_FRAME_MS,
+    WEATHER_BATCH_MAX_LOCATIONS,
+)
+from weather_art.deadline import DeadlineExceeded
+from weather_art.generation_stats import generation_stats
+from weather_art.geocoding import geocode_city, geocode_flight, get_geocode_cache
+from weather_art.jobs import QueueFullError, job_manager
+from weather_art.scene_cache import scene_cache
+from weather_art.scene_repair import repair_stats
+from weather_art.prewarm import prewarmer
+from weather_art.raster import SCENE_IMAGE_MAX_WIDTH, render_layer_png, render_png, static_layers
+from weather_art.scene_schema import PARTICLE_PRESETS, SceneResponse, compact_element, compact_scene
+from weather_art.scene_store import scene_image_cache, scene_store, store_scene
+from weather_art.timelapse import generate_timelapse
+from weather_art.tracing import finish_timings, server_timing_header, start_timings, tracer
+from weather_art.weather import (
+    forecast_cache,
+    forecast_flight,
+    get_current_weather_batch,
+    weather_cache,
+    weather_flight,
+)
 
 bp = Blueprint("weather_art", __name__)
 
+SSE_KEEPALIVE_SECONDS = 15
+
+PRESETS_MAX_AGE_SECONDS = 86400
+
+# Width bounds for rendered scene images; the height follows the canvas aspect ratio.
+SCENE_IMAGE_MIN_WIDTH = 16
+SCENE_IMAGE_MAX_AGE_SECONDS = 86400
+
+
+@bp.before_request
+def _start_server_timing():
+    if SERVER_TIMING_ENABLED:
+        g.timings_token = start_timings()
+
+
+@bp.after_request
+def _add_server_timing(response):
+    token = g.pop("timings_token", None)
+    if token is not None:
+        timings = finish_timings(token)
+        if timings:
+            response.headers["Server-Timing"] = server_timing_header(timings)
+    return response
+
 
 @bp.route("/")
 def index():
     return render_template("index.html")
 
 
-@bp.route("/api/generate", methods=["POST"])
-def api_generate():
-    data = request.get_json()
+def _is_seconds(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+def _generate_args(data: dict | None) -> tuple[dict | None, str | None]:
+    """Turn a generate request body into generate_scene kwargs, or an error message."""
     if not data:
-        return jsonify({"error": "Request body must be JSON"}), 400
+        return None, "Request body must be JSON"
 
     location = data.get("location", "").strip()
     latitude = data.get("latitude")
     longitude = data.get("longitude")
     style_prompt = data.get("style_prompt", "")
+    mode = data.get("mode")
+    fallback_after = data.get("fallback_after")
+    deadline = data.get("deadline")
 
     if not location and (latitude is None or longitude is None):
-        return jsonify({"error": "Provide a location name or latitude/longitude"}), 400
+        return None, "Provide a location name or latitude/longitude"
+    if not isinstance(style_prompt, str):
+        return None, "style_prompt must be a string"
+    if mode is not None and mode not in GENERATION_MODES:
+        return None, f"mode must be one of {', '.join(GENERATION_MODES)}"
+    if fallback_after is not None and not _is_seconds(fallback_after):
+        return None, "fallback_after must be a non-negative number of seconds"
+    if deadline is not None and not (_is_seconds(deadline) and deadline > 0):
+        return None, "deadline must be a positive number of seconds"
+
+    return {
+        "location": location or "Unknown",
+        "latitude": latitude,
+        "longitude": longitude,
+        "style_prompt": style_prompt,
+        "mode": mode,
+        "fallback_after": fallback_after,
+        "deadline": deadline,
+    }, None
+
+
+def _record_request(kwargs: dict) -> None:
+    """Count a generation request towards the places the prewarmer keeps warm."""
+    prewarmer.record(kwargs["location"], kwargs["latitude"], kwargs["longitude"], kwargs["style_prompt"])
+
+
+def _scene_payload(scene: dict, compact: bool, bake: bool = False) -> dict:
+    """Response body for a generated scene: the scene plus the id its image is served under.
+
+    With ``bake`` the body also lists the scene's static layers: images of the
+    background and of each run of static elements, covering elements ``start``
+    to ``end``, that the browser draws in place of those elements so only
+    particles and text are drawn per frame. ``scene`` is already validated,
+    so the layers are worked out from its element types alone.
+    """
+    key = store_scene(scene)
+    payload = {**(compact_scene(scene) if compact else scene), "scene_id": key}
+    if bake:
+        layers = static_layers([element["type"] for element in scene["scene"]["elements"]])
+        payload["static_layers"] = [
+            {"url": f"/api/scene/{key}/layers/{index}.png", "start": start, "end": end}
+            for index, (start, end) in enumerate(layers)
+        ]
+    return payload
+
+
+def _generation_job(kwargs: dict, compact: bool, bake: bool = False):
+    """Job function running generate_scene, optionally in the compact wire format."""
+    def run(progress):
+        if not compact:
+            return _scene_payload(generate_scene(**kwargs, progress=progress), compact, bake)
+
+        def emit(stage, **data):
+            if stage == "element":
+                data["element"] = compact_element(data["element"])
+            progress(stage, **data)
+
+        return _scene_payload(generate_scene(**kwargs, progress=emit), compact, bake)
+
+    return run
+
+
+@bp.route("/api/generate", methods=["POST"])
+def api_generate():
+    data = request.get_json(silent=True)
+    kwargs, error = _generate_args(data)
+    if error:
+        return jsonify({"error": error}), 400
+    _record_request(kwargs)
 
     try:
-        scene = generate_scene(
-            location=location or "Unknown",
-            latitude=latitude,
-            longitude=longitude,
-            style_prompt=style_prompt,
+        scene = generate_scene(**kwargs)
+        return jsonify(_scene_payload(scene, bool(data.get("compact")), bool(data.get("bake"))))
+    except DeadlineExceeded as e:
+        return jsonify({"error": str(e)}), 504
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/api/generate/batch", methods=["POST"])
+def api_generate_batch():
+    data = request.get_json(silent=True)
+    locations = data.get("locations") if isinstance(data, dict) else None
+    if not isinstance(locations, list) or not locations:
+        return jsonify({"error": "Provide a non-empty 'locations' list"}), 400
+    if len(locations) > GENERATE_BATCH_MAX_LOCATIONS:
+        return jsonify({"error": f"At most {GENERATE_BATCH_MAX_LOCATIONS} locations per request"}), 400
+
+    # The whole batch runs in one mode and under one fallback and deadline.
+    batch_args = {key: data.get(key) for key in ("mode", "fallback_after", "deadline")}
+    items = []
+    for index, location in enumerate(locations):
+        if isinstance(location, dict) and ("fallback_after" in location or "deadline" in location):
+            return jsonify({"error": f"locations[{index}]: fallback_after and deadline apply to the whole batch"}), 400
+        body = (
+            {"style_prompt": data.get("style_prompt", ""), **location, **batch_args}
+            if isinstance(location, dict) else None
         )
-        return jsonify(scene)
+        kwargs, error = _generate_args(body)
+        if error:
+            return jsonify({"error": f"locations[{index}]: {error}"}), 400
+        items.append(kwargs)
+    for item in items:
+        _record_request(item)
+
+    results = generate_scenes_batch(
+        [{key: item[key] for key in ("location", "latitude", "longitude", "style_prompt")} for item in items],
+        **batch_args,
+    )
+    for result in results:
+        if "scene" in result:
+            result["scene_id"] = store_scene(result["scene"])
+    return jsonify({"results": results})
+
+
+@bp.route("/api/timelapse", methods=["POST"])
+def api_timelapse():
+    """Scenes for the next ``hours`` forecast hours, derived from one generated scene."""
+    data = request.get_json(silent=True)
+    kwargs, error = _generate_args(data)
+    if error:
+        return jsonify({"error": error}), 400
+    _record_request(kwargs)
+    hours = data.get("hours", TIMELAPSE_DEFAULT_HOURS)
+    frame_ms = data.get("frame_ms", TIMELAPSE_FRAME_MS)
+    if not isinstance(hours, int) or isinstance(hours, bool) or not 1 <= hours <= FORECAST_HOURS:
+        return jsonify({"error": f"hours must be an integer between 1 and {FORECAST_HOURS}"}), 400
+    if not isinstance(frame_ms, int) or isinstance(frame_ms, bool) or frame_ms <= 0:
+        return jsonify({"error": "frame_ms must be a positive integer"}), 400
+
+    try:
+        return jsonify(generate_timelapse(**kwargs, hours=hours, frame_ms=frame_ms))
+    except DeadlineExceeded as e:
+        return jsonify({"error": str(e)}), 504
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@bp.route("/api/jobs", methods=["POST"])
+def api_create_job():
+    data = request.get_json(silent=True)
+    kwargs, error = _generate_args(data)
+    if error:
+        return jsonify({"error": error}), 400
+    _record_request(kwargs)
+
+    try:
+        job = job_manager.submit(_generation_job(kwargs, bool(data.get("compact")), bool(data.get("bake"))))
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.id}",
+        "events_url": f"/api/jobs/{job.id}/events",
+    }), 202
+
+
+@bp.route("/api/jobs/<job_id>")
+def api_job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job not found: {job_id}"}), 404
+    return jsonify(job.to_dict())
+
+
+def _job_event_stream(job, format_event, keepalive: str):
+    """Yield formatted job events as they arrive until the job finishes."""
+    sent = 0
+    while True:
+        events = job.events_since(sent, timeout=SSE_KEEPALIVE_SECONDS)
+        if not events:
+            if job.finished:
+                return
+            yield keepalive
+            continue
+        for event in events:
+            yield format_event(event)
+        sent += len(events)
+
+
+@bp.route("/api/jobs/<job_id>/events")
+def api_job_events(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job not found: {job_id}"}), 404
+
+    return Response(
+        stream_with_context(_job_event_stream(
+            job,
+            lambda event: f"event: {event['stage']}\ndata: {json.dumps(event)}\n\n",
+            keepalive=": keepalive\n\n",
+        )),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@bp.route("/api/generate/stream", methods=["POST"])
+def api_generate_stream():
+    """Generate a scene, streaming progress and scene parts as NDJSON.
+
+    Each line is one event as recorded on the job: progress stages, then
+    "background", "element" and "metadata" parts as they validate (direct
+    mode), and finally "completed" with the full scene or "failed". The
+    completed scene is authoritative; blank lines are keepalives.
+    """
+    data = request.get_json(silent=True)
+    kwargs, error = _generate_args(data)
+    if error:
+        return jsonify({"error": error}), 400
+    _record_request(kwargs)
+
+    try:
+        job = job_manager.submit(_generation_job(kwargs, bool(data.get("compact")), bool(data.get("bake"))))
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+
+    return Response(
+        stream_with_context(_job_event_stream(
+            job, lambda event: json.dumps(event) + "\n", keepalive="\n"
+        )),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@bp.route("/api/particle-presets")
+def api_particle_presets():
+    """Preset defaults that compact particle systems (``"compact": true``) omit."""
+    response = jsonify(PARTICLE_PRESETS)
+    response.cache_control.public = True
+    response.cache_control.max_age = PRESETS_MAX_AGE_SECONDS
+    return response
+
+
+def _scene_image(scene_id: str, variant: str, render):
+    """A stored scene rendered by ``render(scene, width)``, cached per variant and width.
+
+    ``size`` sets the image width in pixels; it defaults to the canvas width.
+    """
+    size = request.args.get("size")
+    if size is not None and (
+        not size.isdigit() or not SCENE_IMAGE_MIN_WIDTH <= int(size) <= SCENE_IMAGE_MAX_WIDTH
+    ):
+        return jsonify({
+            "error": f"size must be a width between {SCENE_IMAGE_MIN_WIDTH} and {SCENE_IMAGE_MAX_WIDTH}",
+        }), 400
+
+    width = int(size) if size else None
+    key = (scene_id, variant, width)
+    png = scene_image_cache.get(key)
+    if png is None:
+        scene = scene_store.get(scene_id)
+        if scene is None:
+            return jsonify({"error": f"Unknown scene: {scene_id}"}), 404
+        try:
+            png = render(SceneResponse.model_validate(scene).scene, width)
+        except IndexError:
+            return jsonify({"error": f"Unknown image for scene {scene_id}: {variant}"}), 404
+        scene_image_cache.set(key, png)
+
+    response = Response(png, mimetype="image/png")
+    response.cache_control.public = True
+    response.cache_control.max_age = SCENE_IMAGE_MAX_AGE_SECONDS
+    response.set_etag(f"{scene_id}-{variant}-{width or 'canvas'}")
+    return response.make_conditional(request)
+
+
+@bp.route("/api/scene/<scene_id>.png")
+def api_scene_image(scene_id):
+    """A generated scene rendered server-side, with particles as a still snapshot."""
+    return _scene_image(scene_id, "png", render_png)
+
+
+@bp.route("/api/scene/<scene_id>/layers/<int:layer>.png")
+def api_scene_layer(scene_id, layer):
+    """One static layer of a scene, baked for the browser; layers after the first are transparent."""
+    return _scene_image(
+        scene_id, f"layer-{layer}", lambda scene, width: render_layer_png(scene, layer, width)
+    )
+
+
 @bp.route("/api/geocode")
 def api_geocode():
     city = request.args.get("city", "").strip()
@@ -49,4 +378,58 @@ def api_geocode():
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/api/weather/batch", methods=["POST"])
+def api_weather_batch():
+    data = request.get_json(silent=True)
+    locations = data.get("locations") if isinstance(data, dict) else None
+    if not isinstance(locations, list) or not locations:
+        return jsonify({"error": "Provide a non-empty 'locations' list"}), 400
+    if len(locations) > WEATHER_BATCH_MAX_LOCATIONS:
+        return jsonify({"error": f"At most {WEATHER_BATCH_MAX_LOCATIONS} locations per request"}), 400
+
+    try:
+        coords = [(float(loc["latitude"]), float(loc["longitude"])) for loc in locations]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Each location needs numeric latitude and longitude"}), 400
+
+    try:
+        weather = get_current_weather_batch(coords)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({
+        "results": [
+            {"latitude": lat, "longitude": lon, "weather": result}
+            for (lat, lon), result in zip(coords, weather)
+        ]
+    })
+
+
+@bp.route("/api/cache/stats")
+def api_cache_stats():
+    return jsonify({
+        "weather": weather_cache.stats(),
+        "forecast": forecast_cache.stats(),
+        "geocode": get_geocode_cache().stats(),
+        "scene": scene_cache.stats(),
+        "coalescing": {
+            "weather": weather_flight.stats(),
+            "forecast": forecast_flight.stats(),
+            "geocode": geocode_flight.stats(),
+            "scene": scene_flight.stats(),
+        },
+        "prewarm": prewarmer.stats(),
+    })
+
+
+@bp.route("/api/generation/stats")
+def api_generation_stats():
+    return jsonify({"repair": repair_stats.stats(), "modes": generation_stats.stats()})
+
+
+@bp.route("/metrics")
+def metrics():
+    return Response(tracer.render_prometheus(), mimetype="text/plain; version=0.0.4")
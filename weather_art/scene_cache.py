@@ -0,0 +1,36 @@
+from weather_art.cache import TTLCache, quantize_coords
+from weather_art.config import (
+    SCENE_CACHE_MAX_ENTRIES,
+    SCENE_CACHE_TTL_SECONDS,
+    WEATHER_CACHE_GRID_DEG,
+)
+
+TEMPERATURE_BUCKET_C = 5.0
+WIND_BUCKET_KMH = 10.0
+
+scene_cache = TTLCache(
+    max_entries=SCENE_CACHE_MAX_ENTRIES,
+    ttl=SCENE_CACHE_TTL_SECONDS,
+)
+
+
+def weather_signature(weather: dict) -> tuple:
+    """Reduce a get_current_weather dict to the conditions that change the art."""
+    return (
+        weather["weather_code"],
+        bool(weather["is_day"]),
+        int(weather["temperature_c"] // TEMPERATURE_BUCKET_C),
+        int(weather["wind_speed_kmh"] // WIND_BUCKET_KMH),
+    )
+
+
+def normalize_style_prompt(style_prompt: str) -> str:
+    return " ".join(style_prompt.casefold().split())
+
+
+def scene_cache_key(lat: float, lon: float, weather: dict, style_prompt: str) -> tuple:
+    return (
+        quantize_coords(lat, lon, WEATHER_CACHE_GRID_DEG),
+        weather_signature(weather),
+        normalize_style_prompt(style_prompt),
+    )
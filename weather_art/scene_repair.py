@@ -0,0 +1,329 @@
+import copy
+import re
+import threading
+import types
+import typing
+from typing import Any, Literal
+
+from annotated_types import Ge, Le
+from pydantic import BaseModel
+
+from weather_art.scene_schema import Element, PARTICLE_PRESETS
+
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 600
+MAX_ELEMENTS = 30
+
+# Element class for each "type" discriminator value.
+ELEMENT_MODELS: dict[str, type[BaseModel]] = {
+    model.model_fields["type"].default: model
+    for model in typing.get_args(typing.get_args(Element)[0])
+}
+
+UNIT_FIELDS = {"opacity", "intensity"}
+X_FIELDS = {"x", "x1", "x2"}
+Y_FIELDS = {"y", "y1", "y2"}
+SIZE_FIELDS = {"width", "height", "radius", "size", "stroke_weight", "corner_radius"}
+COLOR_FIELDS = {"fill", "stroke", "color"}
+
+NAMED_COLORS = {
+    "black": "#000000",
+    "white": "#ffffff",
+    "gray": "#808080",
+    "grey": "#808080",
+    "silver": "#c0c0c0",
+    "red": "#ff0000",
+    "orange": "#ffa500",
+    "yellow": "#ffff00",
+    "gold": "#ffd700",
+    "green": "#008000",
+    "blue": "#0000ff",
+    "navy": "#000080",
+    "skyblue": "#87ceeb",
+    "purple": "#800080",
+    "pink": "#ffc0cb",
+    "brown": "#a52a2a",
+}
+
+_HEX_COLOR = re.compile(r"#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+_RGB_COLOR = re.compile(r"rgba?\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*(?:,\s*[\d.]+\s*)?\)")
+
+
+def normalize_color(value: Any) -> str | None:
+    """Return ``value`` as a "#rrggbb" style hex color, or None if it cannot be read as one."""
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    match = _HEX_COLOR.fullmatch(text)
+    if match:
+        return "#" + match.group(1)
+    match = _RGB_COLOR.fullmatch(text.lower())
+    if match:
+        return "#" + "".join(f"{min(int(c), 255):02x}" for c in match.groups())
+    return NAMED_COLORS.get(text.lower().replace(" ", ""))
+
+
+def infer_element_type(element: dict) -> str | None:
+    """Guess an element's type from the fields it carries."""
+    if "preset" in element:
+        return "particle_system"
+    if "x1" in element or "y1" in element:
+        return "line"
+    if "content" in element:
+        return "text"
+    if "radius" in element or "intensity" in element:
+        return "glow"
+    if "corner_radius" in element:
+        return "rect"
+    if "width" in element or "height" in element:
+        return "ellipse"
+    return None
+
+
+def _to_number(value: Any) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _kind(annotation: Any) -> str | None:
+    """Classify a field annotation as "int", "float", "str" or "literal"."""
+    args = typing.get_args(annotation)
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        kinds = [_kind(arg) for arg in args if arg is not type(None)]
+        return kinds[0] if kinds else None
+    if typing.get_origin(annotation) is Literal:
+        return "literal"
+    return {int: "int", float: "float", str: "str"}.get(annotation)
+
+
+def _literal_values(annotation: Any) -> tuple:
+    if typing.get_origin(annotation) is Literal:
+        return typing.get_args(annotation)
+    for arg in typing.get_args(annotation):
+        if typing.get_origin(arg) is Literal:
+            return typing.get_args(arg)
+    return ()
+
+
+def _bounds(name: str, field) -> tuple[float | None, float | None]:
+    low = high = None
+    for constraint in field.metadata:
+        if isinstance(constraint, Ge):
+            low = constraint.ge
+        elif isinstance(constraint, Le):
+            high = constraint.le
+    if name in UNIT_FIELDS:
+        low, high = 0.0, 1.0
+    elif name in X_FIELDS:
+        low, high = 0.0, float(CANVAS_WIDTH)
+    elif name in Y_FIELDS:
+        low, high = 0.0, float(CANVAS_HEIGHT)
+    elif name in SIZE_FIELDS:
+        low = 0.0
+    return low, high
+
+
+def _repair_element(element: Any, path: str, changes: list[str]) -> dict | None:
+    if not isinstance(element, dict):
+        changes.append(f"{path}: dropped, not an object")
+        return None
+
+    element = dict(element)
+    kind = element.get("type")
+    if kind not in ELEMENT_MODELS:
+        inferred = infer_element_type(element)
+        if inferred is None:
+            changes.append(f"{path}: dropped, unknown type {kind!r}")
+            return None
+        changes.append(f"{path}.type: inferred {inferred!r}")
+        element["type"] = kind = inferred
+
+    if kind == "particle_system" and element.get("preset") not in PARTICLE_PRESETS:
+        changes.append(f"{path}: dropped, unknown preset {element.get('preset')!r}")
+        return None
+
+    for name, field in ELEMENT_MODELS[kind].model_fields.items():
+        if name == "type":
+            continue
+        where = f"{path}.{name}"
+        if element.get(name) is None:
+            if field.is_required():
+                changes.append(f"{path}: dropped, missing {name}")
+                return None
+            element.pop(name, None)
+            continue
+
+        value = element[name]
+        field_kind = _kind(field.annotation)
+        if name in COLOR_FIELDS:
+            color = normalize_color(value)
+            if color is None:
+                changes.append(f"{where}: replaced unreadable color {value!r} with the default")
+                element.pop(name)
+            elif color != value:
+                changes.append(f"{where}: normalized {value!r} to {color!r}")
+                element[name] = color
+        elif field_kind in ("int", "float"):
+            number = _to_number(value)
+            if number is None:
+                if field.is_required():
+                    changes.append(f"{path}: dropped, {name} is not a number")
+                    return None
+                changes.append(f"{where}: removed non-numeric {value!r}")
+                element.pop(name)
+                continue
+            low, high = _bounds(name, field)
+            clamped = number
+            if low is not None:
+                clamped = max(clamped, low)
+            if high is not None:
+                clamped = min(clamped, high)
+            if field_kind == "int":
+                clamped = int(round(clamped))
+            if clamped != number:
+                changes.append(f"{where}: clamped {value!r} to {clamped!r}")
+            elif not isinstance(value, (int, float)):
+                changes.append(f"{where}: coerced {value!r} to a number")
+            element[name] = clamped
+        elif field_kind == "str" and not isinstance(value, str):
+            changes.append(f"{where}: coerced {value!r} to a string")
+            element[name] = str(value)
+        elif field_kind == "literal" and value not in _literal_values(field.annotation):
+            changes.append(f"{where}: removed invalid value {value!r}")
+            element.pop(name)
+    return element
+
+
+def _repair_background(background: Any, changes: list[str]) -> dict:
+    default = {"type": "solid", "color": "#000000"}
+    if not isinstance(background, dict):
+        changes.append("background: replaced with solid black")
+        return default
+
+    kind = background.get("type")
+    if kind not in ("solid", "gradient"):
+        kind = "gradient" if "colors" in background else "solid"
+        changes.append(f"background.type: inferred {kind!r}")
+
+    if kind == "gradient":
+        raw_colors = background.get("colors")
+        raw_colors = raw_colors if isinstance(raw_colors, list) else []
+        colors = [c for c in (normalize_color(c) for c in raw_colors) if c is not None]
+        if colors != raw_colors:
+            changes.append("background.colors: normalized or dropped unreadable colors")
+        if len(colors) >= 2:
+            direction = background.get("direction", "vertical")
+            if direction not in ("vertical", "horizontal"):
+                changes.append(f"background.direction: replaced {direction!r} with 'vertical'")
+                direction = "vertical"
+            return {"type": "gradient", "colors": colors, "direction": direction}
+        changes.append("background: gradient needs two colors, using a solid background")
+        return {"type": "solid", "color": colors[0] if colors else "#000000"}
+
+    color = normalize_color(background.get("color"))
+    if color is None:
+        changes.append(f"background.color: replaced {background.get('color')!r} with '#000000'")
+        color = "#000000"
+    elif color != background.get("color"):
+        changes.append(f"background.color: normalized {background.get('color')!r} to {color!r}")
+    return {"type": "solid", "color": color}
+
+
+def repair_scene(raw: Any) -> tuple[dict, list[str]]:
+    """Deterministically fix a scene that failed validation.
+
+    Clamps numbers into range and onto the canvas, coerces strings to numbers,
+    normalizes colors to hex, infers missing element types, fills defaults and
+    drops elements that cannot be salvaged or exceed MAX_ELEMENTS. ``raw`` is
+    not modified.
+
+    Returns the repaired ``{"scene": ...}`` dict and a description of every
+    change; the result still needs validating. Raises ValueError if nothing
+    usable is left.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("Scene JSON must be an object")
+    changes: list[str] = []
+    scene = raw.get("scene")
+    if not isinstance(scene, dict):
+        if "elements" not in raw and "background" not in raw:
+            raise ValueError("Scene JSON has no scene, background or elements")
+        changes.append("scene: wrapped top-level scene fields")
+        scene = raw
+    scene = copy.deepcopy(scene)
+
+    canvas = scene.get("canvas")
+    if canvas != {"width": CANVAS_WIDTH, "height": CANVAS_HEIGHT}:
+        if canvas is not None:
+            changes.append(f"canvas: reset to {CANVAS_WIDTH}x{CANVAS_HEIGHT}")
+        scene["canvas"] = {"width": CANVAS_WIDTH, "height": CANVAS_HEIGHT}
+
+    scene["background"] = _repair_background(scene.get("background"), changes)
+
+    raw_elements = scene.get("elements", [])
+    if not isinstance(raw_elements, list):
+        changes.append("elements: replaced non-list with an empty list")
+        raw_elements = []
+    elements = []
+    for index, element in enumerate(raw_elements):
+        repaired = _repair_element(element, f"elements[{index}]", changes)
+        if repaired is not None:
+            elements.append(repaired)
+    if raw_elements and not elements:
+        raise ValueError("No element could be repaired")
+    if len(elements) > MAX_ELEMENTS:
+        changes.append(f"elements: dropped {len(elements) - MAX_ELEMENTS} beyond the first {MAX_ELEMENTS}")
+        elements = elements[:MAX_ELEMENTS]
+    scene["elements"] = elements
+
+    metadata = scene.get("metadata", {})
+    if not isinstance(metadata, dict):
+        changes.append("metadata: replaced with empty metadata")
+        metadata = {}
+    scene["metadata"] = {
+        key: str(metadata[key]) for key in ("title", "weather_summary") if metadata.get(key) is not None
+    }
+    return {"scene": scene}, changes
+
+
+class RepairStats:
+    """Counts local repair attempts; each successful repair spares the model a correction turn."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._attempts = 0
+        self._repaired = 0
+        self._changes = 0
+
+    def record(self, changes: list[str] | None) -> None:
+        """Record one attempt: the changes made if it succeeded, or None if it failed."""
+        with self._lock:
+            self._attempts += 1
+            if changes is not None:
+                self._repaired += 1
+                self._changes += len(changes)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._attempts = self._repaired = self._changes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "attempts": self._attempts,
+                "repaired": self._repaired,
+                "failed": self._attempts - self._repaired,
+                "changes": self._changes,
+                "model_turns_saved": self._repaired,
+            }
+
+
+repair_stats = RepairStats()
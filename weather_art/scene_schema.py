@@ -134,16 +134,13 @@ class ParticleSystem(BaseModel):
     drift: float | None = None
     size: float | None = None
 
-    @model_validator(mode="before")
-    @classmethod
-    def apply_preset(cls, values: dict) -> dict:
-        preset_name = values.get("preset")
-        if preset_name and preset_name in PARTICLE_PRESETS:
-            defaults = PARTICLE_PRESETS[preset_name]
-            for key, default_val in defaults.items():
-                if values.get(key) is None:
-                    values[key] = default_val
-        return values
+    @model_validator(mode="after")
+    def apply_preset(self) -> ParticleSystem:
+        # Runs on the validated model, so the caller's dict is never copied or mutated.
+        for key, default_val in PARTICLE_PRESETS[self.preset].items():
+            if getattr(self, key) is None:
+                setattr(self, key, default_val)
+        return self
 
 
 class Glow(BaseModel):
@@ -164,8 +161,8 @@ Element = Annotated[
 # --- Scene structure ---
 
 class Canvas(BaseModel):
-    width: int = 800
-    height: int = 600
+    width: int = Field(default=800, gt=0)
+    height: int = Field(default=600, gt=0)
 
 
 class Metadata(BaseModel):
@@ -181,4 +178,28 @@ class Scene(BaseModel):
 
 
 class SceneResponse(BaseModel):
-    scene: Scene
\ No newline at end of file
+    scene: Scene
+
+
+# --- Compact wire format ---
+
+def compact_element(element: dict) -> dict:
+    """Return a particle_system element without the fields its preset already implies.
+
+    Other element types are returned unchanged. Clients expand compact particle
+    systems by merging the element over ``PARTICLE_PRESETS[element["preset"]]``.
+    """
+    defaults = PARTICLE_PRESETS.get(element.get("preset")) if element.get("type") == "particle_system" else None
+    if defaults is None:
+        return element
+    return {
+        key: value
+        for key, value in element.items()
+        if value is not None and (key not in defaults or defaults[key] != value)
+    }
+
+
+def compact_scene(scene: dict) -> dict:
+    """Return a copy of a ``{"scene": ...}`` dict with compacted particle systems."""
+    body = scene["scene"]
+    return {"scene": {**body, "elements": [compact_element(el) for el in body.get("elements", [])]}}
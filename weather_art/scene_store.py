@@ -0,0 +1,28 @@
+import hashlib
+import json
+
+from weather_art.cache import TTLCache
+from weather_art.config import (
+    SCENE_IMAGE_CACHE_MAX_ENTRIES,
+    SCENE_STORE_MAX_ENTRIES,
+    SCENE_STORE_TTL_SECONDS,
+)
+
+# Scenes by content id, so images and other derived resources can be fetched later.
+scene_store = TTLCache(max_entries=SCENE_STORE_MAX_ENTRIES, ttl=SCENE_STORE_TTL_SECONDS)
+
+# Rendered images by (scene id, variant); ids are content hashes, so entries never go stale.
+scene_image_cache = TTLCache(max_entries=SCENE_IMAGE_CACHE_MAX_ENTRIES, ttl=SCENE_STORE_TTL_SECONDS)
+
+
+def scene_id(scene: dict) -> str:
+    """Content hash of a scene dict, stable across key order."""
+    canonical = json.dumps(scene, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=12).hexdigest()
+
+
+def store_scene(scene: dict) -> str:
+    """Keep ``scene`` addressable by its id and return the id."""
+    key = scene_id(scene)
+    scene_store.set(key, scene)
+    return key
@@ -0,0 +1,117 @@
+import json
+
+from pydantic import TypeAdapter, ValidationError
+
+from weather_art.scene_schema import Background, Element, Metadata
+
+_background_adapter = TypeAdapter(Background)
+_element_adapter = TypeAdapter(Element)
+_metadata_adapter = TypeAdapter(Metadata)
+
+
+class _Frame:
+    """An open object or array: where it starts and the key it sits under in its parent."""
+
+    __slots__ = ("kind", "start", "key", "pending_key", "count")
+
+    def __init__(self, kind: str, start: int, key: str | int | None):
+        self.kind = kind
+        self.start = start
+        self.key = key
+        self.pending_key: str | None = None
+        self.count = 0
+
+
+class SceneStreamParser:
+    """Incrementally parse a model's scene JSON as it streams in.
+
+    ``feed`` consumes the next chunk of text and returns an event for every
+    part of the scene that has just been completed and validated:
+    ``{"event": "background", "background": {...}}``,
+    ``{"event": "element", "index": i, "element": {...}}`` and
+    ``{"event": "metadata", "metadata": {...}}``. Text before the first "{"
+    (prose, markdown fences) is ignored, as is anything after the root object
+    closes. Parts that fail validation are skipped; the caller still validates
+    the complete scene at the end.
+    """
+
+    def __init__(self):
+        self._buffer: list[str] = []
+        self._pos = 0
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string: str | None = None
+        self._started = False
+        self.done = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        events = []
+        for char in chunk:
+            if self.done:
+                break
+            if not self._started:
+                if char != "{":
+                    continue
+                self._started = True
+            self._buffer.append(char)
+            self._consume(char, events)
+            self._pos += 1
+        return events
+
+    def _consume(self, char: str, events: list[dict]) -> None:
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                text = "".join(self._buffer[self._string_start:self._pos + 1])
+                self._last_string = json.loads(text)
+            return
+
+        frame = self._stack[-1] if self._stack else None
+        if char == '"':
+            self._in_string = True
+            self._string_start = self._pos
+        elif char == ":" and frame is not None and frame.kind == "{":
+            frame.pending_key = self._last_string
+        elif char == "," and frame is not None and frame.kind == "[":
+            frame.count += 1
+        elif char in "{[":
+            key = None
+            if frame is not None:
+                key = frame.pending_key if frame.kind == "{" else frame.count
+            self._stack.append(_Frame(char, self._pos, key))
+        elif char in "}]":
+            if not self._stack:
+                return
+            closed = self._stack.pop()
+            path = [f.key for f in self._stack[1:]] + [closed.key]
+            if not self._stack:
+                self.done = True
+                return
+            self._emit(path, closed, events)
+
+    def _emit(self, path: list, frame: _Frame, events: list[dict]) -> None:
+        # Models usually wrap the scene as {"scene": {...}}, but accept a bare scene too.
+        if path and path[0] == "scene":
+            path = path[1:]
+        if len(path) == 1 and path[0] == "background":
+            adapter, event, name = _background_adapter, {"event": "background"}, "background"
+        elif len(path) == 1 and path[0] == "metadata":
+            adapter, event, name = _metadata_adapter, {"event": "metadata"}, "metadata"
+        elif len(path) == 2 and path[0] == "elements" and isinstance(path[1], int):
+            adapter, event, name = _element_adapter, {"event": "element", "index": path[1]}, "element"
+        else:
+            return
+
+        text = "".join(self._buffer[frame.start:self._pos + 1])
+        try:
+            value = adapter.validate_python(json.loads(text))
+        except (json.JSONDecodeError, ValidationError):
+            return
+        event[name] = adapter.dump_python(value)
+        events.append(event)
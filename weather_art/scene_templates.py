@@ -0,0 +1,182 @@
+from weather_art.scene_schema import SceneResponse
+
+# Background gradients per condition, as (day, night) color pairs.
+PALETTES: dict[str, tuple[list[str], list[str]]] = {
+    "clear": (["#87CEEB", "#4682B4"], ["#0a0a2e", "#1a1a3e"]),
+    "partly_cloudy": (["#9ecfe8", "#5b8db8"], ["#101030", "#25254a"]),
+    "overcast": (["#a9b0b8", "#6e7680"], ["#1c1e24", "#2c2f38"]),
+    "fog": (["#c8c8c0", "#9a9a94"], ["#2a2a2e", "#3c3c40"]),
+    "drizzle": (["#8e9aa6", "#5c6773"], ["#161a22", "#262c36"]),
+    "rain": (["#6f7b88", "#3f4a57"], ["#0e1118", "#1d232e"]),
+    "snow": (["#d6e2ee", "#9fb3c8"], ["#1b2433", "#2f3d52"]),
+    "thunderstorm": (["#4a4f5a", "#23262e"], ["#08090d", "#15171d"]),
+}
+
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 600
+GROUND_Y = 520
+MAX_CLOUDS = 6
+
+
+def weather_condition(weather_code: int) -> str:
+    """Collapse a WMO weather code into one of the PALETTES conditions."""
+    if weather_code <= 1:
+        return "clear"
+    if weather_code == 2:
+        return "partly_cloudy"
+    if weather_code == 3:
+        return "overcast"
+    if weather_code in (45, 48):
+        return "fog"
+    if 51 <= weather_code <= 57:
+        return "drizzle"
+    if 71 <= weather_code <= 77 or weather_code in (85, 86):
+        return "snow"
+    if weather_code >= 95:
+        return "thunderstorm"
+    return "rain"
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def sky_light_intensity(cloud_cover: float) -> float:
+    """Glow intensity of the sun or moon seen through ``cloud_cover`` percent cloud."""
+    return round(_clamp(0.8 - cloud_cover / 150, 0.2, 0.8), 2)
+
+
+def _sky_light(is_day: bool, cloud_cover: float) -> list[dict]:
+    if is_day:
+        color, fill, radius = "#FFD700", "#FFE066", 140
+    else:
+        color, fill, radius = "#E6E6FA", "#F5F5DC", 90
+    intensity = sky_light_intensity(cloud_cover)
+    return [
+        {"type": "glow", "x": 650, "y": 110, "radius": radius, "color": color, "intensity": intensity},
+        {"type": "ellipse", "x": 650, "y": 110, "width": 80, "height": 80, "fill": fill},
+    ]
+
+
+def _clouds(count: int, dark: bool, is_day: bool, cloud_cover: float) -> list[dict]:
+    if dark:
+        fill = "#5a5f6b" if is_day else "#2a2d36"
+    else:
+        fill = "#ffffff" if is_day else "#3a3a4a"
+    opacity = round(_clamp(0.5 + cloud_cover / 250, 0.5, 0.9), 2)
+    return [
+        {
+            "type": "ellipse",
+            "x": 90 + i * 125,
+            "y": 80 + (i % 3) * 40,
+            "width": 170 + (i % 2) * 40,
+            "height": 60 + (i % 3) * 10,
+            "fill": fill,
+            "opacity": opacity,
+        }
+        for i in range(count)
+    ]
+
+
+def _lightning() -> list[dict]:
+    points = [(430, 150), (400, 260), (445, 270), (410, 400)]
+    return [
+        {"type": "line", "x1": x1, "y1": y1, "x2": x2, "y2": y2, "stroke": "#FFFACD", "stroke_weight": 4}
+        for (x1, y1), (x2, y2) in zip(points, points[1:])
+    ]
+
+
+def template_scene(weather: dict, location: str = "") -> dict:
+    """Build a scene procedurally from a get_current_weather dict, without the model.
+
+    The weather code picks the palette and effects; is_day, cloud cover, wind
+    and precipitation scale the sky light, clouds and particle systems.
+    Deterministic and fast enough to serve when the model is slow or down.
+    """
+    condition = weather_condition(weather.get("weather_code", 0))
+    is_day = bool(weather.get("is_day", True))
+    cloud_cover = _clamp(float(weather.get("cloud_cover_pct", 0)), 0, 100)
+    wind = max(float(weather.get("wind_speed_kmh", 0)), 0.0)
+    precipitation = max(float(weather.get("precipitation_mm", 0)), 0.0)
+    snowfall = max(float(weather.get("snowfall_cm", 0)), 0.0)
+    temperature = weather.get("temperature_c")
+    description = weather.get("weather_description") or condition.replace("_", " ").capitalize()
+
+    day_colors, night_colors = PALETTES[condition]
+    elements: list[dict] = []
+
+    if condition in ("clear", "partly_cloudy") or cloud_cover < 70:
+        elements += _sky_light(is_day, cloud_cover)
+    if not is_day and cloud_cover < 80 and condition not in ("fog", "thunderstorm"):
+        count = int(_clamp(150 * (1 - cloud_cover / 100), 10, 150))
+        elements.append({"type": "particle_system", "preset": "stars", "color": "#FFFFFF", "count": count})
+
+    dark_clouds = condition in ("overcast", "drizzle", "rain", "snow", "thunderstorm")
+    clouds = round(cloud_cover / 100 * MAX_CLOUDS)
+    if dark_clouds:
+        clouds = max(clouds, 3)
+    elements += _clouds(clouds, dark_clouds, is_day, cloud_cover)
+
+    # Wind tilts falling particles away from vertical and speeds them up.
+    angle = 270 - _clamp(wind, 0, 60) / 2
+    if condition in ("drizzle", "rain", "thunderstorm"):
+        base = 40 if condition == "drizzle" else 120
+        elements.append({
+            "type": "particle_system",
+            "preset": "rain",
+            "color": "#A4B8D0",
+            "count": int(_clamp(base + precipitation * 80, 30, 600)),
+            "speed": round(4 + wind / 10, 1),
+            "angle": angle,
+        })
+    elif condition == "snow":
+        elements.append({
+            "type": "particle_system",
+            "preset": "snow",
+            "color": "#FFFFFF",
+            "count": int(_clamp(100 + snowfall * 100, 50, 500)),
+            "speed": round(1 + wind / 30, 1),
+            "angle": angle,
+        })
+    elif condition == "fog":
+        elements.append({"type": "particle_system", "preset": "fog", "color": "#DDDDDD"})
+    elif wind >= 30:
+        elements.append({
+            "type": "particle_system", "preset": "dust", "color": "#C2B280", "speed": round(wind / 20, 1),
+        })
+
+    if condition == "thunderstorm":
+        elements += _lightning()
+
+    ground = "#F0F4F8" if condition == "snow" else ("#3d5a3d" if is_day else "#1a261a")
+    elements.append({
+        "type": "rect", "x": 0, "y": GROUND_Y, "width": CANVAS_WIDTH,
+        "height": CANVAS_HEIGHT - GROUND_Y, "fill": ground,
+    })
+    if temperature is not None:
+        elements.append({
+            "type": "text", "content": f"{temperature:.0f}°C", "x": 20, "y": 40,
+            "size": 24, "fill": "#FFFFFF" if not is_day or dark_clouds else "#1a1a2e",
+        })
+
+    summary = description
+    if temperature is not None:
+        summary += f", {temperature:.0f}C"
+    summary += f", wind {wind:.0f} km/h"
+
+    scene = {
+        "scene": {
+            "canvas": {"width": CANVAS_WIDTH, "height": CANVAS_HEIGHT},
+            "background": {
+                "type": "gradient",
+                "colors": day_colors if is_day else night_colors,
+                "direction": "vertical",
+            },
+            "elements": elements,
+            "metadata": {
+                "title": f"{description} in {location}" if location else description,
+                "weather_summary": summary,
+            },
+        }
+    }
+    return SceneResponse.model_validate(scene).model_dump()
@@ -0,0 +1,76 @@
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Any
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still in flight block and receive the same result, or the same exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+                self._executions += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._forget(key, call)
+            call.set_exception(e)
+            raise
+        self._forget(key, call)
+        call.set_result(result)
+        return result
+
+    def submit(self, key: Hashable, start: Callable[[], Future | None]) -> Future | None:
+        """Like do(), but returns a future for the result instead of waiting for it.
+
+        The first caller for a key calls ``start()``, which begins the work,
+        typically on an executor, and returns its future. Callers arriving while
+        it is in flight, through do() or submit(), share that future and can
+        wait on it with their own timeout. Returns None, and leaves the key
+        free, if ``start()`` returns None.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                return call
+            call = start()
+            if call is None:
+                return None
+            self._calls[key] = call
+            self._executions += 1
+        call.add_done_callback(lambda done: self._forget(key, done))
+        return call
+
+    def _forget(self, key: Hashable, call: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+            }
@@ -0,0 +1,183 @@
+import copy
+
+from weather_art.agent import generate_scene
+from weather_art.config import REQUEST_DEADLINE_SECONDS, TIMELAPSE_DEFAULT_HOURS, TIMELAPSE_FRAME_MS
+from weather_art.deadline import deadline_scope
+from weather_art.geocoding import geocode_city
+from weather_art.scene_repair import normalize_color
+from weather_art.scene_schema import SceneResponse
+from weather_art.scene_templates import sky_light_intensity, template_scene
+from weather_art.tracing import span
+from weather_art.weather import get_current_weather, get_hourly_forecast
+
+
+def _rgb(color: str) -> tuple[int, int, int] | None:
+    normalized = normalize_color(color)
+    if normalized is None:
+        return None
+    digits = normalized[1:]
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    return int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16)
+
+
+def _palette_shift(base_colors: list[str], hour_colors: list[str], t: float) -> tuple[float, float, float]:
+    """Difference between two reference gradients at position ``t`` (0 top, 1 bottom)."""
+    first = [h - b for h, b in zip(_rgb(hour_colors[0]), _rgb(base_colors[0]))]
+    last = [h - b for h, b in zip(_rgb(hour_colors[-1]), _rgb(base_colors[-1]))]
+    return tuple(f + (l - f) * t for f, l in zip(first, last))
+
+
+def _shift_color(color: str, shift: tuple[float, float, float]) -> str:
+    rgb = _rgb(color)
+    if rgb is None:
+        return color
+    return "#" + "".join(f"{int(max(0, min(255, round(c + d)))):02x}" for c, d in zip(rgb, shift))
+
+
+def _reference_colors(background: dict) -> list[str]:
+    return background["colors"] if background["type"] == "gradient" else [background["color"]]
+
+
+def _shift_background(background: dict, base_ref: dict, hour_ref: dict) -> None:
+    base_colors, hour_colors = _reference_colors(base_ref), _reference_colors(hour_ref)
+    if background["type"] == "gradient":
+        colors = background["colors"]
+        steps = max(len(colors) - 1, 1)
+        background["colors"] = [
+            _shift_color(color, _palette_shift(base_colors, hour_colors, i / steps))
+            for i, color in enumerate(colors)
+        ]
+    else:
+        background["color"] = _shift_color(background["color"], _palette_shift(base_colors, hour_colors, 0.5))
+
+
+def _particles_by_preset(elements: list[dict]) -> dict[str, dict]:
+    return {el["preset"]: el for el in elements if el["type"] == "particle_system"}
+
+
+def _adjust_particles(elements: list[dict], base_ref: list[dict], hour_ref: list[dict]) -> list[dict]:
+    """Rescale, drop or add particle systems as the hour's weather differs from the base weather.
+
+    The template scenes for both weathers serve as references: a system the
+    base weather calls for is scaled by how much stronger or weaker the hour's
+    reference system is, and dropped if the hour has none. Systems the model
+    added on its own are kept as they are.
+    """
+    base_systems = _particles_by_preset(base_ref)
+    hour_systems = _particles_by_preset(hour_ref)
+    adjusted = []
+    for el in elements:
+        if el["type"] != "particle_system" or el["preset"] not in base_systems:
+            adjusted.append(el)
+            continue
+        base, hour = base_systems[el["preset"]], hour_systems.get(el["preset"])
+        if hour is None:
+            continue
+        el["count"] = max(1, min(1000, round(el["count"] * hour["count"] / base["count"])))
+        if base["speed"]:
+            el["speed"] = round(el["speed"] * hour["speed"] / base["speed"], 2)
+        el["angle"] = el["angle"] + hour["angle"] - base["angle"]
+        adjusted.append(el)
+
+    present = {el["preset"] for el in adjusted if el["type"] == "particle_system"}
+    new_systems = [copy.deepcopy(el) for preset, el in hour_systems.items() if preset not in present]
+    if new_systems:
+        # Behind text and after the existing weather, so the model's layering is kept.
+        particle_indexes = [i for i, el in enumerate(adjusted) if el["type"] == "particle_system"]
+        text_indexes = [i for i, el in enumerate(adjusted) if el["type"] == "text"]
+        if particle_indexes:
+            at = particle_indexes[-1] + 1
+        else:
+            at = text_indexes[0] if text_indexes else len(adjusted)
+        adjusted[at:at] = new_systems
+    return adjusted
+
+
+def derive_frame(base_scene: dict, base_weather: dict, hour_weather: dict) -> dict:
+    """Adapt a generated scene to another hour's weather without the model.
+
+    The background is shifted by the difference between the template palettes
+    of the two weathers, particle systems follow their precipitation, wind and
+    sky, glows dim or brighten with cloud cover, and the temperature in text
+    elements and the weather summary are updated.
+
+    Returns a validated scene dict.
+    """
+    base_ref = template_scene(base_weather)["scene"]
+    hour_ref = template_scene(hour_weather)["scene"]
+    scene = copy.deepcopy(base_scene["scene"])
+
+    _shift_background(scene["background"], base_ref["background"], hour_ref["background"])
+    scene["elements"] = _adjust_particles(scene["elements"], base_ref["elements"], hour_ref["elements"])
+
+    glow_scale = (
+        sky_light_intensity(hour_weather.get("cloud_cover_pct", 0))
+        / sky_light_intensity(base_weather.get("cloud_cover_pct", 0))
+    )
+    base_temperature, hour_temperature = base_weather.get("temperature_c"), hour_weather.get("temperature_c")
+    for el in scene["elements"]:
+        if el["type"] == "glow":
+            el["intensity"] = round(min(el["intensity"] * glow_scale, 1.0), 2)
+        elif el["type"] == "text" and base_temperature is not None and hour_temperature is not None:
+            el["content"] = el["content"].replace(f"{base_temperature:.0f}°", f"{hour_temperature:.0f}°")
+
+    scene["metadata"]["weather_summary"] = hour_ref["metadata"]["weather_summary"]
+    return SceneResponse.model_validate({"scene": scene}).model_dump()
+
+
+def generate_timelapse(
+    location: str,
+    latitude: float | None = None,
+    longitude: float | None = None,
+    hours: int = TIMELAPSE_DEFAULT_HOURS,
+    style_prompt: str = "",
+    mode: str | None = None,
+    frame_ms: int = TIMELAPSE_FRAME_MS,
+    fallback_after: float | None = None,
+    deadline: float | None = None,
+) -> dict:
+    """Generate one scene per forecast hour for the next ``hours`` hours.
+
+    The hourly forecast comes from a single cached upstream call and the model
+    runs once, for the current weather, through generate_scene (so the scene
+    cache, fallback and deadline apply as usual). Every frame is derived from
+    that base scene with derive_frame.
+
+    Returns the frames in order, each with its forecast hour, weather and
+    scene, and the timings for playing them back: every frame is shown for
+    ``frame_ms`` milliseconds starting at ``start_ms``.
+    """
+    if deadline is None:
+        deadline = REQUEST_DEADLINE_SECONDS or None
+
+    with deadline_scope(deadline):
+        if latitude is None or longitude is None:
+            geocoded = geocode_city(location)
+            latitude, longitude = geocoded["latitude"], geocoded["longitude"]
+        forecast = get_hourly_forecast(latitude, longitude, hours)
+        base_scene = generate_scene(
+            location, latitude, longitude, style_prompt, mode,
+            fallback_after=fallback_after, deadline=deadline,
+        )
+        base_weather = get_current_weather(latitude, longitude)
+
+    with span("timelapse"):
+        frames = [
+            {
+                "time": hour["time"],
+                "start_ms": i * frame_ms,
+                "duration_ms": frame_ms,
+                "weather": hour,
+                **derive_frame(base_scene, base_weather, hour),
+            }
+            for i, hour in enumerate(forecast)
+        ]
+    return {
+        "location": location,
+        "latitude": latitude,
+        "longitude": longitude,
+        "frame_ms": frame_ms,
+        "duration_ms": frame_ms * len(frames),
+        "frames": frames,
+    }
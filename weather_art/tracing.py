@@ -0,0 +1,229 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from typing import Any
+
+from strands.hooks import (
+    AfterModelCallEvent,
+    AfterToolCallEvent,
+    BeforeModelCallEvent,
+    BeforeToolCallEvent,
+    HookProvider,
+    HookRegistry,
+)
+
+from weather_art.config import TRACING_ENABLED
+
+# Histogram bucket upper bounds in seconds, from cache hits up to long model turns.
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Stage timings of the request running in this context, when it collects them.
+_timings: ContextVar[list[tuple[str, float]] | None] = ContextVar("_timings", default=None)
+
+_NULL_SPAN = nullcontext()
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "sum", "errors")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self._tracer = tracer
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._tracer.record(self._name, time.perf_counter() - self._start, error=exc_type is not None)
+
+
+class Tracer:
+    """Per-stage duration histograms and model token counters.
+
+    ``span(name)`` times a block; when ``enabled`` is False it returns a shared
+    no-op context manager, so instrumented code pays almost nothing.
+    """
+
+    def __init__(self, enabled: bool, buckets: tuple[float, ...] = DURATION_BUCKETS):
+        self.enabled = enabled
+        self.bucket_bounds = buckets
+        self._lock = threading.Lock()
+        self._stages: dict[str, _Histogram] = {}
+        self._tokens = {"prompt": 0, "completion": 0}
+
+    def span(self, name: str):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float, error: bool = False) -> None:
+        """Record one completed stage, also adding it to the request's timings if collected."""
+        if not self.enabled:
+            return
+        timings = _timings.get()
+        if timings is not None:
+            timings.append((name, seconds))
+        index = bisect_left(self.bucket_bounds, seconds)
+        with self._lock:
+            histogram = self._stages.get(name)
+            if histogram is None:
+                histogram = self._stages[name] = _Histogram(len(self.bucket_bounds))
+            if index < len(histogram.buckets):
+                histogram.buckets[index] += 1
+            histogram.count += 1
+            histogram.sum += seconds
+            if error:
+                histogram.errors += 1
+
+    def add_tokens(self, prompt: int, completion: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._tokens["prompt"] += prompt
+            self._tokens["completion"] += completion
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._tokens = {"prompt": 0, "completion": 0}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {
+                    name: {"count": h.count, "sum_seconds": h.sum, "errors": h.errors}
+                    for name, h in sorted(self._stages.items())
+                },
+                "tokens": dict(self._tokens),
+            }
+
+    def render_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP weather_art_stage_duration_seconds Time spent in each generation pipeline stage.",
+            "# TYPE weather_art_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            stages = sorted(self._stages.items())
+            tokens = dict(self._tokens)
+            for name, histogram in stages:
+                cumulative = 0
+                for bound, count in zip(self.bucket_bounds, histogram.buckets):
+                    cumulative += count
+                    lines.append(
+                        f'weather_art_stage_duration_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'weather_art_stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}} {histogram.count}'
+                )
+                lines.append(f'weather_art_stage_duration_seconds_sum{{stage="{name}"}} {histogram.sum}')
+                lines.append(f'weather_art_stage_duration_seconds_count{{stage="{name}"}} {histogram.count}')
+            lines += [
+                "# HELP weather_art_stage_errors_total Stages that ended with an exception.",
+                "# TYPE weather_art_stage_errors_total counter",
+            ]
+            lines += [f'weather_art_stage_errors_total{{stage="{name}"}} {h.errors}' for name, h in stages]
+        lines += [
+            "# HELP weather_art_model_tokens_total Tokens sent to and generated by the model.",
+            "# TYPE weather_art_model_tokens_total counter",
+            f'weather_art_model_tokens_total{{kind="prompt"}} {tokens["prompt"]}',
+            f'weather_art_model_tokens_total{{kind="completion"}} {tokens["completion"]}',
+        ]
+        return "\n".join(lines) + "\n"
+
+
+tracer = Tracer(enabled=TRACING_ENABLED)
+
+
+def span(name: str):
+    """Time a block as pipeline stage ``name``."""
+    return tracer.span(name)
+
+
+def traced(name: str) -> Callable:
+    """Decorator timing every call of a function as pipeline stage ``name``."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class AgentTracingHooks(HookProvider):
+    """Strands hooks timing one agent's model and tool calls and counting its tokens.
+
+    Each agent gets its own instance; pooled agents serve one caller at a time,
+    and concurrent tool calls are told apart by their tool use id.
+    """
+
+    def __init__(self, tracer: Tracer = tracer):
+        self._tracer = tracer
+        self._model_started: float | None = None
+        self._tools_started: dict[str, float] = {}
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeModelCallEvent, self._before_model)
+        registry.add_callback(AfterModelCallEvent, self._after_model)
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+        registry.add_callback(AfterToolCallEvent, self._after_tool)
+
+    def _before_model(self, event: BeforeModelCallEvent) -> None:
+        self._model_started = time.perf_counter()
+
+    def _after_model(self, event: AfterModelCallEvent) -> None:
+        if self._model_started is None:
+            return
+        self._tracer.record("model", time.perf_counter() - self._model_started, error=event.exception is not None)
+        self._model_started = None
+        if event.stop_response is not None:
+            usage = event.stop_response.message.get("metadata", {}).get("usage", {})
+            self._tracer.add_tokens(usage.get("inputTokens", 0), usage.get("outputTokens", 0))
+
+    def _before_tool(self, event: BeforeToolCallEvent) -> None:
+        self._tools_started[event.tool_use["toolUseId"]] = time.perf_counter()
+
+    def _after_tool(self, event: AfterToolCallEvent) -> None:
+        started = self._tools_started.pop(event.tool_use["toolUseId"], None)
+        if started is not None:
+            failed = event.exception is not None or event.result.get("status") == "error"
+            self._tracer.record(f"tool.{event.tool_use['name']}", time.perf_counter() - started, error=failed)
+
+
+def start_timings() -> Token:
+    """Start collecting stage timings for the current request."""
+    return _timings.set([])
+
+
+def finish_timings(token: Token) -> list[tuple[str, float]]:
+    """Stop collecting and return the ``(stage, seconds)`` pairs recorded since start_timings."""
+    timings = _timings.get() or []
+    _timings.reset(token)
+    return timings
+
+
+def server_timing_header(timings: list[tuple[str, float]]) -> str:
+    """Format timings as a Server-Timing header, summing repeated stages."""
+    totals: dict[str, list] = {}
+    for name, seconds in timings:
+        total = totals.setdefault(name, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+    return ", ".join(
+        f'{name};dur={seconds * 1000:.1f};desc="{count}x"' for name, (seconds, count) in totals.items()
+    )
@@ -1,6 +1,18 @@
-import requests
+from datetime import UTC, datetime
 
-from weather_art.config import OPEN_METEO_FORECAST_URL
+from weather_art.cache import TTLCache, quantize_coords
+from weather_art.config import (
+    FORECAST_CACHE_TTL_SECONDS,
+    FORECAST_HOURS,
+    OPEN_METEO_BATCH_SIZE,
+    OPEN_METEO_FORECAST_URL,
+    WEATHER_CACHE_GRID_DEG,
+    WEATHER_CACHE_MAX_ENTRIES,
+    WEATHER_CACHE_TTL_SECONDS,
+)
+from weather_art.http_client import http_get
+from weather_art.singleflight import SingleFlight
+from weather_art.tracing import traced
 
 WMO_CODES: dict[int, str] = {
     0: "Clear sky",
@@ -38,21 +50,67 @@ CURRENT_PARAMS = (
     "weather_code,cloud_cover,wind_speed_10m,wind_direction_10m,"
     "wind_gusts_10m,precipitation,rain,snowfall,is_day"
 )
+# Open-Meteo offers the same variables hourly, so forecast hours normalize like current weather.
+HOURLY_PARAMS = CURRENT_PARAMS
+
+weather_cache = TTLCache(
+    max_entries=WEATHER_CACHE_MAX_ENTRIES,
+    ttl=WEATHER_CACHE_TTL_SECONDS,
+)
+weather_flight = SingleFlight()
+
+# Hourly forecasts per grid cell; one fetch covers FORECAST_HOURS hours.
+forecast_cache = TTLCache(
+    max_entries=WEATHER_CACHE_MAX_ENTRIES,
+    ttl=FORECAST_CACHE_TTL_SECONDS,
+)
+forecast_flight = SingleFlight()
+
 
+def weather_ttl_remaining(lat: float, lon: float) -> float | None:
+    """Seconds until the cached weather for this grid cell goes stale, if cached."""
+    return weather_cache.ttl_remaining(quantize_coords(lat, lon, WEATHER_CACHE_GRID_DEG))
 
+
+@traced("weather")
 def get_current_weather(lat: float, lon: float) -> dict:
     """Fetch current weather from Open-Meteo for the given coordinates.
 
+    Results are cached per grid cell of WEATHER_CACHE_GRID_DEG degrees for
+    WEATHER_CACHE_TTL_SECONDS, so nearby requests share one upstream call.
+    Concurrent misses for the same cell wait on a single request.
+
     Returns a clean dict with human-readable keys.
     """
-    response = requests.get(
+    cell = quantize_coords(lat, lon, WEATHER_CACHE_GRID_DEG)
+    cached = weather_cache.get(cell)
+    if cached is not None:
+        return dict(cached)
+    return dict(weather_flight.do(cell, lambda: _fetch_current_weather(lat, lon, cell)))
+
+
+def refresh_current_weather(lat: float, lon: float) -> dict:
+    """Fetch current weather upstream even if cached, restarting the cell's cache entry.
+
+    Used to refresh entries ahead of expiry; joins a request already in flight
+    for the same cell.
+    """
+    cell = quantize_coords(lat, lon, WEATHER_CACHE_GRID_DEG)
+    return dict(weather_flight.do(cell, lambda: _fetch_current_weather(lat, lon, cell)))
+
+
+def _fetch_current_weather(lat: float, lon: float, cell: tuple[float, float]) -> dict:
+    response = http_get(
         OPEN_METEO_FORECAST_URL,
         params={"latitude": lat, "longitude": lon, "current": CURRENT_PARAMS},
-        timeout=10,
     )
     response.raise_for_status()
-    current = response.json()["current"]
+    result = _normalize_current(response.json()["current"])
+    weather_cache.set(cell, result)
+    return result
 
+
+def _normalize_current(current: dict) -> dict:
     weather_code = current["weather_code"]
     return {
         "temperature_c": current["temperature_2m"],
@@ -68,4 +126,90 @@ def get_current_weather(lat: float, lon: float) -> dict:
         "rain_mm": current["rain"],
         "snowfall_cm": current["snowfall"],
         "is_day": bool(current["is_day"]),
-    }
\ No newline at end of file
+    }
+
+
+@traced("forecast")
+def get_hourly_forecast(lat: float, lon: float, hours: int = FORECAST_HOURS) -> list[dict]:
+    """Fetch the hourly forecast for the next ``hours`` hours, starting with the current one.
+
+    One upstream call fetches FORECAST_HOURS hours, cached per grid cell of
+    WEATHER_CACHE_GRID_DEG degrees for FORECAST_CACHE_TTL_SECONDS; hours that
+    have passed since are skipped when reading from the cache.
+
+    Returns get_current_weather-shaped dicts, each with an extra "time" key
+    holding the hour in UTC as "YYYY-MM-DDTHH:MM".
+    """
+    cell = quantize_coords(lat, lon, WEATHER_CACHE_GRID_DEG)
+    forecast = forecast_cache.get(cell)
+    if forecast is None:
+        forecast = forecast_flight.do(cell, lambda: _fetch_hourly_forecast(lat, lon, cell))
+    current_hour = datetime.now(UTC).strftime("%Y-%m-%dT%H:00")
+    upcoming = [hour for hour in forecast if hour["time"] >= current_hour]
+    return [dict(hour) for hour in upcoming[:hours]]
+
+
+def _fetch_hourly_forecast(lat: float, lon: float, cell: tuple[float, float]) -> list[dict]:
+    response = http_get(
+        OPEN_METEO_FORECAST_URL,
+        params={
+            "latitude": lat,
+            "longitude": lon,
+            "hourly": HOURLY_PARAMS,
+            "forecast_hours": FORECAST_HOURS,
+            "timezone": "GMT",
+        },
+    )
+    response.raise_for_status()
+    hourly = response.json()["hourly"]
+    forecast = [
+        {"time": time, **_normalize_current({name: hourly[name][i] for name in HOURLY_PARAMS.split(",")})}
+        for i, time in enumerate(hourly["time"])
+    ]
+    forecast_cache.set(cell, forecast)
+    return forecast
+
+
+@traced("weather_batch")
+def get_current_weather_batch(coords: list[tuple[float, float]]) -> list[dict]:
+    """Fetch current weather for many coordinates with as few upstream calls as possible.
+
+    Cells already in the weather cache are served from it. The rest are
+    fetched OPEN_METEO_BATCH_SIZE at a time using Open-Meteo's comma-separated
+    multi-location query, and cached like single lookups.
+
+    Returns one get_current_weather-shaped dict per input pair, in input order.
+    """
+    cells = [quantize_coords(lat, lon, WEATHER_CACHE_GRID_DEG) for lat, lon in coords]
+    results: dict[tuple[float, float], dict] = {}
+    missing: dict[tuple[float, float], tuple[float, float]] = {}
+    for (lat, lon), cell in zip(coords, cells):
+        if cell in results or cell in missing:
+            continue
+        cached = weather_cache.get(cell)
+        if cached is not None:
+            results[cell] = cached
+        else:
+            missing[cell] = (lat, lon)
+
+    pending = list(missing.items())
+    for start in range(0, len(pending), OPEN_METEO_BATCH_SIZE):
+        chunk = pending[start:start + OPEN_METEO_BATCH_SIZE]
+        response = http_get(
+            OPEN_METEO_FORECAST_URL,
+            params={
+                "latitude": ",".join(str(lat) for _, (lat, _) in chunk),
+                "longitude": ",".join(str(lon) for _, (_, lon) in chunk),
+                "current": CURRENT_PARAMS,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        # A single location comes back as an object rather than a list.
+        locations = data if isinstance(data, list) else [data]
+        for (cell, _), location in zip(chunk, locations, strict=True):
+            result = _normalize_current(location["current"])
+            weather_cache.set(cell, result)
+            results[cell] = result
+
+    return [dict(results[cell]) for cell in cells]
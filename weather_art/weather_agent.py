@@ -2,7 +2,15 @@ from strands import Agent
 from strands.models import OllamaModel
 
 from weather_art.agent import geocode_location, get_weather
-from weather_art.config import OLLAMA_HOST, OLLAMA_MODEL_ID
+from weather_art.agent_pool import AgentPool
+from weather_art.config import (
+    AGENT_POOL_ACQUIRE_TIMEOUT,
+    AGENT_POOL_MAX_USES,
+    AGENT_POOL_SIZE,
+    OLLAMA_HOST,
+    OLLAMA_MODEL_ID,
+)
+from weather_art.tracing import AgentTracingHooks
 
 SYSTEM_PROMPT = """\
 You are a weather reporter. Given a location, use your tools to look up the \
@@ -18,25 +26,37 @@ Return ONLY the weather description — no JSON, no extra formatting.
 """
 
 
-def describe_weather(user_message: str) -> str:
-    """Get a natural-language weather description for a location.
-
-    Creates a fresh Strands Agent, fetches weather data via tools, and returns
-    a human-readable description.
-
-    Args:
-        user_message: The user's request, e.g. "Describe the current weather in Berlin."
-    """
+def _build_weather_agent() -> Agent:
     model = OllamaModel(
         host=OLLAMA_HOST,
         model_id=OLLAMA_MODEL_ID,
     )
 
-    agent = Agent(
+    return Agent(
         model=model,
         system_prompt=SYSTEM_PROMPT,
         tools=[geocode_location, get_weather],
+        hooks=[AgentTracingHooks()],
     )
 
-    result = agent(user_message)
+
+weather_agent_pool = AgentPool(
+    _build_weather_agent,
+    max_size=AGENT_POOL_SIZE,
+    max_uses=AGENT_POOL_MAX_USES,
+    acquire_timeout=AGENT_POOL_ACQUIRE_TIMEOUT,
+)
+
+
+def describe_weather(user_message: str) -> str:
+    """Get a natural-language weather description for a location.
+
+    Borrows a warm Strands Agent from the pool, fetches weather data via tools,
+    and returns a human-readable description.
+
+    Args:
+        user_message: The user's request, e.g. "Describe the current weather in Berlin."
+    """
+    with weather_agent_pool.lease() as agent:
+        result = agent(user_message)
     return str(result).strip()